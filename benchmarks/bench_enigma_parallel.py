@@ -0,0 +1,63 @@
+"""
+Масштабирование параллельного шифрования Энигмы по числу процессов
+Запуск: python -m benchmarks.bench_enigma_parallel --size 100 --workers 1 2 4 8 16
+
+Последовательная часть в родительском процессе ограничивает ускорение
+(закон Амдала): подсчет букв по сегментам, кодирование текста в ASCII,
+копирование в разделяемую память и сборка результата - несколько
+проходов memcpy по всему тексту. На текстах от 100 МБ это порядка
+десятой доли от времени одного ядра, поэтому на 16 ядрах ожидаемый
+потолок - около x6-x10, а не x16. Не-ASCII текст передается сегментами
+через pickle и масштабируется хуже.
+"""
+import argparse
+import os
+import random
+import time
+
+from enigma.ciphers.enigma import encrypt_parallel, setup_enigma
+from enigma.ciphers.enigma.main import shutdown_executor
+from enigma.ciphers.enigma.configs import EnigmaConfig
+
+CONFIG = EnigmaConfig(
+    rotors=["III", "II", "I"],
+    reflector="B",
+    ring_settings=[1, 2, 3],
+    initial_positions="QEV",
+    plugboard_pairs=[["A", "B"], ["C", "D"], ["E", "F"]],
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=float, default=100, help="Размер текста в МБ")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    chunk = ''.join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ ", k=1 << 20))
+    text = chunk * int(args.size)
+
+    start = time.perf_counter()
+    expected = setup_enigma(CONFIG).encrypt(text)
+    sequential = time.perf_counter() - start
+    print(f"Размер текста: {args.size} МБ, ядер: {os.cpu_count()}")
+    print(f"Последовательно: {sequential:.2f} c")
+
+    for workers in args.workers:
+        # Прогрев пула, чтобы не учитывать запуск процессов
+        encrypt_parallel(CONFIG, text[:1 << 23], workers=workers)
+        start = time.perf_counter()
+        result = encrypt_parallel(CONFIG, text, workers=workers)
+        elapsed = time.perf_counter() - start
+        assert result == expected
+        speedup = sequential / elapsed
+        print(
+            f"Процессов {workers:3d}: {elapsed:.2f} c, ускорение x{speedup:.1f}, "
+            f"эффективность {speedup / workers:.0%}"
+        )
+        shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Стоимость машины Энигмы на запрос: сборка setup_enigma, копия шаблона
+и машина из пула, возвращаемая в начальное состояние
+Запуск: python -m benchmarks.bench_enigma_pool --requests 20000
+"""
+import argparse
+import time
+import tracemalloc
+
+from enigma.ciphers.enigma import setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.ciphers.enigma.pool import MachinePool
+
+CONFIG = EnigmaConfig(
+    rotors=["III", "II", "I"],
+    reflector="B",
+    ring_settings=[1, 2, 3],
+    initial_positions="ABC",
+    plugboard_pairs=[["A", "B"], ["C", "D"], ["E", "F"]],
+)
+
+TEXT = "HELLO WORLD"
+
+
+def request_setup() -> str:
+    return setup_enigma(CONFIG).encrypt(TEXT)
+
+
+TEMPLATE = setup_enigma(CONFIG)
+
+
+def request_copy() -> str:
+    return TEMPLATE.copy().encrypt(TEXT)
+
+
+POOL = MachinePool(setup_enigma(CONFIG))
+
+
+def request_pooled() -> str:
+    with POOL.machine() as enigma:
+        return enigma.encrypt(TEXT)
+
+
+def measure(func, requests: int) -> float:
+    """Средняя задержка запроса в микросекундах"""
+    func()
+    start = time.perf_counter()
+    for _ in range(requests):
+        func()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def peak_memory(func, requests: int = 1000) -> float:
+    """Средний пик памяти, выделяемой за запрос, в байтах (tracemalloc)"""
+    func()
+    tracemalloc.start()
+    total = 0
+    for _ in range(requests):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        total += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return total / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    variants = [
+        ("setup_enigma", request_setup),
+        ("copy шаблона", request_copy),
+        ("пул машин", request_pooled),
+    ]
+
+    print(f"Запросов: {args.requests}, текст: {len(TEXT)} символов")
+    for name, func in variants:
+        latency = measure(func, args.requests)
+        print(f"{name:14} {latency:7.1f} мкс, пик памяти {peak_memory(func):7.0f} байт")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Задержка запроса шифра Джефферсона: прежний вывод дисков в stdout
+и отладочный журнал в выключенном и включенном состоянии
+Запуск: python -m benchmarks.bench_jefferson_logging --requests 2000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import random
+import time
+
+from enigma.ciphers.jefferson.main import JeffersonCipher, logger
+
+TEXT = "THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG"
+
+
+def request(cipher: JeffersonCipher) -> str:
+    return cipher.encrypt(TEXT, key_row=0)
+
+
+def request_with_print(cipher: JeffersonCipher) -> str:
+    # Поведение до изменения: вывод всех дисков на каждый запрос
+    print(cipher.display_disks())
+    return cipher.encrypt(TEXT, key_row=0)
+
+
+def measure(func, requests: int, cipher: JeffersonCipher) -> float:
+    """Средняя задержка шифрования в микросекундах (генерация дисков не входит)"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        func(cipher)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--disks", type=int, default=36)
+    args = parser.parse_args()
+    random.seed(0)
+    cipher = JeffersonCipher(num_disks=args.disks)
+
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        printed = measure(request_with_print, args.requests, cipher)
+
+    logger.setLevel(logging.WARNING)
+    disabled = measure(request, args.requests, cipher)
+
+    handler = logging.FileHandler(os.devnull)
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    try:
+        enabled = measure(request, args.requests, cipher)
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
+
+    print(f"Запросов: {args.requests}, дисков: {args.disks}")
+    print(f"print в stdout:     {printed:.1f} мкс")
+    print(f"Журнал выключен:    {disabled:.1f} мкс")
+    print(f"Журнал DEBUG:       {enabled:.1f} мкс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Сравнение посимвольного шифра Джефферсона (list.index) с таблицами перевода
+Запуск: python -m benchmarks.bench_jefferson_tables --size 4
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from enigma.ciphers.jefferson.main import JeffersonCipher
+
+
+def reference_encrypt(cipher: JeffersonCipher, text: str) -> str:
+    result = []
+    for i, char in enumerate(text.upper()):
+        disk = cipher.disks[cipher.disk_order[i % cipher.num_disks]]
+        result.append(cipher.alphabet[disk.index(char)] if char in disk else char)
+    return ''.join(result)
+
+
+def measure(func, *args) -> tuple:
+    start = time.perf_counter()
+    # Вывод дисков не должен попадать в замер
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=float, default=4, help="Размер текста в МБ")
+    parser.add_argument("--disks", type=int, default=36, help="Число дисков")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    random.seed(0)
+    text = ''.join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ ", k=int(args.size * 2 ** 20)))
+    cipher = JeffersonCipher(num_disks=args.disks)
+
+    reference, reference_time = measure(reference_encrypt, cipher, text)
+    tables, tables_time = measure(cipher.encrypt, text, 0)
+    assert reference == tables
+
+    print(f"Размер текста: {args.size} МБ, дисков: {args.disks}")
+    print(f"Эталон:  {reference_time:.3f} c")
+    print(f"Таблицы: {tables_time:.3f} c, ускорение x{reference_time / tables_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
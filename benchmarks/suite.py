@@ -0,0 +1,352 @@
+"""
+Набор замеров производительности шифров и HTTP-обработчиков с JSON-отчетом
+Запуск: python -m benchmarks.suite --output results.json
+Сравнение с базовым прогоном: python -m benchmarks.suite --baseline baseline.json
+Выбор замеров: --filter enigma.throughput --max-size 100
+
+Для каждого замера сохраняются медиана, минимум и среднее время одного
+прогона; для замеров с размером текста - также пропускная способность.
+При сравнении замеры, медиана которых выросла больше --threshold,
+помечаются как регрессии, и процесс завершается с кодом 1.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from enigma.ciphers.enigma import setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.ciphers.jefferson import setup_jefferson
+from enigma.ciphers.jefferson.configs import JeffersonConfig
+
+CONFIG = EnigmaConfig(
+    rotors=["III", "II", "I"],
+    reflector="B",
+    ring_settings=[1, 2, 3],
+    initial_positions="QEV",
+    plugboard_pairs=[["A", "B"], ["C", "D"], ["E", "F"]],
+)
+JEFFERSON_CONFIG = JeffersonConfig(num_disks=36, key_row=5)
+
+KB = 1 << 10
+MB = 1 << 20
+SIZES = [KB, 10 * KB, 100 * KB, MB, 10 * MB, 100 * MB]
+
+# Имя замера -> (фабрика, размер данных в байтах или None)
+BENCHMARKS = {}
+
+
+def benchmark(name: str, size: int | None = None):
+    """
+    Регистрация замера
+    Фабрика выполняет подготовку и возвращает функцию, время которой измеряется.
+    """
+    def register(factory):
+        BENCHMARKS[name] = (factory, size)
+        return factory
+    return register
+
+
+def make_text(size: int, alphabet: str = "ABCDEFGHIJKLMNOPQRSTUVWXYZ ") -> str:
+    rng = random.Random(0)
+    chunk = ''.join(rng.choices(alphabet, k=min(size, MB)))
+    return (chunk * (size // len(chunk) + 1))[:size]
+
+
+def size_label(size: int) -> str:
+    return f"{size // MB}MB" if size >= MB else f"{size // KB}KB"
+
+
+@benchmark("enigma.step")
+def enigma_step():
+    """Один символ: поворот роторов и проход по таблице"""
+    enigma = setup_enigma(CONFIG)
+    return lambda: enigma.encrypt("A")
+
+
+@benchmark("jefferson.step")
+def jefferson_step():
+    jefferson = setup_jefferson(JEFFERSON_CONFIG)
+    return lambda: jefferson.encrypt("A", JEFFERSON_CONFIG.key_row)
+
+
+@benchmark("enigma.setup")
+def enigma_setup():
+    return lambda: setup_enigma(CONFIG)
+
+
+@benchmark("jefferson.setup")
+def jefferson_setup():
+    return lambda: setup_jefferson(JEFFERSON_CONFIG)
+
+
+def _register_throughput(size: int):
+    label = size_label(size)
+
+    @benchmark(f"enigma.throughput.{label}", size)
+    def enigma_throughput():
+        text = make_text(size)
+        enigma = setup_enigma(CONFIG)
+        start = enigma.positions
+
+        def run():
+            enigma.positions = start
+            enigma.encrypt(text)
+        return run
+
+    @benchmark(f"jefferson.throughput.{label}", size)
+    def jefferson_throughput():
+        text = make_text(size)
+        jefferson = setup_jefferson(JEFFERSON_CONFIG)
+        return lambda: jefferson.encrypt(text, JEFFERSON_CONFIG.key_row)
+
+
+for _size in SIZES:
+    _register_throughput(_size)
+
+
+@contextlib.contextmanager
+def temp_app():
+    """Приложение с временной БД (как в тестах) и клиент к нему"""
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from enigma.db import Base, get_db, get_session_factory, get_sync_db, set_sqlite_pragmas
+    from enigma.disksets import DiskSetStore, get_disk_sets
+    from enigma.main import app
+    from enigma.results import ResultCache, get_result_cache
+    from enigma.writer import JeffersonKeyWriter, get_key_writer
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.db"
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", set_sqlite_pragmas)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+        AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        def get_bench_sync_db():
+            with Session() as db:
+                yield db
+
+        async def get_bench_db():
+            async with AsyncSession() as db:
+                yield db
+
+        writer = JeffersonKeyWriter(Session)
+        disk_sets = DiskSetStore(Session)
+        app.dependency_overrides[get_sync_db] = get_bench_sync_db
+        app.dependency_overrides[get_db] = get_bench_db
+        app.dependency_overrides[get_session_factory] = lambda: Session
+        app.dependency_overrides[get_key_writer] = lambda: writer
+        app.dependency_overrides[get_disk_sets] = lambda: disk_sets
+        # Без кэша результатов: после прогрева измерялись бы попадания, а не шифрование
+        results = ResultCache(max_bytes=0)
+        app.dependency_overrides[get_result_cache] = lambda: results
+        try:
+            with TestClient(app) as client:
+                yield client
+        finally:
+            app.dependency_overrides.clear()
+            writer.close()
+            engine.dispose()
+
+
+# Клиент создается один раз на прогон HTTP-замеров
+_http = contextlib.ExitStack()
+_client = None
+
+
+def client():
+    global _client
+    if _client is None:
+        _client = _http.enter_context(temp_app())
+    return _client
+
+
+def post(path: str, expected: int = 200, **kwargs):
+    response = client().post(path, **kwargs)
+    assert response.status_code == expected, response.text
+    return response
+
+
+ENIGMA_BODY = {**CONFIG.model_dump(), "text": make_text(KB)}
+
+
+@benchmark("http.enigma.encrypt", KB)
+def http_enigma_encrypt():
+    return lambda: post("/ciphers/enigma/encrypt", json=ENIGMA_BODY)
+
+
+@benchmark("http.enigma.encrypt_from_db", KB)
+def http_enigma_from_db():
+    post("/configs", json={**CONFIG.model_dump(), "name": "bench"}, expected=200)
+    body = {"text": ENIGMA_BODY["text"], "config_name": "bench"}
+    return lambda: post("/ciphers/enigma/encrypt/from_db", json=body)
+
+
+@benchmark("http.enigma.encrypt_batch", 100 * KB)
+def http_enigma_batch():
+    body = {"items": [{"text": ENIGMA_BODY["text"], "config": CONFIG.model_dump()}] * 100}
+    return lambda: post("/ciphers/enigma/encrypt/batch", json=body)
+
+
+@benchmark("http.enigma.encrypt_stream", MB)
+def http_enigma_stream():
+    data = make_text(MB).encode()
+    headers = {"X-Enigma-Config": CONFIG.model_dump_json()}
+    return lambda: post("/ciphers/enigma/encrypt/stream", content=data, headers=headers)
+
+
+@benchmark("http.configs.get")
+def http_config_get():
+    post("/configs", json={**CONFIG.model_dump(), "name": "bench-get"})
+    return lambda: client().get("/configs/bench-get").raise_for_status()
+
+
+@benchmark("http.jefferson.encrypt", KB)
+def http_jefferson_encrypt():
+    body = {**JEFFERSON_CONFIG.model_dump(), "text": make_text(KB)}
+    return lambda: post("/ciphers/jefferson/encrypt", json=body)
+
+
+@benchmark("http.jefferson.decrypt", KB)
+def http_jefferson_decrypt():
+    body = {**JEFFERSON_CONFIG.model_dump(), "text": make_text(KB)}
+    encrypted = post("/ciphers/jefferson/encrypt", json=body).json()
+    request = {"text": encrypted["encrypted_text"], "decrypt_id": encrypted["encrypt_id"]}
+    return lambda: post("/ciphers/jefferson/decrypt", json=request)
+
+
+@benchmark("http.jefferson.decrypt_batch", 100 * KB)
+def http_jefferson_decrypt_batch():
+    body = {**JEFFERSON_CONFIG.model_dump(), "text": make_text(KB)}
+    items = []
+    for _ in range(100):
+        encrypted = post("/ciphers/jefferson/encrypt", json=body).json()
+        items.append({"text": encrypted["encrypted_text"], "decrypt_id": encrypted["encrypt_id"]})
+    return lambda: post("/ciphers/jefferson/decrypt/batch", json={"items": items})
+
+
+@benchmark("http.jefferson.encrypt_stream", MB)
+def http_jefferson_stream():
+    data = make_text(MB).encode()
+    params = JEFFERSON_CONFIG.model_dump()
+    return lambda: post("/ciphers/jefferson/encrypt/stream", content=data, params=params)
+
+
+def measure(run, repeat: int, min_time: float) -> list:
+    """Время прогонов: не меньше repeat и не меньше min_time секунд суммарно"""
+    run()  # прогрев: кэши таблиц, пул соединений
+    times = []
+    total = 0.0
+    while len(times) < repeat or (total < min_time and len(times) < 1000):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return times
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_suite(names: list, repeat: int, min_time: float) -> dict:
+    results = {}
+    for name in names:
+        factory, size = BENCHMARKS[name]
+        times = measure(factory(), repeat, min_time)
+        median = statistics.median(times)
+        result = {
+            "runs": len(times),
+            "median": median,
+            "min": min(times),
+            "mean": statistics.fmean(times),
+        }
+        if size is not None:
+            result["size"] = size
+            result["throughput_mb_s"] = size / MB / median
+        results[name] = result
+        print(f"{name:40s} {median * 1e3:12.3f} мс" + (
+            f" {result['throughput_mb_s']:10.1f} МБ/с" if size is not None else ""
+        ))
+    _http.close()
+    return {"meta": metadata(), "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Печать сравнения с базовым прогоном, возвращает имена регрессий"""
+    regressions = []
+    print(f"\n{'замер':40s} {'база, мс':>12s} {'сейчас, мс':>12s} {'отношение':>10s}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["median"] / base["median"]
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "  РЕГРЕССИЯ"
+            regressions.append(name)
+        print(f"{name:40s} {base['median'] * 1e3:12.3f} {result['median'] * 1e3:12.3f} {ratio:10.2f}{mark}")
+    return regressions
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--output", help="Файл для JSON-отчета")
+    parser.add_argument("--baseline", help="JSON-отчет базового прогона для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Допустимый рост медианы (0.1 = 10%%)")
+    parser.add_argument("--filter", nargs="*", default=[], help="Подстроки имен замеров")
+    parser.add_argument("--max-size", type=float, default=10, help="Наибольший размер текста, МБ")
+    parser.add_argument("--repeat", type=int, default=5, help="Минимальное число прогонов")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Минимальное суммарное время, с")
+    parser.add_argument("--list", action="store_true", help="Вывести имена замеров")
+    args = parser.parse_args(argv)
+
+    names = [
+        name for name, (_, size) in BENCHMARKS.items()
+        if (not args.filter or any(part in name for part in args.filter))
+        and (size is None or size <= args.max_size * MB)
+    ]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+
+    report = run_suite(names, args.repeat, args.min_time)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
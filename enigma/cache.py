@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    def __init__(self, maxsize: int):
+        """
+        Потокобезопасный кэш с вытеснением давно не использованных записей
+        :param maxsize: Максимальное число записей
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """Значение по ключу или None"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Добавление записи с вытеснением самой старой"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        """Удаление записи, если она есть"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Пулы машин Энигмы (ciphers.enigma.pool) по имени конфигурации из БД
+machine_cache = LRUCache(maxsize=256)
+
+# Пулы машин Энигмы по конфигурации из запроса (JSON настроек)
+config_pools = LRUCache(maxsize=256)
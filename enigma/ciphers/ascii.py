@@ -0,0 +1,61 @@
+import numpy as np
+
+# Классы байтов: 0-25 - индекс латинской буквы (оба регистра)
+OTHER = 26
+NON_ASCII = 27
+
+# Таблица классов для всех 256 значений байта
+BYTE_CLASS = bytes([
+    (byte & 0xDF) - ord('A') if ord('A') <= byte & 0xDF <= ord('Z') and byte < 0x80
+    else OTHER if byte < 0x80 else NON_ASCII
+    for byte in range(256)
+])
+
+# Политики для байтов вне ASCII. Буквы кириллицы и другие не-латинские буквы
+# в UTF-8 состоят только из таких байтов, поэтому шифры их не заменяют:
+# KEEP - байты переносятся в результат без изменений,
+# DROP - байты удаляются из результата,
+# ERROR - ValueError с позицией первого такого байта
+KEEP = "keep"
+DROP = "drop"
+ERROR = "error"
+NON_LATIN_POLICIES = (KEEP, DROP, ERROR)
+
+_NON_ASCII_BYTES = bytes(range(0x80, 0x100))
+
+
+def source_array(data, non_latin: str = KEEP) -> np.ndarray:
+    """
+    Входные байты в виде массива uint8 с примененной политикой
+    :param data: bytes, bytearray или memoryview
+    :param non_latin: Политика для байтов вне ASCII
+    :return: Массив поверх data (копия - только при удалении байтов)
+    """
+    if non_latin not in NON_LATIN_POLICIES:
+        raise ValueError(f"Unknown non-Latin policy: {non_latin}")
+    array = np.frombuffer(data, dtype=np.uint8)
+    if non_latin == KEEP:
+        return array
+    high = np.flatnonzero(array >= 0x80)
+    if not len(high):
+        return array
+    if non_latin == ERROR:
+        raise ValueError(f"Non-ASCII byte 0x{array[high[0]]:02x} at offset {high[0]}")
+    return np.frombuffer(array.tobytes().translate(None, _NON_ASCII_BYTES), dtype=np.uint8)
+
+
+def target_array(out, size: int) -> tuple:
+    """
+    Буфер результата: переданный вызывающим или новый
+    :param out: Изменяемый буфер (bytearray, memoryview) не короче size; None - новый bytearray
+    :param size: Число байтов результата
+    :return: (буфер, массив uint8 поверх его первых size байтов)
+    """
+    if out is None:
+        out = bytearray(size)
+    array = np.frombuffer(out, dtype=np.uint8)
+    if len(array) < size:
+        raise ValueError(f"Output buffer too small: {len(array)} < {size}")
+    if not array.flags.writeable:
+        raise ValueError("Output buffer is read-only")
+    return out, array[:size]
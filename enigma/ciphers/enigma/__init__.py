@@ -1,2 +1,2 @@
 from .configs import EnigmaInput
-from .main import setup_enigma
+from .main import setup_enigma, encrypt_parallel
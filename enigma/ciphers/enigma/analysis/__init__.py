@@ -0,0 +1 @@
+from .search import Candidate, SearchReport, search_ciphertext, search_crib
@@ -0,0 +1,141 @@
+from functools import lru_cache
+from itertools import permutations
+
+import numpy as np
+
+from ..configs import REFLECTOR_CONFIGS, ROTOR_CONFIGS
+from ..stepping import positions_after
+from ..tables import STATES, state_positions
+
+# Порядки роторов [правый, средний, левый] и рефлекторы: 6 * 2 вариантов
+WHEEL_ORDERS = [
+    (rotors, reflector)
+    for rotors in permutations(ROTOR_CONFIGS)
+    for reflector in REFLECTOR_CONFIGS
+]
+
+# Позиции роторов каждого состояния: STATE_POSITIONS[:, state] = [правый, средний, левый]
+STATE_POSITIONS = np.array(state_positions(np.arange(STATES)), dtype=np.int32)
+
+
+def letter_indexes(text: str) -> np.ndarray:
+    """Индексы латинских букв текста (0-25); остальные символы роторы не поворачивают"""
+    data = np.frombuffer(text.encode("ascii", "ignore"), dtype=np.uint8) & 0xDF
+    return (data[(data >= ord('A')) & (data <= ord('Z'))] - ord('A')).astype(np.int32)
+
+
+def _wiring(letters: str) -> np.ndarray:
+    return np.frombuffer(letters.encode("ascii"), dtype=np.uint8).astype(np.int32) - ord('A')
+
+
+def _shifted(mapping: np.ndarray) -> np.ndarray:
+    """Отображение ротора для всех 26 смещений: [смещение, вход]"""
+    d = np.arange(26)[:, None]
+    c = np.arange(26)[None, :]
+    return (mapping[(c + d) % 26] - d) % 26
+
+
+@lru_cache(maxsize=len(WHEEL_ORDERS))
+def core_table(rotors: tuple, reflector: str) -> np.ndarray:
+    """
+    Подстановки роторов и рефлектора без коммутатора для всех смещений
+    Плоский массив: индекс ((смещение правого * 26 + среднего) * 26 + левого) * 26 + буква,
+    смещение - позиция ротора минус кольцевая настройка.
+    :param rotors: Роторы [правый, средний, левый]
+    :param reflector: Рефлектор
+    """
+    forward = []
+    backward = []
+    for name in rotors:
+        mapping = _wiring(ROTOR_CONFIGS[name]["wiring"])
+        forward.append(_shifted(mapping))
+        backward.append(_shifted(np.argsort(mapping)))
+    reflect = _wiring(REFLECTOR_CONFIGS[reflector])
+
+    right, middle, left, c = np.ix_(*[np.arange(26)] * 4)
+    c = forward[0][right, c]
+    c = forward[1][middle, c]
+    c = forward[2][left, c]
+    c = reflect[c]
+    c = backward[2][left, c]
+    c = backward[1][middle, c]
+    c = backward[0][right, c]
+    return c.astype(np.uint8).ravel()
+
+
+def notches(rotors: tuple) -> tuple:
+    return tuple(ord(ROTOR_CONFIGS[name]["notch"]) - ord('A') for name in rotors)
+
+
+@lru_cache(maxsize=8)
+def next_states(rotor_notches: tuple) -> np.ndarray:
+    """Номер следующего состояния роторов для каждого состояния"""
+    right, middle, left = positions_after(STATE_POSITIONS, rotor_notches, 1)
+    return (right + 26 * middle + 676 * left).astype(np.int32)
+
+
+def offset_index(right, middle, left, rings) -> np.ndarray:
+    """Начало подстановки в core_table для позиций и кольцевых настроек"""
+    return ((((right - rings[0]) % 26) * 26 + (middle - rings[1]) % 26) * 26 + (left - rings[2]) % 26) * 26
+
+
+def decrypt_rows(core: np.ndarray, rotor_notches: tuple, starts: np.ndarray, rings,
+                 cipher: np.ndarray, plugboard: np.ndarray | None = None) -> np.ndarray:
+    """
+    Расшифрование одного текста для многих начальных состояний сразу
+    :param core: Таблица core_table порядка роторов
+    :param rotor_notches: Выемки роторов
+    :param starts: Номера начальных состояний (N,)
+    :param rings: Кольцевые настройки: тройка или массив (3, N)
+    :param cipher: Индексы букв шифротекста (L,)
+    :param plugboard: Коммутатор: перестановка (26,) или (N, 26); None - без коммутатора
+    :return: Индексы букв открытого текста (N, L)
+    """
+    step = next_states(rotor_notches)
+    # При общих кольцах начало подстановки берется готовым для каждого состояния
+    base = offset_index(*STATE_POSITIONS, rings) if np.ndim(rings[0]) == 0 else None
+    result = np.empty((len(starts), len(cipher)), dtype=np.uint8)
+    if plugboard is not None and plugboard.ndim == 2:
+        rows = np.arange(len(starts))
+    states = starts
+    for k, letter in enumerate(cipher):
+        states = step[states]
+        if base is not None:
+            index = base[states]
+        else:
+            index = offset_index(*STATE_POSITIONS[:, states], rings)
+        if plugboard is None:
+            result[:, k] = core[index + letter]
+        elif plugboard.ndim == 1:
+            result[:, k] = plugboard[core[index + plugboard[letter]]]
+        else:
+            result[:, k] = plugboard[rows, core[index + plugboard[:, letter]]]
+    return result
+
+
+def substitution_rows(core: np.ndarray, rotor_notches: tuple, start: int, rings, length: int) -> np.ndarray:
+    """Подстановки без коммутатора для каждой буквы сообщения (length, 26)"""
+    steps = np.arange(1, length + 1)
+    right, middle, left = positions_after(STATE_POSITIONS[:, start], rotor_notches, steps)
+    index = offset_index(right, middle, left, rings)
+    return core[index[:, None] + np.arange(26)]
+
+
+def index_of_coincidence(letters: np.ndarray) -> np.ndarray:
+    """Индекс совпадений каждой строки массива букв (N, L)"""
+    count, length = letters.shape
+    offsets = (np.arange(count, dtype=np.int64) * 26)[:, None]
+    frequencies = np.bincount((offsets + letters).ravel(), minlength=count * 26).reshape(count, 26)
+    return (frequencies * (frequencies - 1)).sum(axis=1) / max(length * (length - 1), 1)
+
+
+def identity_plugboard() -> np.ndarray:
+    return np.arange(26, dtype=np.int32)
+
+
+def plugboard_pairs(plugboard: np.ndarray) -> list:
+    """Пары коммутатора ["A", "B"] по перестановке"""
+    return [
+        [chr(a + ord('A')), chr(int(b) + ord('A'))]
+        for a, b in enumerate(plugboard) if a < b
+    ]
@@ -0,0 +1,71 @@
+import numpy as np
+
+from .core import identity_plugboard, index_of_coincidence
+
+# Число пар коммутатора в исторических ключах
+MAX_PAIRS = 10
+
+# Улучшение оценки, меньше которого подъем останавливается
+MIN_GAIN = 1e-9
+
+_PAIRS = np.array([(a, b) for a in range(26) for b in range(a + 1, 26)], dtype=np.int32)
+
+
+def decrypt_with(rows: np.ndarray, cipher: np.ndarray, plugboards: np.ndarray) -> np.ndarray:
+    """
+    Расшифрование при известных подстановках роторов для нескольких коммутаторов
+    :param rows: Подстановки без коммутатора для каждой буквы (L, 26)
+    :param cipher: Индексы букв шифротекста (L,)
+    :param plugboards: Перестановки коммутатора (M, 26)
+    :return: Индексы букв открытого текста (M, L)
+    """
+    middle = rows[np.arange(len(cipher)), plugboards[:, cipher]]
+    return np.take_along_axis(plugboards, middle, axis=1)
+
+
+def _moves(plugboard: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+    """
+    Коммутаторы, получаемые переключением каждой пары (a, b)
+    Соединенные друг с другом a и b разъединяются, иначе их прежние
+    партнеры освобождаются и a соединяется с b.
+    """
+    a, b = pairs[:, 0], pairs[:, 1]
+    partner_a, partner_b = plugboard[a], plugboard[b]
+    rows = np.arange(len(pairs))
+    candidates = np.tile(plugboard, (len(pairs), 1))
+    candidates[rows, partner_a] = partner_a
+    candidates[rows, partner_b] = partner_b
+    connect = partner_a != b
+    candidates[rows[connect], a[connect]] = b[connect]
+    candidates[rows[connect], b[connect]] = a[connect]
+    return candidates
+
+
+def climb_plugboard(rows: np.ndarray, cipher: np.ndarray, plugboard: np.ndarray | None = None,
+                    fixed=(), max_pairs: int = MAX_PAIRS) -> tuple:
+    """
+    Подбор коммутатора подъемом по индексу совпадений
+    На каждом шаге оцениваются все 325 переключений пар сразу и применяется лучшее.
+    :param rows: Подстановки роторов без коммутатора для каждой буквы (L, 26)
+    :param cipher: Индексы букв шифротекста (L,)
+    :param plugboard: Начальный коммутатор; None - без пар
+    :param fixed: Буквы, соединения которых известны и не меняются
+    :param max_pairs: Наибольшее число пар
+    :return: (коммутатор, индекс совпадений)
+    """
+    plugboard = identity_plugboard() if plugboard is None else plugboard.copy()
+    fixed = set(fixed)
+    pairs = _PAIRS[[a not in fixed and b not in fixed for a, b in _PAIRS]]
+    score = index_of_coincidence(decrypt_with(rows, cipher, plugboard[None, :]))[0]
+    if not len(pairs):
+        return plugboard, score
+
+    while True:
+        candidates = _moves(plugboard, pairs)
+        allowed = (candidates != np.arange(26)).sum(axis=1) <= 2 * max_pairs
+        scores = index_of_coincidence(decrypt_with(rows, cipher, candidates))
+        scores[~allowed] = -1
+        best = int(np.argmax(scores))
+        if scores[best] <= score + MIN_GAIN:
+            return plugboard, score
+        plugboard, score = candidates[best], scores[best]
@@ -0,0 +1,125 @@
+import numpy as np
+
+from ..tables import STATES
+from .core import STATE_POSITIONS, offset_index
+
+
+def crib_positions(cipher: np.ndarray, crib: np.ndarray) -> list:
+    """
+    Позиции, где может стоять известный открытый текст
+    Энигма никогда не шифрует букву в саму себя.
+    """
+    return [
+        position for position in range(len(cipher) - len(crib) + 1)
+        if not np.any(cipher[position:position + len(crib)] == crib)
+    ]
+
+
+class Menu:
+    def __init__(self, crib: np.ndarray, cipher: np.ndarray):
+        """
+        Меню бомбы: граф букв, связанных парами (открытый, шифрованный) текста
+        Для связной компоненты с наибольшим числом связей строится порядок
+        проверки: от буквы с наибольшей степенью выводятся соединения коммутатора
+        остальных букв, а связи, замыкающие циклы, служат проверками.
+        :param crib: Индексы букв известного открытого текста
+        :param cipher: Индексы букв шифротекста на том же месте
+        """
+        self.length = len(crib)
+        edges = [(k, int(a), int(b)) for k, (a, b) in enumerate(zip(crib, cipher))]
+
+        # Связные компоненты объединением множеств
+        parent = list(range(26))
+
+        def find(letter):
+            while parent[letter] != letter:
+                parent[letter] = parent[parent[letter]]
+                letter = parent[letter]
+            return letter
+
+        for _, a, b in edges:
+            parent[find(a)] = find(b)
+        components = {}
+        for edge in edges:
+            components.setdefault(find(edge[1]), []).append(edge)
+        component = max(components.values(), key=len)
+
+        degree = {}
+        for _, a, b in component:
+            degree[a] = degree.get(a, 0) + 1
+            degree[b] = degree.get(b, 0) + 1
+        self.start = max(degree, key=degree.get)
+        self.letters = sorted(degree)
+
+        # Порядок обхода: ("derive", k, от, к) или ("check", k, a, b)
+        self.steps = []
+        adjacency = {letter: [] for letter in degree}
+        for edge in component:
+            adjacency[edge[1]].append(edge)
+            adjacency[edge[2]].append(edge)
+        known = {self.start}
+        used = set()
+        queue = [self.start]
+        for letter in queue:
+            for k, a, b in adjacency[letter]:
+                if k in used:
+                    continue
+                used.add(k)
+                other = b if a == letter else a
+                if other in known:
+                    self.steps.append(("check", k, letter, other))
+                else:
+                    known.add(other)
+                    queue.append(other)
+                    self.steps.append(("derive", k, letter, other))
+
+    @property
+    def loops(self) -> int:
+        """Число замкнутых циклов меню: чем больше, тем меньше ложных остановок"""
+        return sum(step[0] == "check" for step in self.steps)
+
+
+def scan_menu(core: np.ndarray, menu: Menu, turnover: int | None = None) -> tuple:
+    """
+    Проверка меню для всех смещений роторов и всех 26 гипотез о соединении начальной буквы
+    Смещения (позиция минус кольцо) относятся к первой букве открытого текста; правый
+    ротор поворачивается на каждой букве, средний - один раз перед буквой turnover.
+    :param core: Таблица core_table порядка роторов
+    :param menu: Меню
+    :param turnover: Номер буквы, перед которой поворачивается средний ротор; None - не поворачивается
+    :return: (номера состояний смещений, массив соединений букв меню (N, len(menu.letters)))
+    """
+    right, middle, left = STATE_POSITIONS
+    bases = []
+    for k in range(menu.length):
+        shift = 1 if turnover is not None and k >= turnover else 0
+        bases.append(offset_index(right + k, middle + shift, left, (0, 0, 0)))
+
+    # Строка - пара (состояние, гипотеза); после каждой проверки остаются выжившие строки
+    states = np.repeat(np.arange(STATES, dtype=np.int32), 26)
+    values = {menu.start: np.tile(np.arange(26, dtype=np.int32), STATES)}
+    for kind, k, a, b in menu.steps:
+        derived = core[bases[k][states] + values[a]].astype(np.int32)
+        if kind == "derive":
+            values[b] = derived
+            continue
+        alive = derived == values[b]
+        states = states[alive]
+        values = {letter: value[alive] for letter, value in values.items()}
+
+    # Соединения коммутатора взаимны и не пересекаются
+    letters = menu.letters
+    plugged = np.stack([values[letter] for letter in letters], axis=1)
+    rows = np.arange(len(states))
+    forward = np.full((len(states), 26), -1, dtype=np.int32)
+    forward[:, letters] = plugged
+    backward = np.full((len(states), 26), -1, dtype=np.int32)
+    for i, letter in enumerate(letters):
+        backward[rows, plugged[:, i]] = letter
+    consistent = np.ones(len(states), dtype=bool)
+    for i, letter in enumerate(letters):
+        partner = plugged[:, i]
+        consistent &= backward[rows, partner] == letter
+        consistent &= (forward[rows, partner] == -1) | (forward[rows, partner] == letter)
+        consistent &= (backward[:, letter] == -1) | (backward[:, letter] == partner)
+    return states[consistent], plugged[consistent]
@@ -0,0 +1,353 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+import numpy as np
+
+from ..configs import EnigmaConfig
+from ..stepping import positions_after
+from ..tables import STATES, state_positions
+from .core import (
+    STATE_POSITIONS, WHEEL_ORDERS, core_table, decrypt_rows, identity_plugboard, index_of_coincidence,
+    letter_indexes, notches, plugboard_pairs, substitution_rows,
+)
+from .hillclimb import MAX_PAIRS, climb_plugboard
+from .menu import Menu, crib_positions, scan_menu
+
+# Число начальных состояний, расшифровываемых за один проход (ограничивает память)
+SCAN_CHUNK = 2048
+
+# Число лучших положений каждого порядка роторов, для которых подбираются кольца
+KEEP = 16
+
+# Число кандидатов каждого задания, для которых подбирается коммутатор
+CLIMB = 3
+
+# Наибольшее число остановок бомбы, разбираемых в одном задании
+MAX_STOPS = 256
+
+# Все пары кольцевых настроек правого и среднего ротора (кольцо левого ротора
+# равносильно сдвигу его позиции)
+_RING_RIGHT, _RING_MIDDLE = np.divmod(np.arange(26 * 26), 26)
+_RING_LEFT = np.zeros(26 * 26, dtype=np.int64)
+
+
+class Candidate:
+    def __init__(self, rotors: tuple, reflector: str, ring_settings: list, start: int,
+                 plugboard: np.ndarray, score: float):
+        """
+        Найденный ключ Энигмы
+        :param rotors: Роторы [правый, средний, левый]
+        :param reflector: Рефлектор
+        :param ring_settings: Кольцевые настройки
+        :param start: Номер начального состояния роторов
+        :param plugboard: Перестановка коммутатора
+        :param score: Индекс совпадений расшифрованного текста
+        """
+        self.rotors = list(rotors)
+        self.reflector = reflector
+        self.ring_settings = [int(ring) for ring in ring_settings]
+        self.initial_positions = "".join(chr(position + ord('A')) for position in state_positions(int(start)))
+        self.plugboard_pairs = plugboard_pairs(plugboard)
+        self.score = float(score)
+
+    def config(self) -> EnigmaConfig:
+        return EnigmaConfig(
+            rotors=self.rotors,
+            reflector=self.reflector,
+            ring_settings=self.ring_settings,
+            initial_positions=self.initial_positions,
+            plugboard_pairs=self.plugboard_pairs,
+        )
+
+    def to_dict(self) -> dict:
+        return {**self.config().model_dump(), "score": self.score}
+
+
+class SearchReport:
+    def __init__(self, total: int):
+        """
+        Ход и результат поиска ключа
+        :param total: Число заданий (порядков роторов, а для поиска по шпаргалке - и позиций)
+        """
+        self.total = total
+        self.done = 0
+        self.evaluated = 0
+        self.candidates = []
+        self.complete = True
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def best(self) -> Candidate | None:
+        return self.candidates[0] if self.candidates else None
+
+    def add(self, result: tuple):
+        """Учет результата задания (кандидаты, число оцененных вариантов, завершено ли)"""
+        candidates, evaluated, complete = result
+        self.done += 1
+        self.evaluated += evaluated
+        self.complete &= complete
+        self.candidates = sorted(self.candidates + candidates, key=lambda c: c.score, reverse=True)
+
+    def to_dict(self, limit: int = 10) -> dict:
+        return {
+            "done": self.done,
+            "total": self.total,
+            "evaluated": self.evaluated,
+            "elapsed": round(self.elapsed, 3),
+            "complete": self.complete,
+            "candidates": [candidate.to_dict() for candidate in self.candidates[:limit]],
+        }
+
+
+def _expired(deadline: float | None) -> bool:
+    return deadline is not None and time.time() >= deadline
+
+
+def _best_rings(core: np.ndarray, rotor_notches: tuple, cipher: np.ndarray, starts: np.ndarray,
+                rings: tuple, plugboard: np.ndarray) -> tuple:
+    """Лучшая по индексу совпадений пара (начальное состояние, кольца) из вариантов"""
+    scores = index_of_coincidence(decrypt_rows(core, rotor_notches, starts, rings, cipher, plugboard))
+    best = int(np.argmax(scores))
+    return int(starts[best]), [int(ring[best]) for ring in rings], scores[best]
+
+
+def _ring_variants(start: int, rings=(0, 0, 0)) -> tuple:
+    """
+    Все пары колец правого и среднего ротора при тех же начальных смещениях, что у (start, rings)
+    Смещения роторов в начале сохраняются, меняется только момент их поворота.
+    """
+    right, middle, left = (STATE_POSITIONS[:, start] - np.array(rings)) % 26
+    starts = (right + _RING_RIGHT) % 26 + 26 * ((middle + _RING_MIDDLE) % 26) + 676 * left
+    return starts, (_RING_RIGHT, _RING_MIDDLE, _RING_LEFT)
+
+
+def scan_ciphertext(rotors: tuple, reflector: str, cipher: np.ndarray, keep: int = KEEP, climb: int = CLIMB,
+                    max_pairs: int = MAX_PAIRS, deadline: float | None = None) -> tuple:
+    """
+    Поиск по шифротексту для одного порядка роторов
+    1. Все 17576 начальных положений при нулевых кольцах и пустом коммутаторе
+       оцениваются индексом совпадений (векторно, частями по SCAN_CHUNK).
+    2. Для keep лучших перебираются 676 пар колец правого и среднего ротора.
+    3. Для climb лучших коммутатор подбирается подъемом.
+    :return: (кандидаты, число оцененных вариантов, завершено ли до deadline)
+    """
+    core, rotor_notches = core_table(rotors, reflector), notches(rotors)
+    scores = np.full(STATES, -1.0)
+    evaluated = 0
+    for chunk in range(0, STATES, SCAN_CHUNK):
+        if _expired(deadline):
+            break
+        starts = np.arange(chunk, min(chunk + SCAN_CHUNK, STATES))
+        scores[starts] = index_of_coincidence(decrypt_rows(core, rotor_notches, starts, (0, 0, 0), cipher))
+        evaluated += len(starts)
+
+    refined = []
+    for start in np.argsort(-scores)[:keep]:
+        if scores[start] < 0 or _expired(deadline):
+            break
+        starts, rings = _ring_variants(int(start))
+        refined.append(_best_rings(core, rotor_notches, cipher, starts, rings, None))
+        evaluated += len(starts)
+    refined.sort(key=lambda item: item[2], reverse=True)
+
+    candidates = []
+    for start, rings, score in refined[:climb]:
+        if _expired(deadline):
+            break
+        rows = substitution_rows(core, rotor_notches, start, rings, len(cipher))
+        plugboard, score = climb_plugboard(rows, cipher, max_pairs=max_pairs)
+        # Без коммутатора кольца определяются неточно: уточняем с найденным и повторяем подъем
+        better = _best_rings(core, rotor_notches, cipher, *_ring_variants(start, rings), plugboard)
+        evaluated += 26 * 26
+        if better[2] > score:
+            start, rings, _ = better
+            rows = substitution_rows(core, rotor_notches, start, rings, len(cipher))
+            plugboard, score = climb_plugboard(rows, cipher, plugboard, max_pairs=max_pairs)
+        candidates.append(Candidate(rotors, reflector, rings, start, plugboard, score))
+    return candidates, evaluated, not _expired(deadline)
+
+
+@lru_cache(maxsize=64)
+def _inverse_steps(rotor_notches: tuple, steps: int) -> np.ndarray:
+    """Начальное состояние по состоянию через steps шагов (-1 - недостижимо)"""
+    right, middle, left = positions_after(STATE_POSITIONS, rotor_notches, steps)
+    inverse = np.full(STATES, -1, dtype=np.int64)
+    inverse[right + 26 * middle + 676 * left] = np.arange(STATES)
+    return inverse
+
+
+def _resolve_stop(rotor_notches: tuple, offsets, turnover: int | None, position: int, length: int) -> tuple:
+    """
+    Начальные состояния и кольца, при которых смещения роторов на шпаргалке совпадают с остановкой
+    :param offsets: Смещения [правый, средний, левый] на первой букве шпаргалки
+    :return: (начальные состояния, (кольца правого, среднего, левого ротора))
+    """
+    right = (offsets[0] + _RING_RIGHT) % 26
+    middle = (offsets[1] + _RING_MIDDLE) % 26
+    starts = _inverse_steps(rotor_notches, position + 1)[right + 26 * middle + 676 * offsets[2]]
+    reachable = starts >= 0
+    starts, ring_right, ring_middle = starts[reachable], _RING_RIGHT[reachable], _RING_MIDDLE[reachable]
+
+    k = np.arange(length)
+    steps = position + 1 + k[None, :]
+    right, middle, left = positions_after(
+        [STATE_POSITIONS[i, starts][:, None] for i in range(3)], rotor_notches, steps
+    )
+    shift = (k >= turnover) if turnover is not None else 0
+    match = (
+        np.all((right - ring_right[:, None]) % 26 == (offsets[0] + k) % 26, axis=1)
+        & np.all((middle - ring_middle[:, None]) % 26 == (offsets[1] + shift) % 26, axis=1)
+        & np.all(left % 26 == offsets[2], axis=1)
+    )
+    return starts[match], (ring_right[match], ring_middle[match], np.zeros(int(match.sum()), dtype=np.int64))
+
+
+def scan_crib(rotors: tuple, reflector: str, cipher: np.ndarray, crib: np.ndarray, position: int,
+              climb: int = CLIMB, max_pairs: int = MAX_PAIRS, deadline: float | None = None) -> tuple:
+    """
+    Поиск по шпаргалке (известному открытому тексту) для одного порядка роторов
+    1. Меню бомбы проверяется для всех смещений роторов, всех гипотез о соединении
+       начальной буквы и всех моментов поворота среднего ротора (или его отсутствия).
+    2. Для каждой остановки находятся кольца и начальное положение, согласующиеся
+       с ней на всей шпаргалке; остановки ранжируются по индексу совпадений.
+    3. Для climb лучших перебираются все подходящие кольца, коммутатор дополняется
+       подъемом при неизменных соединениях из меню.
+    Двойной шаг среднего ротора внутри шпаргалки не рассматривается.
+    :return: (кандидаты, число оцененных вариантов, завершено ли до deadline)
+    """
+    core, rotor_notches = core_table(rotors, reflector), notches(rotors)
+    menu = Menu(crib, cipher[position:position + len(crib)])
+    stops = []
+    evaluated = 0
+    for turnover in [None, *range(1, len(crib))]:
+        if _expired(deadline) or len(stops) >= MAX_STOPS:
+            break
+        states, plugged = scan_menu(core, menu, turnover)
+        evaluated += STATES * 26
+        for state, values in zip(states, plugged):
+            starts, rings = _resolve_stop(rotor_notches, STATE_POSITIONS[:, state], turnover, position, len(crib))
+            if len(starts):
+                plugboard = identity_plugboard()
+                plugboard[menu.letters] = values
+                plugboard[values] = menu.letters
+                stops.append((starts, rings, plugboard))
+    stops = stops[:MAX_STOPS]
+    if not stops:
+        return [], evaluated, not _expired(deadline)
+
+    # Ранжирование остановок по первому подходящему варианту колец
+    first = np.array([starts[0] for starts, _, _ in stops])
+    first_rings = tuple(np.array([rings[i][0] for _, rings, _ in stops]) for i in range(3))
+    plugboards = np.stack([plugboard for _, _, plugboard in stops])
+    scores = index_of_coincidence(decrypt_rows(core, rotor_notches, first, first_rings, cipher, plugboards))
+    evaluated += len(stops)
+
+    candidates = []
+    for index in np.argsort(-scores)[:climb]:
+        if _expired(deadline):
+            break
+        starts, rings, plugboard = stops[index]
+        start, best_rings, _ = _best_rings(core, rotor_notches, cipher, starts, rings, plugboard)
+        evaluated += len(starts)
+        fixed = {letter for letter in range(26) if plugboard[letter] != letter} | set(menu.letters)
+        rows = substitution_rows(core, rotor_notches, start, best_rings, len(cipher))
+        plugboard, score = climb_plugboard(rows, cipher, plugboard, fixed, max_pairs)
+        candidates.append(Candidate(rotors, reflector, best_rings, start, plugboard, score))
+    return candidates, evaluated, not _expired(deadline)
+
+
+def _run(tasks: list, workers: int | None, progress) -> SearchReport:
+    """
+    Выполнение заданий (функция, аргументы) в пуле процессов
+    workers=1 - в текущем процессе, None - по числу ядер. Поиск идет в
+    собственном пуле, чтобы долгие задания не занимали пул шифрования.
+    """
+    report = SearchReport(len(tasks))
+    if workers == 1:
+        for func, args in tasks:
+            report.add(func(*args))
+            if progress is not None:
+                progress(report)
+        return report
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(), mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        # Срок проверяют сами задания: опоздавшие возвращаются сразу
+        futures = [executor.submit(func, *args) for func, args in tasks]
+        for future in as_completed(futures):
+            report.add(future.result())
+            if progress is not None:
+                progress(report)
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return report
+
+
+def _deadline(time_budget: float | None) -> float | None:
+    return time.time() + time_budget if time_budget is not None else None
+
+
+def search_ciphertext(text: str, workers: int | None = None, time_budget: float | None = None,
+                      progress=None, keep: int = KEEP, climb: int = CLIMB,
+                      max_pairs: int = MAX_PAIRS) -> SearchReport:
+    """
+    Поиск ключа только по шифротексту (индекс совпадений и подъем по коммутатору)
+    Надежен для сообщений от нескольких сотен букв.
+    :param text: Шифротекст (учитываются латинские буквы)
+    :param workers: Число процессов; 1 - в текущем процессе, None - по числу ядер
+    :param time_budget: Ограничение времени, секунды; по истечении возвращается лучшее найденное
+    :param progress: Функция, вызываемая с SearchReport после каждого задания
+    :param keep: Число положений каждого порядка роторов для подбора колец
+    :param climb: Число кандидатов каждого порядка роторов для подбора коммутатора
+    :param max_pairs: Наибольшее число пар коммутатора
+    """
+    cipher = letter_indexes(text)
+    deadline = _deadline(time_budget)
+    tasks = [
+        (scan_ciphertext, (rotors, reflector, cipher, keep, climb, max_pairs, deadline))
+        for rotors, reflector in WHEEL_ORDERS
+    ]
+    return _run(tasks, workers, progress)
+
+
+def search_crib(text: str, crib: str, position: int | None = None, workers: int | None = None,
+                time_budget: float | None = None, progress=None, climb: int = CLIMB,
+                max_pairs: int = MAX_PAIRS) -> SearchReport:
+    """
+    Поиск ключа по шпаргалке - известному фрагменту открытого текста (как у бомбы Тьюринга)
+    :param text: Шифротекст (учитываются латинские буквы)
+    :param crib: Известный открытый текст
+    :param position: Номер буквы шифротекста, с которой начинается шпаргалка;
+        None - все позиции, где ни одна буква не переходит в себя
+    :param workers: Число процессов; 1 - в текущем процессе, None - по числу ядер
+    :param time_budget: Ограничение времени, секунды; по истечении возвращается лучшее найденное
+    :param progress: Функция, вызываемая с SearchReport после каждого задания
+    :param climb: Число остановок каждого задания для подбора коммутатора
+    :param max_pairs: Наибольшее число пар коммутатора
+    """
+    cipher = letter_indexes(text)
+    crib = letter_indexes(crib)
+    if not len(crib) or len(crib) > len(cipher):
+        raise ValueError("Crib is empty or longer than the ciphertext")
+    positions = crib_positions(cipher, crib)
+    if position is not None:
+        if position not in positions:
+            raise ValueError("Crib does not fit the ciphertext at this position")
+        positions = [position]
+
+    deadline = _deadline(time_budget)
+    tasks = [
+        (scan_crib, (rotors, reflector, cipher, crib, position, climb, max_pairs, deadline))
+        for position in positions
+        for rotors, reflector in WHEEL_ORDERS
+    ]
+    return _run(tasks, workers, progress)
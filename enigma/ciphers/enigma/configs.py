@@ -13,6 +13,10 @@ class EnigmaConfig(BaseModel):
 
 class EnigmaInput(EnigmaConfig):
     text: str
+    # Число букв, уже зашифрованных в этом сообщении (продолжение с середины)
+    offset: int = Field(default=0, ge=0)
+    # Шифрование длинного текста в пуле процессов
+    parallel: bool = False
 
 
 ROTOR_CONFIGS = {
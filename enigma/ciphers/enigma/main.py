@@ -1,7 +1,33 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+
+from ..ascii import BYTE_CLASS, KEEP, source_array, target_array
 from .configs import EnigmaConfig, REFLECTOR_CONFIGS, ROTOR_CONFIGS
+from .stepping import positions_after
+from .tables import LETTER_INDEX, EnigmaTables, get_tables, state_index, state_positions
+from .vectorized import BULK_THRESHOLD, encrypt_array, encrypt_bulk
+
+
+@lru_cache(maxsize=None)
+def _wiring_maps(wiring: str) -> tuple:
+    """Прямое и обратное отображения контактов, общие для всех роторов с этой проводкой"""
+    forward = tuple(ord(char) - ord('A') for char in wiring)
+    backward = [0] * 26
+    for i, c in enumerate(forward):
+        backward[c] = i
+    return forward, tuple(backward)
 
 
 class Rotor:
+    # Без __dict__: у ротора меняется только позиция, отображения общие и неизменяемые
+    __slots__ = ("wiring", "notch", "position", "ring_setting", "forward_map", "backward_map")
+
     def __init__(self, wiring: str, notch: str, position: int = 0, ring_setting: int = 0):
         """
         Инициализация ротора
@@ -14,19 +40,18 @@ class Rotor:
         self.notch = ord(notch) - ord('A')
         self.position = position
         self.ring_setting = ring_setting
-        self.forward_map = self._create_map()
-        self.backward_map = self._create_reverse_map()
+        self.forward_map, self.backward_map = _wiring_maps(wiring)
 
-    def _create_map(self) -> list:
-        """Создание прямого отображения контактов"""
-        return [ord(char) - ord('A') for char in self.wiring]
-
-    def _create_reverse_map(self) -> list:
-        """Создание обратного отображения контактов"""
-        reverse_map = [0] * 26
-        for i, char in enumerate(self.wiring):
-            reverse_map[ord(char) - ord('A')] = i
-        return reverse_map
+    def copy(self) -> "Rotor":
+        """Ротор с собственной позицией и общими отображениями"""
+        rotor = Rotor.__new__(Rotor)
+        rotor.wiring = self.wiring
+        rotor.notch = self.notch
+        rotor.position = self.position
+        rotor.ring_setting = self.ring_setting
+        rotor.forward_map = self.forward_map
+        rotor.backward_map = self.backward_map
+        return rotor
 
     def rotate(self) -> bool:
         """
@@ -50,12 +75,14 @@ class Rotor:
 
 
 class Reflector:
+    __slots__ = ("mapping",)
+
     def __init__(self, wiring: str):
         """
         Инициализация рефлектора
         :param wiring: Статическая проводка (13 пар букв)
         """
-        self.mapping = [ord(char) - ord('A') for char in wiring]
+        self.mapping = _wiring_maps(wiring)[0]
     
     def reflect(self, char: int) -> int:
         """Отражение сигнала"""
@@ -63,6 +90,8 @@ class Reflector:
 
 
 class Plugboard:
+    __slots__ = ("mapping",)
+
     def __init__(self, pairs: list):
         """
         Инициализация коммутационной панели
@@ -70,22 +99,24 @@ class Plugboard:
         """
         self.mapping = self._create_mapping(pairs)
     
-    def _create_mapping(self, pairs: list) -> dict:
-        """Создание отображения замены букв"""
-        mapping = {}
+    def _create_mapping(self, pairs: list) -> tuple:
+        """Полное отображение замены букв (26 элементов)"""
+        mapping = list(range(26))
         for pair in pairs:
             a, b = pair[0].upper(), pair[1].upper()
             a_idx, b_idx = ord(a) - ord('A'), ord(b) - ord('A')
             mapping[a_idx] = b_idx
             mapping[b_idx] = a_idx
-        return mapping
+        return tuple(mapping)
     
     def process(self, char: int) -> int:
-        """Обработка символа через коммутатор"""
-        return self.mapping.get(char, char)
+        """Обработка символа через коммутатор (буквы вне латиницы не меняются)"""
+        return self.mapping[char] if 0 <= char < 26 else char
 
 
 class EnigmaMachine:
+    __slots__ = ("rotors", "reflector", "plugboard", "_tables")
+
     def __init__(self, rotors: list, reflector: Reflector, plugboard: Plugboard):
         """
         Инициализация машины Энигма
@@ -96,6 +127,71 @@ class EnigmaMachine:
         self.rotors = rotors
         self.reflector = reflector
         self.plugboard = plugboard
+        self._tables = None
+
+    @property
+    def tables(self) -> EnigmaTables:
+        """Предвычисленные таблицы подстановки для текущей конфигурации"""
+        if self._tables is None:
+            self._tables = get_tables(
+                tuple((r.forward_map, r.backward_map) for r in self.rotors),
+                tuple(r.notch for r in self.rotors),
+                tuple(r.ring_setting for r in self.rotors),
+                self.reflector.mapping,
+                self.plugboard.mapping,
+            )
+        return self._tables
+
+    def copy(self) -> "EnigmaMachine":
+        """
+        Копия машины с собственными позициями роторов
+        Проводка, рефлектор, коммутатор и таблицы остаются общими.
+        """
+        machine = EnigmaMachine(
+            rotors=[rotor.copy() for rotor in self.rotors],
+            reflector=self.reflector,
+            plugboard=self.plugboard,
+        )
+        machine._tables = self._tables
+        return machine
+
+    def snapshot(self) -> tuple:
+        """Состояние машины для restore: только позиции роторов"""
+        return tuple(rotor.position for rotor in self.rotors)
+
+    def restore(self, snapshot: tuple):
+        """Возврат к состоянию, сохраненному snapshot"""
+        for rotor, position in zip(self.rotors, snapshot):
+            rotor.position = position
+
+    @property
+    def positions(self) -> list:
+        """Позиции роторов [правый, средний, левый]"""
+        return [rotor.position for rotor in self.rotors]
+
+    @positions.setter
+    def positions(self, positions: list):
+        for rotor, position in zip(self.rotors, positions):
+            rotor.position = position
+
+    def advance(self, steps: int):
+        """
+        Переход к состоянию роторов через steps букв без шифрования
+        Позиции вычисляются напрямую по выемкам, без повторения всех шагов.
+        :param steps: Число букв (смещение в сообщении)
+        """
+        if not self._has_fast_path():
+            for _ in range(steps):
+                self._rotate_rotors()
+            return
+        notches = [rotor.notch for rotor in self.rotors]
+        self.positions = positions_after(self.positions, notches, steps)
+
+    def _has_fast_path(self) -> bool:
+        """Таблицы применимы к трем роторам в штатных позициях"""
+        return len(self.rotors) == 3 and all(
+            0 <= rotor.position < 26 for rotor in self.rotors
+        )
 
     def _rotate_rotors(self):
         """Механизм вращения роторов с учетом двойного шага"""
@@ -147,7 +243,89 @@ class EnigmaMachine:
 
     def encrypt(self, text: str) -> str:
         """Шифрование/дешифрование текста"""
-        return ''.join(self._process_char(char) for char in text)
+        if not self._has_fast_path():
+            return ''.join(self._process_char(char) for char in text)
+        if len(text) >= BULK_THRESHOLD and text.isascii():
+            return encrypt_bulk(self, text)
+
+        tables = self.tables
+        next_state = tables.next_state
+        cache = tables.tables
+        state = state_index(self.positions)
+
+        result = []
+        append = result.append
+        for char in text:
+            c = LETTER_INDEX.get(char)
+            if c is None:
+                if char.isalpha():
+                    # Буквы вне латиницы обрабатываются эталонным путем
+                    self._set_state(state)
+                    append(self._process_char(char))
+                    state = state_index(self.positions)
+                else:
+                    append(char)
+                continue
+            state = next_state[state]
+            table = cache[state]
+            if table is None:
+                table = tables.build(state)
+            append(table[c])
+
+        self._set_state(state)
+        return ''.join(result)
+
+    def encrypt_bytes(self, data, out=None, non_latin: str = KEEP) -> memoryview:
+        """
+        Шифрование/дешифрование байтов без перевода в str
+        Латинские буквы (оба регистра) шифруются в заглавные, остальные байты
+        ASCII не меняются и не поворачивают роторы. Байты вне ASCII (в том
+        числе кириллица в UTF-8) обрабатываются по политике non_latin и роторы
+        тоже не поворачивают, в отличие от encrypt для str.
+        :param data: bytes, bytearray или memoryview
+        :param out: Изменяемый буфер для результата (может совпадать с data); None - новый bytearray
+        :param non_latin: Политика для байтов вне ASCII: ascii.KEEP, ascii.DROP или ascii.ERROR
+        :return: memoryview записанной части буфера результата
+        """
+        source = source_array(data, non_latin)
+        out, target = target_array(out, len(source))
+        if self._has_fast_path() and len(source) >= BULK_THRESHOLD:
+            target[:] = source
+            encrypt_array(self, target)
+        else:
+            target[:] = self._encrypt_bytes_loop(source.tobytes())
+        return memoryview(out)[:len(source)]
+
+    decrypt_bytes = encrypt_bytes
+
+    def _encrypt_bytes_loop(self, data: bytes) -> bytearray:
+        """Побайтовое шифрование по таблице классов BYTE_CLASS"""
+        result = bytearray(data)
+        if not self._has_fast_path():
+            for i, byte in enumerate(data):
+                c = BYTE_CLASS[byte]
+                if c < 26:
+                    result[i] = ord(self._process_char(chr(c + ord('A'))))
+            return result
+
+        tables = self.tables
+        next_state = tables.next_state
+        cache = tables.tables
+        state = state_index(self.positions)
+        for i, byte in enumerate(data):
+            c = BYTE_CLASS[byte]
+            if c < 26:
+                state = next_state[state]
+                table = cache[state]
+                if table is None:
+                    table = tables.build(state)
+                result[i] = ord(table[c])
+        self._set_state(state)
+        return result
+
+    def _set_state(self, state: int):
+        """Установка позиций роторов по номеру состояния"""
+        self.positions = state_positions(state)
 
 
 def setup_enigma(input: EnigmaConfig) -> EnigmaMachine:
@@ -177,3 +355,109 @@ def setup_enigma(input: EnigmaConfig) -> EnigmaMachine:
         reflector=reflector,
         plugboard=plugboard
     )
+
+
+# Минимальная длина сегмента при параллельном шифровании
+PARALLEL_MIN_SEGMENT = 1 << 22
+
+# Байты, не являющиеся латинскими буквами (для быстрого подсчета букв)
+_NON_LETTERS = bytes(b for b in range(256) if not chr(b).isascii() or not chr(b).isalpha())
+
+_executor = None
+# Обработчики из пула потоков могут одновременно запросить еще не созданный пул процессов
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Общий пул процессов для параллельного шифрования"""
+    global _executor
+    executor = _executor
+    if executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+            executor = _executor
+    return executor
+
+
+def shutdown_executor():
+    """Остановка пула процессов параллельного шифрования"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(cancel_futures=True)
+
+
+atexit.register(shutdown_executor)
+
+
+def _count_letters(text: str) -> int:
+    """Число символов, на которых поворачиваются роторы"""
+    if text.isascii():
+        return len(text.encode("ascii").translate(None, _NON_LETTERS))
+    return sum(map(str.isalpha, text))
+
+
+def _encrypt_segment(config: dict, offset: int, text: str) -> str:
+    """Шифрование сегмента, начинающегося с буквы номер offset"""
+    enigma = setup_enigma(EnigmaConfig(**config))
+    enigma.advance(offset)
+    return enigma.encrypt(text)
+
+
+def _encrypt_shared(config: dict, offset: int, name: str, start: int, end: int):
+    """Шифрование ASCII-сегмента [start, end) разделяемой памяти на месте"""
+    # Процессы пула делят resource_tracker с родителем, который и освобождает память
+    memory = SharedMemory(name=name)
+    try:
+        view = memory.buf[start:end]
+        view[:] = _encrypt_segment(config, offset, bytes(view).decode("ascii")).encode("ascii")
+        view.release()
+    finally:
+        memory.close()
+
+
+def encrypt_parallel(input: EnigmaConfig, text: str, offset: int = 0, workers: int | None = None) -> str:
+    """
+    Параллельное шифрование длинного текста в пуле процессов
+    Текст делится на сегменты, начальное состояние роторов каждого сегмента
+    вычисляется по числу букв перед ним. ASCII-текст передается процессам
+    через разделяемую память и шифруется в ней на месте; остальной текст
+    передается сегментами через pickle.
+    :param input: Конфигурация Энигмы
+    :param text: Текст
+    :param offset: Число уже зашифрованных букв сообщения
+    :param workers: Число сегментов (по умолчанию - число ядер)
+    """
+    workers = workers or os.cpu_count()
+    size = max(PARALLEL_MIN_SEGMENT, -(-len(text) // workers))
+    bounds = [(i, min(i + size, len(text))) for i in range(0, len(text), size)]
+    if len(bounds) < 2:
+        enigma = setup_enigma(input)
+        enigma.advance(offset)
+        return enigma.encrypt(text)
+
+    segments = [text[start:end] for start, end in bounds]
+    offsets = []
+    for segment in segments:
+        offsets.append(offset)
+        offset += _count_letters(segment)
+
+    config = {field: getattr(input, field) for field in EnigmaConfig.model_fields}
+    executor = _get_executor()
+    if not text.isascii():
+        return ''.join(executor.map(_encrypt_segment, repeat(config), offsets, segments))
+
+    del segments
+    data = text.encode("ascii")
+    memory = SharedMemory(create=True, size=len(data))
+    try:
+        memory.buf[:len(data)] = data
+        del data
+        starts, ends = zip(*bounds)
+        list(executor.map(_encrypt_shared, repeat(config), offsets, repeat(memory.name), starts, ends))
+        return bytes(memory.buf[:len(text)]).decode("ascii")
+    finally:
+        memory.close()
+        memory.unlink()
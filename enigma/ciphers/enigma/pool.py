@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from threading import Lock
+
+from .main import EnigmaMachine
+
+# Число свободных машин, хранимых для одной конфигурации
+MAX_IDLE = 8
+
+
+class MachinePool:
+    def __init__(self, template: EnigmaMachine, max_idle: int = MAX_IDLE):
+        """
+        Машины одной конфигурации для повторного использования
+        Возвращенная машина переводится в начальное состояние шаблона (позиции
+        роторов), проводка и таблицы у всех машин пула общие.
+        :param template: Машина в начальном состоянии
+        :param max_idle: Наибольшее число свободных машин
+        """
+        self.template = template
+        self.start = template.snapshot()
+        self.max_idle = max_idle
+        self.created = 0
+        self.reused = 0
+        self._idle = []
+        self._lock = Lock()
+        # Таблицы строятся один раз и достаются копиям шаблона
+        template.tables
+
+    def acquire(self) -> EnigmaMachine:
+        """Машина в начальном состоянии (свободная или новая копия шаблона)"""
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            self.created += 1
+        return self.template.copy()
+
+    def release(self, machine: EnigmaMachine):
+        """Возврат машины в пул"""
+        machine.restore(self.start)
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(machine)
+
+    @contextmanager
+    def machine(self):
+        """with pool.machine() as enigma: ... - машина возвращается в пул по выходе"""
+        machine = self.acquire()
+        try:
+            yield machine
+        finally:
+            self.release(machine)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"idle": len(self._idle), "created": self.created, "reused": self.reused}
@@ -0,0 +1,38 @@
+def positions_after(positions, notches, steps):
+    """
+    Позиции роторов после steps шагов без пошаговой эмуляции
+    Повторяет EnigmaMachine._rotate_rotors, включая двойной шаг среднего ротора.
+    :param positions: Начальные позиции [правый, средний, левый] (0-25)
+    :param notches: Выемки роторов [правый, средний, ...]
+    :param steps: Число шагов (int или массив NumPy неотрицательных чисел)
+    :return: Позиции [правый, средний, левый] того же вида, что и steps
+    """
+    right, middle, left = positions[0], positions[1], positions[2]
+    notch_right, notch_middle = notches[0], notches[1]
+
+    # Шаги, на которых правый ротор встает на выемку: first, first + 26, ...
+    first = (notch_right - right - 1) % 26 + 1
+
+    def triggers(n):
+        """Число срабатываний правого ротора за n шагов"""
+        return (n - first + 26) // 26
+
+    # Средний ротор на выемке: первый же шаг - двойной
+    started = (steps >= 1) * (middle == notch_middle)
+    middle_start = middle + started
+    left_start = left + started
+    skipped = triggers(1) * started
+    pushes = triggers(steps) - skipped
+
+    # Средний ротор встает на выемку после distance срабатываний и далее
+    # каждые 25, а на следующем шаге делает двойной шаг вместе с левым
+    distance = (notch_middle - middle_start - 1) % 26 + 1
+    landings = (pushes >= distance) * ((pushes - distance) // 25 + 1)
+    last_landing = first + 26 * (distance + 25 * (landings - 1) + skipped - 1)
+    double_steps = landings - (landings > 0) * (last_landing == steps)
+
+    return [
+        (right + steps) % 26,
+        (middle_start + pushes + double_steps) % 26,
+        (left_start + double_steps) % 26,
+    ]
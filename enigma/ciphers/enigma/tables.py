@@ -0,0 +1,131 @@
+from functools import lru_cache
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Число состояний трех роторов: 26 ** 3
+STATES = 26 ** 3
+
+# Индексы латинских букв в обоих регистрах
+LETTER_INDEX = {char: i for i, char in enumerate(ALPHABET)}
+LETTER_INDEX.update({char.lower(): i for i, char in enumerate(ALPHABET)})
+
+
+def state_index(positions) -> int:
+    """Номер состояния по позициям роторов [правый, средний, левый]"""
+    return positions[0] + 26 * positions[1] + 676 * positions[2]
+
+
+def state_positions(state: int) -> list:
+    """Позиции роторов [правый, средний, левый] по номеру состояния"""
+    return [state % 26, state // 26 % 26, state // 676]
+
+
+class EnigmaTables:
+    def __init__(
+        self,
+        rotor_maps: tuple,
+        notches: tuple,
+        ring_settings: tuple,
+        reflector: tuple,
+        plugboard: tuple,
+    ):
+        """
+        Таблицы подстановки для всех положений роторов одной конфигурации
+        :param rotor_maps: Пары (прямое, обратное отображение) для трех роторов
+        :param notches: Выемки роторов
+        :param ring_settings: Кольцевые настройки роторов
+        :param reflector: Отображение рефлектора
+        :param plugboard: Полное отображение коммутационной панели (26 элементов)
+        """
+        self.notches = notches
+        self.ring_settings = ring_settings
+        self.next_state = self._create_next_state()
+
+        # Отображения роторов для каждого смещения (позиция - кольцо)
+        forward = [self._shifted(maps[0]) for maps in rotor_maps]
+        backward = [self._shifted(maps[1]) for maps in rotor_maps]
+        self.forward = forward
+        self.backward = backward
+        self.reflector = reflector
+        self.plugboard = plugboard
+
+        # Вход и выход через коммутатор и правый ротор для каждого смещения
+        self._entry = [
+            [shifted[plugboard[c]] for c in range(26)] for shifted in forward[0]
+        ]
+        self._exit = [
+            [ALPHABET[plugboard[shifted[c]]] for c in range(26)] for shifted in backward[0]
+        ]
+
+        # Таблицы строятся лениво: 26 символов на каждое состояние
+        self.tables = [None] * STATES
+        self._cores = {}
+
+    @staticmethod
+    def _shifted(mapping) -> list:
+        """Отображения ротора для всех 26 смещений"""
+        return [
+            [(mapping[(c + d) % 26] - d) % 26 for c in range(26)]
+            for d in range(26)
+        ]
+
+    def _create_next_state(self) -> list:
+        """Переходы между состояниями, повторяющие EnigmaMachine._rotate_rotors"""
+        notch_right, notch_middle = self.notches[0], self.notches[1]
+        next_state = [0] * STATES
+        for state in range(STATES):
+            right, middle, left = state_positions(state)
+            right = (right + 1) % 26
+            rotate_middle = right == notch_right
+            # Двойной шаг среднего ротора
+            if middle == notch_middle:
+                rotate_middle = True
+                left = (left + 1) % 26
+            if rotate_middle:
+                middle = (middle + 1) % 26
+            next_state[state] = right + 26 * middle + 676 * left
+        return next_state
+
+    def _core(self, middle: int, left: int) -> list:
+        """Проход через средний, левый роторы и рефлектор для пары смещений"""
+        key = middle * 26 + left
+        core = self._cores.get(key)
+        if core is None:
+            f1, f2 = self.forward[1][middle], self.forward[2][left]
+            b1, b2 = self.backward[1][middle], self.backward[2][left]
+            reflector = self.reflector
+            core = [b1[b2[reflector[f2[f1[c]]]]] for c in range(26)]
+            self._cores[key] = core
+        return core
+
+    def build(self, state: int) -> str:
+        """Построение таблицы подстановки для состояния роторов"""
+        rings = self.ring_settings
+        right, middle, left = [
+            (position - ring) % 26
+            for position, ring in zip(state_positions(state), rings)
+        ]
+        core = self._core(middle, left)
+        exit_ = self._exit[right]
+        table = ''.join([exit_[core[c]] for c in self._entry[right]])
+        self.tables[state] = table
+        return table
+
+    def table(self, state: int) -> str:
+        """Таблица подстановки: буква с индексом i переходит в table[i]"""
+        table = self.tables[state]
+        if table is None:
+            table = self.build(state)
+        return table
+
+
+@lru_cache(maxsize=16)
+def get_tables(
+    rotor_maps: tuple,
+    notches: tuple,
+    ring_settings: tuple,
+    reflector: tuple,
+    plugboard: tuple,
+) -> EnigmaTables:
+    """Таблицы конфигурации из кэша (порядок роторов, кольца, рефлектор, коммутатор)"""
+    return EnigmaTables(rotor_maps, notches, ring_settings, reflector, plugboard)
@@ -0,0 +1,107 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .stepping import positions_after
+from .tables import EnigmaTables
+
+# Длина текста, начиная с которой выгоднее векторизованный путь
+BULK_THRESHOLD = 1 << 16
+
+# Число букв, обрабатываемых за один проход (ограничивает память)
+BLOCK_SIZE = 1 << 20
+
+
+class _GatherTables:
+    def __init__(self, tables: EnigmaTables):
+        """
+        Таблицы конфигурации в виде массивов NumPy для выборки по индексам
+        :param tables: Предвычисленные таблицы конфигурации
+        """
+        # Отображения роторов плоские: индекс = смещение * 26 + буква
+        self.forward = [np.array(maps, dtype=np.uint8).ravel() for maps in tables.forward]
+        self.backward = [np.array(maps, dtype=np.uint8).ravel() for maps in tables.backward]
+        self.reflector = np.array(tables.reflector, dtype=np.uint8)
+        self.plugboard = np.array(tables.plugboard, dtype=np.uint8)
+        self.rings = tables.ring_settings
+        self.notches = tables.notches
+
+
+@lru_cache(maxsize=16)
+def _gather_tables(tables: EnigmaTables) -> _GatherTables:
+    return _GatherTables(tables)
+
+
+def stepping_sequence(positions, notches, start: int, count: int) -> list:
+    """
+    Позиции роторов после шагов start + 1 ... start + count, включая двойной шаг
+    :param positions: Позиции роторов перед первым шагом
+    :param notches: Выемки роторов
+    :param start: Число уже сделанных шагов
+    :param count: Число шагов
+    """
+    steps = np.arange(start + 1, start + count + 1, dtype=np.int64)
+    return positions_after(positions, notches, steps)
+
+
+def _process_letters(gather: _GatherTables, letters: np.ndarray, positions: list) -> np.ndarray:
+    """Проход индексов букв (0-25) через коммутатор, роторы и рефлектор"""
+    offsets = [
+        ((position - ring) % 26 * 26).astype(np.uint16)
+        for position, ring in zip(positions, gather.rings)
+    ]
+
+    c = gather.plugboard[letters]
+    # Прямой проход через роторы (справа налево)
+    for forward, offset in zip(gather.forward, offsets):
+        c = forward[offset + c]
+    c = gather.reflector[c]
+    # Обратный проход через роторы (слева направо)
+    for backward, offset in zip(reversed(gather.backward), reversed(offsets)):
+        c = backward[offset + c]
+    return gather.plugboard[c]
+
+
+def encrypt_array(machine, buffer: np.ndarray):
+    """
+    Векторизованное шифрование байтов ASCII на месте
+    Роторы машины продвигаются на число зашифрованных букв.
+    :param machine: Машина Энигма с тремя роторами
+    :param buffer: Изменяемый массив uint8 (например, поверх mmap)
+    """
+    gather = _gather_tables(machine.tables)
+    initial = machine.positions
+    steps = 0
+
+    for start in range(0, len(buffer), BLOCK_SIZE):
+        block = buffer[start:start + BLOCK_SIZE]
+        upper = block & 0xDF
+        mask = (upper >= ord('A')) & (upper <= ord('Z'))
+        letters = upper[mask] - ord('A')
+        if not len(letters):
+            continue
+        positions = stepping_sequence(initial, gather.notches, steps, len(letters))
+        block[mask] = _process_letters(gather, letters, positions) + ord('A')
+        steps += len(letters)
+
+    machine.advance(steps)
+
+
+def count_letters(buffer: np.ndarray) -> int:
+    """Число латинских букв в массиве байтов (шагов роторов)"""
+    count = 0
+    for start in range(0, len(buffer), BLOCK_SIZE):
+        upper = buffer[start:start + BLOCK_SIZE] & 0xDF
+        count += int(np.count_nonzero((upper >= ord('A')) & (upper <= ord('Z'))))
+    return count
+
+
+def encrypt_bulk(machine, text: str) -> str:
+    """
+    Векторизованное шифрование ASCII-текста
+    :param machine: Машина Энигма с тремя роторами
+    :param text: Текст из ASCII-символов
+    """
+    result = np.frombuffer(text.encode("ascii"), dtype=np.uint8).copy()
+    encrypt_array(machine, result)
+    return result.tobytes().decode("ascii")
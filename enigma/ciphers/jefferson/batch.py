@@ -0,0 +1,143 @@
+import numpy as np
+
+from .main import JeffersonCipher
+
+ALPHABET = np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)
+
+# Предел ячеек матрицы сообщений и таблиц дисков за один проход (ограничивает память)
+BATCH_CELLS = 1 << 22
+
+
+def disk_tables(disks: list, disk_order: list, decrypt: bool) -> np.ndarray:
+    """
+    Таблицы перевода байтов для дисков в порядке ключа, форма (num_disks, 256)
+    :param disks: Диски (списки или строки по 26 букв)
+    :param disk_order: Порядок дисков
+    :param decrypt: Таблицы расшифрования вместо шифрования
+    """
+    letters = np.frombuffer(
+        ''.join(''.join(disks[i]) for i in disk_order).encode("ascii"), dtype=np.uint8
+    ).reshape(len(disk_order), 26)
+    tables = np.tile(np.arange(256, dtype=np.uint8), (len(disk_order), 1))
+    rows = np.arange(len(disk_order))[:, None]
+    if decrypt:
+        tables[rows, ALPHABET] = letters
+    else:
+        tables[rows, letters] = ALPHABET
+    return tables
+
+
+def _key_ids(keys: list) -> list:
+    """
+    Номер различного ключа для каждого сообщения
+    Одинаковые ключи (те же диски и порядок) получают один номер, и их
+    таблицы строятся один раз.
+    """
+    disk_sets = {}
+    ids = {}
+    result = []
+    for disks, disk_order in keys:
+        # Наборы дисков обычно общие объекты: содержимое сравнивается один раз на объект
+        content = disk_sets.get(id(disks))
+        if content is None:
+            content = disk_sets[id(disks)] = tuple(''.join(disk) for disk in disks)
+        result.append(ids.setdefault((content, tuple(disk_order)), len(ids)))
+    return result
+
+
+def _groups(lengths: list, widths: list, key_ids: list) -> list:
+    """
+    Индексы сообщений по возрастанию длины, разбитые на группы не больше BATCH_CELLS
+    В предел входят матрица сообщений (сообщения x длина) и таблицы различных
+    ключей группы (ключи x число дисков x 256).
+    :param lengths: Длины сообщений
+    :param widths: Числа дисков ключей сообщений
+    :param key_ids: Номера ключей сообщений (_key_ids)
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    groups, group, group_keys, width = [], [], set(), 0
+    for i in order:
+        keys = len(group_keys) + (key_ids[i] not in group_keys)
+        cells = (len(group) + 1) * lengths[i] + keys * max(width, widths[i]) * 256
+        if group and cells > BATCH_CELLS:
+            groups.append(group)
+            group, group_keys, width = [], set(), 0
+        group.append(i)
+        group_keys.add(key_ids[i])
+        width = max(width, widths[i])
+    if group:
+        groups.append(group)
+    return groups
+
+
+def _translate_group(messages: list, key_index: np.ndarray, tables: list) -> list:
+    """
+    Перевод группы ASCII-сообщений одной выборкой по матрице (сообщение, позиция)
+    :param messages: Сообщения в байтах
+    :param key_index: Номер таблицы в tables для каждого сообщения
+    :param tables: Таблицы различных ключей группы (disk_tables)
+    """
+    lengths = np.array([len(message) for message in messages])
+    num_disks = np.array([len(table) for table in tables])[key_index]
+
+    data = np.zeros((len(messages), lengths.max()), dtype=np.uint8)
+    for row, message in zip(data, messages):
+        row[:len(message)] = np.frombuffer(message, dtype=np.uint8)
+    stacked = np.zeros((len(tables), num_disks.max(), 256), dtype=np.uint8)
+    for i, table in enumerate(tables):
+        stacked[i, :len(table)] = table
+
+    # Позиция i сообщения шифруется диском disk_order[i % num_disks]
+    columns = np.arange(data.shape[1])[None, :] % num_disks[:, None]
+    result = stacked[key_index[:, None], columns, data]
+    return [row[:length].tobytes().decode("ascii") for row, length in zip(result, lengths)]
+
+
+def translate_batch(texts: list, keys: list, decrypt: bool = False) -> list:
+    """
+    Шифрование или расшифрование множества сообщений с разными ключами
+    :param texts: Тексты сообщений
+    :param keys: Пары (диски, порядок дисков) для каждого сообщения
+    :param decrypt: Расшифрование вместо шифрования
+    :return: Результаты в порядке texts
+    """
+    results = [None] * len(texts)
+    ascii_indexes, messages = [], []
+    for i, (text, (disks, disk_order)) in enumerate(zip(texts, keys)):
+        text = text.upper()
+        if text.isascii() and text:
+            ascii_indexes.append(i)
+            messages.append(text.encode("ascii"))
+            continue
+        # Не-ASCII текст идет через обычный шифр
+        cipher = JeffersonCipher(len(disk_order), disks)
+        cipher.set_disk_order(disk_order)
+        results[i] = cipher._translate(text, decrypt)
+
+    ascii_keys = [keys[i] for i in ascii_indexes]
+    key_ids = _key_ids(ascii_keys)
+    widths = [len(disk_order) for _, disk_order in ascii_keys]
+    for group in _groups([len(message) for message in messages], widths, key_ids):
+        # Таблицы строятся один раз на различный ключ группы
+        local = {}
+        tables = []
+        for k in group:
+            if key_ids[k] not in local:
+                local[key_ids[k]] = len(tables)
+                tables.append(disk_tables(*ascii_keys[k], decrypt))
+        translated = _translate_group(
+            [messages[k] for k in group],
+            np.array([local[key_ids[k]] for k in group]),
+            tables,
+        )
+        for k, text in zip(group, translated):
+            results[ascii_indexes[k]] = text
+    return results
+
+
+def encrypt_batch(texts: list, keys: list) -> list:
+    return translate_batch(texts, keys, decrypt=False)
+
+
+def decrypt_batch(texts: list, keys: list) -> list:
+    return translate_batch(texts, keys, decrypt=True)
@@ -1,10 +1,42 @@
+import logging
 import random
 
+from ..ascii import KEEP, source_array, target_array
 from .configs import JeffersonConfig
 
+logger = logging.getLogger(__name__)
+
+
+class DiskView:
+    def __init__(self, cipher):
+        """
+        Представление дисков для журнала, форматируется только при выводе записи
+        :param cipher: Шифр, диски которого выводятся
+        """
+        self.cipher = cipher
+
+    def __str__(self):
+        return self.cipher.display_disks()
+
+
+def generate_key(num_disks: int) -> tuple:
+    """
+    Новый ключ: диски с уникальными перестановками алфавита и их порядок
+    :param num_disks: Число дисков
+    :return: Пара (диски, порядок дисков)
+    """
+    disks = []
+    for _ in range(num_disks):
+        disk = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        random.shuffle(disk)
+        disks.append(disk)
+    disk_order = list(range(num_disks))
+    random.shuffle(disk_order)
+    return disks, disk_order
+
 
 class JeffersonCipher:
-    def __init__(self, num_disks=36, disks: list | None = None):
+    def __init__(self, num_disks=36, disks: list | None = None, disk_order: list | None = None):
         self.num_disks = num_disks
         self.alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
         
@@ -12,15 +44,18 @@ class JeffersonCipher:
         if disks:
             self.disks = disks
         else:
-            self.disks = []
-            for _ in range(num_disks):
-                disk = self.alphabet.copy()
-                random.shuffle(disk)
-                self.disks.append(disk)
+            self.disks, generated_order = generate_key(num_disks)
+            disk_order = disk_order or generated_order
         
+        # Таблицы перевода строятся лениво для используемых дисков
+        self._encrypt_tables = {}
+        self._decrypt_tables = {}
+
         # Сохраняем начальный порядок дисков как часть ключа
-        self.disk_order = list(range(num_disks))
-        random.shuffle(self.disk_order)
+        if disk_order is None:
+            disk_order = list(range(num_disks))
+            random.shuffle(disk_order)
+        self.disk_order = disk_order
     
     def set_disk_order(self, order):
         if len(order) == self.num_disks:
@@ -29,53 +64,116 @@ class JeffersonCipher:
     def get_key(self):
         return self.disk_order.copy()
     
-    def encrypt(self, plaintext: str, key_row):
-        plaintext = plaintext.upper()
-        ciphertext = []
-        print(self.display_disks())
-        for i, char in enumerate(plaintext):
-            # Выбираем диск согласно порядку
-            disk_idx = self.disk_order[i % self.num_disks]
-            disk = self.disks[disk_idx]
-            
-            if char in disk:
-                # Находим позицию символа на диске
-                pos = disk.index(char)
-                # Берем символ из key_row (без сдвига!)
-                cipher_char = self.alphabet[pos]
+    def _table(self, disk_idx: int, decrypt: bool) -> bytes:
+        """
+        Таблица bytes.translate для диска
+        Шифрование: буква диска -> буква алфавита на той же позиции,
+        расшифрование - обратно. Строчные буквы переводятся как заглавные,
+        остальные байты не меняются.
+        """
+        cache = self._decrypt_tables if decrypt else self._encrypt_tables
+        table = cache.get(disk_idx)
+        if table is None:
+            disk = ''.join(self.disks[disk_idx]).encode("ascii")
+            alphabet = ''.join(self.alphabet).encode("ascii")
+            if decrypt:
+                table = bytes.maketrans(alphabet + alphabet.lower(), disk + disk)
             else:
-                cipher_char = char
-            
-            ciphertext.append(cipher_char)
-        
-        return ''.join(ciphertext)
+                table = bytes.maketrans(disk + disk.lower(), alphabet + alphabet)
+            cache[disk_idx] = table
+        return table
+
+    def translate_into(self, data, out: bytearray, decrypt: bool, position: int = 0):
+        """
+        Перевод ASCII-байтов в готовый буфер без промежуточного текста
+        Позиция i шифруется диском disk_order[(position + i) % num_disks].
+        :param data: Байты ASCII (регистр букв не важен)
+        :param out: Буфер не короче data, результат в out[:len(data)]
+        :param decrypt: Расшифрование вместо шифрования
+        :param position: Номер первого символа data в сообщении
+        """
+        n = self.num_disks
+        size = len(data)
+        for j in range(min(n, size)):
+            table = self._table(self.disk_order[(position + j) % n], decrypt)
+            out[j:size:n] = data[j::n].translate(table)
+
+    def encrypt_bytes(self, data, out=None, position: int = 0, non_latin: str = KEEP) -> memoryview:
+        """
+        Шифрование байтов без перевода в str
+        Каждый байт занимает позицию ключа; байты вне ASCII (в том числе
+        кириллица в UTF-8) обрабатываются по политике non_latin, оставленные
+        байты не меняются.
+        :param data: bytes, bytearray или memoryview
+        :param out: Изменяемый буфер для результата; None - новый bytearray
+        :param position: Номер первого байта data в сообщении
+        :param non_latin: Политика для байтов вне ASCII: ascii.KEEP, ascii.DROP или ascii.ERROR
+        :return: memoryview записанной части буфера результата
+        """
+        return self._translate_bytes(data, out, False, position, non_latin)
+
+    def decrypt_bytes(self, data, out=None, position: int = 0, non_latin: str = KEEP) -> memoryview:
+        """Расшифрование байтов, параметры как у encrypt_bytes"""
+        return self._translate_bytes(data, out, True, position, non_latin)
+
+    def _translate_bytes(self, data, out, decrypt: bool, position: int, non_latin: str) -> memoryview:
+        source = source_array(data, non_latin)
+        # Срезам с шагом нужен bytes.translate: memoryview и массив после DROP копируются
+        if isinstance(data, memoryview) or len(source) != len(data):
+            data = source.tobytes()
+        out, _ = target_array(out, len(source))
+        view = memoryview(out)[:len(source)]
+        self.translate_into(data, view, decrypt, position)
+        return view
+
+    def _translate(self, text: str, decrypt: bool, position: int = 0) -> str:
+        """Позиция i шифруется диском disk_order[(position + i) % num_disks]: перевод срезами"""
+        if text.isascii():
+            data = text.encode("ascii")
+            result = bytearray(len(data))
+            self.translate_into(data, result, decrypt, position)
+            return result.decode("ascii")
+
+        # Не-ASCII символы не меняются, но занимают позицию
+        text = text.upper()
+        n = self.num_disks
+        result = list(text)
+        for j in range(min(n, len(text))):
+            table = self._table(self.disk_order[(position + j) % n], decrypt)
+            result[j::n] = text[j::n].translate(table)
+        return ''.join(result)
+
+    def _log(self, operation: str, text: str, key_row):
+        """Отладочная запись об операции (включается уровнем DEBUG логгера)"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        logger.debug(
+            "Jefferson %s: %d chars, %d disks\n%s",
+            operation, len(text), self.num_disks, DiskView(self),
+            extra={
+                "operation": operation,
+                "text_length": len(text),
+                "num_disks": self.num_disks,
+                "key_row": key_row,
+                "disk_order": self.disk_order,
+            },
+        )
+
+    def encrypt(self, plaintext: str, key_row):
+        # Регистр учитывают таблицы перевода: upper() копировал бы весь текст
+        self._log("encrypt", plaintext, key_row)
+        return self._translate(plaintext, decrypt=False)
     
     def decrypt(self, ciphertext, key_row):
-        ciphertext = ciphertext.upper()
-        plaintext = []
-        print(self.display_disks())
-        for i, char in enumerate(ciphertext):
-            # Выбираем диск согласно порядку
-            disk_idx = self.disk_order[i % self.num_disks]
-            disk = self.disks[disk_idx]
-            
-            if char in self.alphabet:
-                # Находим позицию символа в стандартном алфавите
-                pos = self.alphabet.index(char)
-                # Берем символ с этой позиции на диске
-                plain_char = disk[pos]
-            else:
-                plain_char = char
-            
-            plaintext.append(plain_char)
-        
-        return ''.join(plaintext)
+        self._log("decrypt", ciphertext, key_row)
+        return self._translate(ciphertext, decrypt=True)
 
-    def display_disks(self):
-        print(f"\nJefferson Cipher Disks (Order: {self.disk_order})")
-        print("="*50)
+    def display_disks(self) -> str:
+        """Диски в порядке ключа в виде текста"""
+        lines = [f"Jefferson Cipher Disks (Order: {self.disk_order})", "=" * 50]
         for i in self.disk_order:
-            print(f"Disk {i:2d}: {' '.join(self.disks[i])}")
+            lines.append(f"Disk {i:2d}: {' '.join(self.disks[i])}")
+        return '\n'.join(lines)
 
-def setup_jefferson(input: JeffersonConfig, disks: list | None = None):
-    return JeffersonCipher(input.num_disks, disks)
+def setup_jefferson(input: JeffersonConfig, disks: list | None = None, disk_order: list | None = None):
+    return JeffersonCipher(input.num_disks, disks, disk_order)
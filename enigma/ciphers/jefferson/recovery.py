@@ -0,0 +1,133 @@
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def pair_index(disks: list) -> dict:
+    """
+    Диски, переводящие букву открытого текста в букву шифротекста
+    :param disks: Диски набора (перестановки алфавита)
+    :return: {(буква, буква шифротекста): битовая маска номеров дисков}
+    """
+    index = {}
+    for disk_idx, disk in enumerate(disks):
+        bit = 1 << disk_idx
+        for letter, cipher_letter in zip(disk, ALPHABET):
+            index[(letter, cipher_letter)] = index.get((letter, cipher_letter), 0) | bit
+    return index
+
+
+def disk_candidates(disks: list, plaintext: str, ciphertext: str, num_disks: int | None = None,
+                    position: int = 0) -> list | None:
+    """
+    Возможные диски каждой позиции ключа по паре открытый текст - шифротекст
+    Символ i шифруется диском disk_order[(position + i) % num_disks], поэтому все
+    пары букв одной позиции ключа должны переводиться одним диском.
+    :param disks: Диски набора
+    :param plaintext: Открытый текст (регистр не важен)
+    :param ciphertext: Шифротекст той же длины
+    :param num_disks: Длина ключа (по умолчанию - число дисков)
+    :param position: Номер первого символа текста в сообщении
+    :return: Битовые маски дисков для позиций ключа; None, если пара не согласуется ни с каким ключом
+    """
+    n = num_disks or len(disks)
+    plaintext = plaintext.upper()
+    if len(plaintext) != len(ciphertext):
+        raise ValueError("Plaintext and ciphertext lengths differ")
+
+    index = pair_index(disks)
+    full = (1 << len(disks)) - 1
+    masks = [full] * n
+    for j in range(min(n, len(plaintext))):
+        slot = (position + j) % n
+        # Разные пары букв позиции: длинный текст сводится к нескольким десяткам проверок
+        for letter, cipher_letter in set(zip(plaintext[j::n], ciphertext[j::n])):
+            if letter in ALPHABET:
+                masks[slot] &= index.get((letter, cipher_letter), 0)
+            elif letter != cipher_letter:
+                return None
+    return masks
+
+
+def _propagate(masks: list) -> list | None:
+    """Исключение дисков, однозначно занятых другими позициями; None при противоречии"""
+    assigned = 0
+    while True:
+        singles = 0
+        for mask in masks:
+            if mask & (mask - 1) == 0:
+                if mask == 0 or singles & mask:
+                    return None
+                singles |= mask
+        if singles == assigned:
+            return masks
+        assigned = singles
+        masks = [mask if mask & (mask - 1) == 0 else mask & ~singles for mask in masks]
+
+
+def solve_assignment(masks: list, limit: int = 2) -> list:
+    """
+    Порядки дисков, согласующиеся с масками позиций
+    Перебор с распространением ограничений: на каждом шаге выбирается
+    позиция с наименьшим числом возможных дисков.
+    :param masks: Битовые маски возможных дисков для каждой позиции ключа
+    :param limit: Наибольшее число возвращаемых решений
+    """
+    solutions = []
+
+    def search(masks):
+        masks = _propagate(masks)
+        if masks is None:
+            return
+        open_slots = [slot for slot, mask in enumerate(masks) if mask & (mask - 1)]
+        if not open_slots:
+            solutions.append([mask.bit_length() - 1 for mask in masks])
+            return
+        slot = min(open_slots, key=lambda slot: masks[slot].bit_count())
+        mask = masks[slot]
+        while mask and len(solutions) < limit:
+            bit = mask & -mask
+            mask ^= bit
+            trial = masks.copy()
+            trial[slot] = bit
+            search(trial)
+
+    search(list(masks))
+    return solutions
+
+
+class DiskOrderRecovery:
+    def __init__(self, masks: list | None, solutions: list):
+        """
+        Результат восстановления порядка дисков
+        Порядок задается только однозначным решением: при нескольких решениях
+        order равен None, а найденные варианты остаются в solutions.
+        :param masks: Возможные диски позиций ключа (битовые маски); None - пара противоречива
+        :param solutions: Найденные порядки дисков (не больше двух)
+        """
+        self.candidates = None if masks is None else [
+            [disk for disk in range(mask.bit_length()) if mask >> disk & 1] for mask in masks
+        ]
+        self.solutions = solutions
+        # Короткий текст или позиции без букв оставляют ключ неоднозначным
+        self.unique = len(solutions) == 1
+        self.order = solutions[0] if self.unique else None
+
+    @property
+    def ambiguous(self) -> bool:
+        """Тексту соответствует больше одного порядка дисков"""
+        return len(self.solutions) > 1
+
+
+def recover_disk_order(disks: list, plaintext: str, ciphertext: str, num_disks: int | None = None,
+                       position: int = 0) -> DiskOrderRecovery:
+    """
+    Восстановление порядка дисков (ключа get_key) по известному открытому тексту
+    :param disks: Диски набора
+    :param plaintext: Открытый текст
+    :param ciphertext: Шифротекст
+    :param num_disks: Длина ключа (по умолчанию - число дисков)
+    :param position: Номер первого символа текста в сообщении
+    """
+    masks = disk_candidates(disks, plaintext, ciphertext, num_disks, position)
+    if masks is None:
+        return DiskOrderRecovery(None, [])
+    return DiskOrderRecovery(masks, solve_assignment(masks))
@@ -0,0 +1,43 @@
+import hashlib
+from array import array
+
+# Длина диска: перестановка латинского алфавита
+DISK_SIZE = 26
+
+
+def encode_disks(disks: list) -> bytes:
+    """Диски подряд, по 26 байт ASCII на диск"""
+    return b''.join(''.join(disk).encode("ascii") for disk in disks)
+
+
+def decode_disks(blob: bytes) -> list:
+    """Диски в виде строк по 26 букв (поддерживают in, index и индексацию как списки)"""
+    return [
+        blob[i:i + DISK_SIZE].decode("ascii")
+        for i in range(0, len(blob), DISK_SIZE)
+    ]
+
+
+def disk_set_digest(blob: bytes) -> str:
+    """Ключ набора дисков: SHA-256 закодированных дисков"""
+    return hashlib.sha256(blob).hexdigest()
+
+
+def encode_order(order: list) -> bytes:
+    """Порядок дисков: байт на индекс, два байта (little-endian) при num_disks > 256"""
+    if len(order) <= 256:
+        return bytes(order)
+    indexes = array("H", order)
+    if array("H", [1]).tobytes() != b"\x01\x00":
+        indexes.byteswap()
+    return indexes.tobytes()
+
+
+def decode_order(blob: bytes, num_disks: int) -> list:
+    if num_disks <= 256:
+        return list(blob)
+    indexes = array("H")
+    indexes.frombytes(blob)
+    if array("H", [1]).tobytes() != b"\x01\x00":
+        indexes.byteswap()
+    return indexes.tolist()
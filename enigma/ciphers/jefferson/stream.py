@@ -0,0 +1,37 @@
+import codecs
+
+from .main import JeffersonCipher
+
+
+class JeffersonStream:
+    def __init__(self, cipher: JeffersonCipher, decrypt: bool = False, offset: int = 0):
+        """
+        Потоковое шифрование текста UTF-8 частями произвольной длины
+        Номер диска продолжается между частями, ASCII-части переводятся
+        в переиспользуемый буфер без декодирования.
+        :param cipher: Шифр с дисками и их порядком
+        :param decrypt: Расшифрование вместо шифрования
+        :param offset: Номер первого символа потока в сообщении
+        """
+        self.cipher = cipher
+        self.decrypt = decrypt
+        self.position = offset
+        self._buffer = bytearray()
+        # Символ UTF-8 может оказаться разрезан между частями
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def process(self, chunk: bytes, final: bool = False) -> bytes:
+        """Перевод очередной части потока"""
+        pending = self._decoder.getstate()[0]
+        if not pending and chunk.isascii():
+            size = len(chunk)
+            if len(self._buffer) < size:
+                self._buffer = bytearray(size)
+            self.cipher.translate_into(chunk, self._buffer, self.decrypt, self.position)
+            self.position += size
+            return bytes(memoryview(self._buffer)[:size])
+
+        text = self._decoder.decode(chunk, final=final).upper()
+        result = self.cipher._translate(text, self.decrypt, self.position)
+        self.position += len(text)
+        return result.encode("utf-8")
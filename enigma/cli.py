@@ -0,0 +1,335 @@
+"""
+Шифрование файлов без запуска сервиса
+Примеры:
+    python -m enigma.cli enigma in.txt out.txt --config-name my-config
+    python -m enigma.cli enigma in.txt out.txt --config '{"rotors": ["III", "II", "I"], ...}' --parallel
+    python -m enigma.cli jefferson encrypt in.txt out.txt --config '{"num_disks": 36, "key_row": 5}'
+    python -m enigma.cli jefferson decrypt out.txt in.txt --encrypt-id 42
+    python -m enigma.cli search out.txt --crib WETTERBERICHT --time-budget 600
+"""
+import argparse
+import codecs
+import json
+import mmap
+import os
+import sys
+
+import numpy as np
+
+from enigma.ciphers.enigma import setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.ciphers.enigma.main import PARALLEL_MIN_SEGMENT, _get_executor
+from enigma.ciphers.enigma.vectorized import count_letters
+from enigma.ciphers.jefferson.configs import JeffersonConfig
+from enigma.ciphers.jefferson.main import JeffersonCipher
+from enigma.ciphers.jefferson.storage import decode_order, encode_disks, encode_order
+from enigma.ciphers.jefferson.stream import JeffersonStream
+
+# Размер части файла, обрабатываемой за один проход
+FILE_BLOCK = 1 << 24
+
+
+class MappedFiles:
+    def __init__(self, source: str, target: str):
+        """
+        Входной и выходной файлы одного размера, отображенные в память
+        :param source: Путь к входному файлу
+        :param target: Путь к выходному файлу (создается или перезаписывается)
+        """
+        self.source = source
+        self.target = target
+
+    def __enter__(self):
+        self._files = [open(self.source, "rb"), open(self.target, "r+b")]
+        self.input = mmap.mmap(self._files[0].fileno(), 0, access=mmap.ACCESS_READ)
+        self.output = mmap.mmap(self._files[1].fileno(), 0, access=mmap.ACCESS_WRITE)
+        return self
+
+    def __exit__(self, *exc):
+        self.output.flush()
+        self.input.close()
+        self.output.close()
+        for file in self._files:
+            file.close()
+
+
+def is_ascii_file(path: str) -> bool:
+    """Файл целиком из ASCII: такие файлы шифруются через mmap на месте"""
+    if not os.path.getsize(path):
+        return True
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        array = np.frombuffer(data, dtype=np.uint8)
+        try:
+            return all(
+                array[start:start + FILE_BLOCK].max() < 0x80
+                for start in range(0, len(array), FILE_BLOCK)
+            )
+        finally:
+            del array
+
+
+def prepare_output(source: str, target: str) -> int:
+    """Выходной файл размера входного, возвращает размер"""
+    size = os.path.getsize(source)
+    with open(target, "wb") as file:
+        file.truncate(size)
+    return size
+
+
+def split(size: int, workers: int) -> list:
+    """Границы сегментов файла для параллельной обработки"""
+    segment = max(PARALLEL_MIN_SEGMENT, -(-size // workers))
+    return [(start, min(start + segment, size)) for start in range(0, size, segment)]
+
+
+def _enigma_range(config: dict, offset: int, source: str, target: str, start: int, end: int):
+    """Шифрование байтов [start, end) файла, начинающихся с буквы номер offset"""
+    enigma = setup_enigma(EnigmaConfig(**config))
+    enigma.advance(offset)
+    with MappedFiles(source, target) as files:
+        output = memoryview(files.output)[start:end]
+        output[:] = files.input[start:end]
+        # encrypt_bytes сам выбирает таблицы или эталонный путь (_has_fast_path)
+        enigma.encrypt_bytes(output, output)
+        output.release()
+
+
+def _enigma_offsets(source: str, bounds: list, offset: int) -> list:
+    """Номер первой буквы каждого сегмента"""
+    offsets = []
+    with open(source, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        array = np.frombuffer(data, dtype=np.uint8)
+        for start, end in bounds:
+            offsets.append(offset)
+            offset += count_letters(array[start:end])
+        del array
+    return offsets
+
+
+def encrypt_enigma_file(config: EnigmaConfig, source: str, target: str,
+                        offset: int = 0, workers: int | None = None):
+    """
+    Шифрование файла Энигмой (расшифрование - то же шифрование)
+    :param config: Конфигурация Энигмы
+    :param source: Входной файл
+    :param target: Выходной файл
+    :param offset: Число уже зашифрованных букв сообщения
+    :param workers: Число процессов; None - в текущем процессе
+    """
+    if not is_ascii_file(source):
+        enigma = setup_enigma(config)
+        enigma.advance(offset)
+        _stream_file(source, target, enigma.encrypt)
+        return
+
+    size = prepare_output(source, target)
+    if not size:
+        return
+    data = config.model_dump()
+    bounds = split(size, workers or 1)
+    if len(bounds) < 2:
+        _enigma_range(data, offset, source, target, 0, size)
+        return
+
+    offsets = _enigma_offsets(source, bounds, offset)
+    starts, ends = zip(*bounds)
+    list(_get_executor().map(
+        _enigma_range,
+        [data] * len(bounds), offsets, [source] * len(bounds), [target] * len(bounds), starts, ends,
+    ))
+
+
+def _jefferson_range(disks: list, disk_order: list, decrypt: bool,
+                     source: str, target: str, start: int, end: int, offset: int):
+    """Перевод байтов [start, end) файла; символ start имеет номер offset + start"""
+    cipher = JeffersonCipher(len(disk_order), disks, disk_order)
+    with MappedFiles(source, target) as files:
+        output = memoryview(files.output)
+        try:
+            for block in range(start, end, FILE_BLOCK):
+                block_end = min(block + FILE_BLOCK, end)
+                cipher.translate_into(
+                    files.input[block:block_end], output[block:block_end], decrypt, offset + block
+                )
+        finally:
+            output.release()
+
+
+def translate_jefferson_file(cipher: JeffersonCipher, source: str, target: str, decrypt: bool,
+                             offset: int = 0, workers: int | None = None):
+    """
+    Шифрование или расшифрование файла шифром Джефферсона
+    :param cipher: Шифр с ключом
+    :param source: Входной файл
+    :param target: Выходной файл
+    :param decrypt: Расшифрование вместо шифрования
+    :param offset: Номер первого символа файла в сообщении
+    :param workers: Число процессов; None - в текущем процессе
+    """
+    if not is_ascii_file(source):
+        stream = JeffersonStream(cipher, decrypt=decrypt, offset=offset)
+        _stream_file(source, target, stream.process, decode=False)
+        return
+
+    size = prepare_output(source, target)
+    if not size:
+        return
+    bounds = split(size, workers or 1)
+    args = (cipher.disks, cipher.disk_order, decrypt, source, target)
+    if len(bounds) < 2:
+        _jefferson_range(*args, 0, size, offset)
+        return
+
+    starts, ends = zip(*bounds)
+    count = len(bounds)
+    list(_get_executor().map(
+        _jefferson_range, *[[arg] * count for arg in args], starts, ends, [offset] * count,
+    ))
+
+
+def _stream_file(source: str, target: str, transform, decode: bool = True):
+    """Обработка файла с не-ASCII символами по частям (длина результата может отличаться)"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(source, "rb") as input, open(target, "wb") as output:
+        while True:
+            chunk = input.read(FILE_BLOCK)
+            final = not chunk
+            if decode:
+                output.write(transform(decoder.decode(chunk, final=final)).encode("utf-8"))
+            else:
+                output.write(transform(chunk, final))
+            if final:
+                break
+
+
+def load_enigma_config(args) -> EnigmaConfig:
+    if args.config is not None:
+        return EnigmaConfig.model_validate_json(args.config)
+
+    from enigma.db import DBEnigmaConfig, SessionLocal, init_db
+
+    init_db()
+    with SessionLocal() as db:
+        db_config = db.query(DBEnigmaConfig).filter(DBEnigmaConfig.name == args.config_name).first()
+        if not db_config:
+            raise SystemExit(f"Config not found: {args.config_name}")
+        return EnigmaConfig.model_validate(db_config, from_attributes=True)
+
+
+def load_jefferson_cipher(args) -> JeffersonCipher:
+    """Шифр по encrypt_id из БД или новый ключ по конфигурации (сохраняется в БД)"""
+    from enigma.db import DBJeffersonConfig, SessionLocal, init_db
+    from enigma.disksets import disk_set_store
+    from enigma.writer import jefferson_writer
+
+    init_db()
+    if args.encrypt_id is not None:
+        with SessionLocal() as db:
+            config = db.get(DBJeffersonConfig, args.encrypt_id)
+            if not config:
+                raise SystemExit(f"Config not found: {args.encrypt_id}")
+            cipher = JeffersonCipher(config.num_disks, disk_set_store.load(config.disk_set_id))
+            cipher.set_disk_order(decode_order(config.secret_key, config.num_disks))
+            return cipher
+
+    if args.command == "decrypt":
+        raise SystemExit("Decryption requires --encrypt-id")
+    config = JeffersonConfig.model_validate_json(args.config)
+    cipher = JeffersonCipher(config.num_disks)
+    encrypt_id = jefferson_writer.submit(
+        disk_set_id=disk_set_store.store(encode_disks(cipher.disks)),
+        secret_key=encode_order(cipher.get_key()),
+        num_disks=config.num_disks,
+        key_row=config.key_row,
+    )
+    jefferson_writer.flush()
+    print(f"encrypt_id: {encrypt_id}")
+    return cipher
+
+
+def print_progress(report):
+    """Ход поиска ключа в stderr"""
+    best = report.best
+    score = f"{best.score:.4f}" if best is not None else "-"
+    print(
+        f"[{report.done}/{report.total}] {report.evaluated} вариантов, "
+        f"{report.elapsed:.1f} с, лучший индекс совпадений {score}",
+        file=sys.stderr,
+    )
+
+
+def search_key(args):
+    """Поиск ключа Энигмы по шифротексту; отчет в JSON"""
+    from enigma.ciphers.enigma.analysis import search_ciphertext, search_crib
+
+    with open(args.input, encoding="utf-8") as file:
+        text = file.read()
+    options = {"workers": args.workers, "time_budget": args.time_budget, "progress": print_progress}
+    if args.crib is not None:
+        report = search_crib(text, args.crib, args.crib_position, **options)
+    else:
+        report = search_ciphertext(text, **options)
+    print(json.dumps(report.to_dict(args.top), ensure_ascii=False, indent=2))
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m enigma.cli", description="Шифрование файлов")
+    ciphers = parser.add_subparsers(dest="cipher", required=True)
+
+    def add_common(subparser):
+        subparser.add_argument("input", help="Входной файл")
+        subparser.add_argument("output", help="Выходной файл")
+        subparser.add_argument("--offset", type=int, default=0, help="Номер первого символа (буквы для Энигмы)")
+        subparser.add_argument("--parallel", action="store_true", help="Обработка в нескольких процессах")
+        subparser.add_argument("--workers", type=int, default=None, help="Число процессов (по умолчанию - число ядер)")
+
+    enigma = ciphers.add_parser("enigma", help="Шифрование и расшифрование Энигмой")
+    add_common(enigma)
+    source = enigma.add_mutually_exclusive_group(required=True)
+    source.add_argument("--config", help="Конфигурация в JSON")
+    source.add_argument("--config-name", help="Имя конфигурации в ciphers.db")
+
+    jefferson = ciphers.add_parser("jefferson", help="Шифр Джефферсона")
+    jefferson.add_argument("command", choices=["encrypt", "decrypt"])
+    add_common(jefferson)
+    source = jefferson.add_mutually_exclusive_group(required=True)
+    source.add_argument("--config", help="Конфигурация нового ключа в JSON (num_disks, key_row)")
+    source.add_argument("--encrypt-id", type=int, help="id ключа в ciphers.db")
+
+    search = ciphers.add_parser("search", help="Поиск ключа Энигмы по шифротексту")
+    search.add_argument("input", help="Файл с шифротекстом")
+    search.add_argument("--crib", help="Известный фрагмент открытого текста")
+    search.add_argument("--crib-position", type=int, default=None,
+                        help="Номер буквы начала фрагмента (по умолчанию - все возможные)")
+    search.add_argument("--time-budget", type=float, default=None, help="Ограничение времени, секунды")
+    search.add_argument("--workers", type=int, default=None, help="Число процессов (1 - без пула)")
+    search.add_argument("--top", type=int, default=5, help="Число кандидатов в отчете")
+
+    ciphers.add_parser("migrate", help="Создание таблиц и миграции ciphers.db")
+    return parser
+
+
+def main(argv: list | None = None):
+    args = create_parser().parse_args(argv)
+    if args.cipher == "migrate":
+        from enigma.db import init_db
+
+        init_db()
+        return
+    if args.cipher == "search":
+        search_key(args)
+        return
+
+    workers = (args.workers or os.cpu_count()) if args.parallel else None
+
+    if args.cipher == "enigma":
+        encrypt_enigma_file(load_enigma_config(args), args.input, args.output, args.offset, workers)
+    else:
+        cipher = load_jefferson_cipher(args)
+        translate_jefferson_file(
+            cipher, args.input, args.output, args.command == "decrypt", args.offset, workers
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
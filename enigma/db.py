@@ -1,14 +1,57 @@
-from sqlalchemy import create_engine, Column, Integer, String, JSON
+import json
+
+from sqlalchemy import create_engine, event, insert, text, update, Column, Float, ForeignKey, Index, Integer, LargeBinary, String, JSON
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from enigma.ciphers.jefferson.storage import disk_set_digest, encode_disks, encode_order
+from enigma.metrics import instrument_engine
+
 SQLALCHEMY_DATABASE_URL = "sqlite:///./ciphers.db"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./ciphers.db"
+
+# Размер пула соединений с SQLite (каждое соединение держит свой кэш страниц)
+POOL_SIZE = 8
+POOL_MAX_OVERFLOW = 16
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=POOL_SIZE,
+    max_overflow=POOL_MAX_OVERFLOW,
+)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=POOL_MAX_OVERFLOW,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Настройка нового соединения с SQLite
+    WAL позволяет читать во время записи, synchronous=NORMAL в режиме WAL
+    не теряет целостность и убирает fsync на каждый commit.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA cache_size=-16000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+event.listen(engine, "connect", set_sqlite_pragmas)
+event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+
 class DBEnigmaConfig(Base):
     __tablename__ = "enigma_configs"
     
@@ -19,24 +62,163 @@ class DBEnigmaConfig(Base):
     ring_settings = Column(JSON)
     initial_positions = Column(String)
     plugboard_pairs = Column(JSON)
+    # Роторы строкой ("III,II,I"): по JSON-столбцу индекс не построить
+    rotor_order = Column(String)
+
+    # Фильтры списка конфигураций с постраничным выводом по id
+    __table_args__ = (
+        Index("ix_enigma_configs_rotor_order_reflector_id", "rotor_order", "reflector", "id"),
+        Index("ix_enigma_configs_reflector_id", "reflector", "id"),
+    )
+
+
+def rotor_order(rotors: list) -> str:
+    """Значение столбца rotor_order для списка роторов"""
+    return ",".join(rotors)
+
+
+class DBEnigmaResult(Base):
+    __tablename__ = "enigma_results"
+
+    # Хэш конфигурации, смещения и текста (см. enigma.results.result_key)
+    digest = Column(LargeBinary, primary_key=True)
+    result = Column(String)
+    # Размер результата в байтах для ограничения объема таблицы
+    size = Column(Integer)
+    # Время записи (time.time()) для вытеснения по сроку жизни и возрасту
+    created_at = Column(Float, index=True)
+
+
+class DBJeffersonDiskSet(Base):
+    __tablename__ = "jefferson_disk_sets"
+
+    id = Column(Integer, primary_key=True)
+    # SHA-256 содержимого: одинаковые наборы дисков хранятся один раз
+    digest = Column(String, unique=True, index=True)
+    # Диски по 26 байт подряд (см. ciphers.jefferson.storage)
+    disks = Column(LargeBinary)
+    num_disks = Column(Integer)
 
 
 class DBJeffersonConfig(Base):
     __tablename__ = "jefferson_configs"
     
     id = Column(Integer, primary_key=True, index=True)
-    disks = Column(JSON)
-    secret_key = Column(JSON)
+    disk_set_id = Column(Integer, ForeignKey("jefferson_disk_sets.id"), index=True)
+    # Собственные диски строк, записанных до появления наборов (после миграции NULL)
+    disks = Column(LargeBinary)
+    # Порядок дисков байтами
+    secret_key = Column(LargeBinary)
     num_disks = Column(Integer)
     key_row = Column(Integer)
 
 
-Base.metadata.create_all(bind=engine)
+class DBIdReservation(Base):
+    __tablename__ = "id_reservations"
 
-# Dependency для получения сессии БД
-def get_db():
+    # Таблица, для которой выдаются идентификаторы
+    name = Column(String, primary_key=True)
+    # Первый еще не выданный идентификатор
+    next_id = Column(Integer)
+
+
+def migrate_jefferson_storage(bind):
+    """Перевод строк с дисками и ключом в JSON в компактный двоичный формат"""
+    with bind.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT id, disks, secret_key FROM jefferson_configs "
+            "WHERE typeof(disks) = 'text'"
+        )).all()
+        for row_id, disks, secret_key in rows:
+            conn.execute(
+                update(DBJeffersonConfig)
+                .where(DBJeffersonConfig.id == row_id)
+                .values(
+                    disks=encode_disks(json.loads(disks)),
+                    secret_key=encode_order(json.loads(secret_key)),
+                )
+            )
+
+
+def migrate_jefferson_disk_sets(bind):
+    """Вынос дисков из строк jefferson_configs в общие наборы jefferson_disk_sets"""
+    with bind.begin() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(jefferson_configs)"))}
+        if "disk_set_id" not in columns:
+            conn.execute(text(
+                "ALTER TABLE jefferson_configs ADD COLUMN disk_set_id INTEGER "
+                "REFERENCES jefferson_disk_sets (id)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_jefferson_configs_disk_set_id "
+                "ON jefferson_configs (disk_set_id)"
+            ))
+
+        rows = conn.execute(text(
+            "SELECT id, disks, num_disks FROM jefferson_configs "
+            "WHERE disk_set_id IS NULL AND disks IS NOT NULL"
+        )).all()
+        disk_sets = dict(conn.execute(text("SELECT digest, id FROM jefferson_disk_sets")).all())
+        for row_id, disks, num_disks in rows:
+            digest = disk_set_digest(disks)
+            if digest not in disk_sets:
+                disk_sets[digest] = conn.execute(
+                    insert(DBJeffersonDiskSet).values(digest=digest, disks=disks, num_disks=num_disks)
+                ).inserted_primary_key[0]
+            conn.execute(
+                update(DBJeffersonConfig)
+                .where(DBJeffersonConfig.id == row_id)
+                .values(disk_set_id=disk_sets[digest], disks=None)
+            )
+
+
+def migrate_enigma_config_indexes(bind):
+    """Столбец rotor_order и составные индексы для таблиц, созданных до их появления"""
+    with bind.begin() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(enigma_configs)"))}
+        if "rotor_order" not in columns:
+            conn.execute(text("ALTER TABLE enigma_configs ADD COLUMN rotor_order VARCHAR"))
+
+        rows = conn.execute(text(
+            "SELECT id, rotors FROM enigma_configs WHERE rotor_order IS NULL AND rotors IS NOT NULL"
+        )).all()
+        if rows:
+            conn.execute(
+                text("UPDATE enigma_configs SET rotor_order = :rotor_order WHERE id = :id"),
+                [{"id": row_id, "rotor_order": rotor_order(json.loads(rotors))} for row_id, rotors in rows],
+            )
+        for index in DBEnigmaConfig.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def init_db(bind=engine):
+    """
+    Создание таблиц и миграции ciphers.db
+    Выполняется при запуске приложения (enigma.main) или командой
+    python -m enigma.cli migrate, но не при импорте модуля: импорт из тестов
+    и бенчмарков не должен менять файл БД.
+    """
+    Base.metadata.create_all(bind=bind)
+    migrate_enigma_config_indexes(bind)
+    migrate_jefferson_storage(bind)
+    migrate_jefferson_disk_sets(bind)
+
+
+# Dependency для получения асинхронной сессии БД
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dependency для синхронных обработчиков, работающих в пуле потоков
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# Dependency для обработчиков, которым БД нужна не всегда: сессия открывается по необходимости
+def get_session_factory():
+    return SessionLocal
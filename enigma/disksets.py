@@ -0,0 +1,79 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from enigma.cache import LRUCache
+from enigma.ciphers.jefferson.storage import DISK_SIZE, decode_disks, disk_set_digest
+from enigma.db import DBJeffersonDiskSet, SessionLocal
+
+
+class DiskSetStore:
+    def __init__(self, session_factory, maxsize: int = 1024):
+        """
+        Наборы дисков шифра Джефферсона в БД с кэшем в памяти
+        Набор записывается один раз по хэшу содержимого, строки шифрований
+        ссылаются на него по id.
+        :param session_factory: Фабрика синхронных сессий
+        :param maxsize: Число наборов в кэше
+        """
+        self.session_factory = session_factory
+        # Хэш -> id и id -> диски (строки по 26 букв)
+        self._ids = LRUCache(maxsize)
+        self._disks = LRUCache(maxsize)
+
+    def find(self, blob: bytes) -> int | None:
+        """id набора из кэша или None"""
+        return self._ids.get(disk_set_digest(blob))
+
+    def store(self, blob: bytes) -> int:
+        """id набора, набор записывается в БД, если его там еще нет"""
+        digest = disk_set_digest(blob)
+        disk_set_id = self._ids.get(digest)
+        if disk_set_id is not None:
+            return disk_set_id
+
+        with self.session_factory() as db:
+            db.execute(
+                insert(DBJeffersonDiskSet)
+                .values(digest=digest, disks=blob, num_disks=len(blob) // DISK_SIZE)
+                .on_conflict_do_nothing(index_elements=["digest"])
+            )
+            disk_set_id = db.scalar(
+                select(DBJeffersonDiskSet.id).where(DBJeffersonDiskSet.digest == digest)
+            )
+            db.commit()
+        self._ids.put(digest, disk_set_id)
+        self._disks.put(disk_set_id, decode_disks(blob))
+        return disk_set_id
+
+    def get(self, disk_set_id: int) -> list | None:
+        """Диски набора из кэша или None"""
+        return self._disks.get(disk_set_id)
+
+    def load(self, disk_set_id: int) -> list | None:
+        """Диски набора из кэша или БД, None для несуществующего набора"""
+        disks = self._disks.get(disk_set_id)
+        if disks is not None:
+            return disks
+        with self.session_factory() as db:
+            disk_set = db.get(DBJeffersonDiskSet, disk_set_id)
+            if disk_set is None:
+                return None
+            self._ids.put(disk_set.digest, disk_set_id)
+            disks = decode_disks(disk_set.disks)
+        self._disks.put(disk_set_id, disks)
+        return disks
+
+    def clear(self):
+        self._ids.clear()
+        self._disks.clear()
+
+    def stats(self) -> dict:
+        return {"ids": self._ids.stats(), "disks": self._disks.stats()}
+
+
+disk_set_store = DiskSetStore(SessionLocal)
+
+
+# Dependency для получения хранилища наборов дисков
+def get_disk_sets() -> DiskSetStore:
+    return disk_set_store
@@ -0,0 +1,137 @@
+import atexit
+import random
+import threading
+from collections import deque
+
+from enigma.ciphers.jefferson.main import generate_key
+
+# Число дисков, для которых ключи готовятся заранее
+POOL_SIZES = (36,)
+POOL_CAPACITY = 64
+POOL_LOW_WATER = 16
+
+# Число ключей с одним набором дисков: как у исторического шифратора,
+# корреспонденты делят набор дисков, а ключом служит их порядок
+DISK_SET_USES = 256
+
+
+class JeffersonKeyPool:
+    def __init__(
+        self,
+        sizes=POOL_SIZES,
+        capacity: int = POOL_CAPACITY,
+        low_water: int = POOL_LOW_WATER,
+        disk_set_uses: int = DISK_SET_USES,
+    ):
+        """
+        Запас заранее сгенерированных ключей шифра Джефферсона
+        Фоновый поток пополняет запас до capacity, как только он опускается
+        до low_water. Для других чисел дисков ключ генерируется в запросе.
+        :param sizes: Числа дисков, для которых ведется запас
+        :param capacity: Размер запаса для каждого числа дисков
+        :param low_water: Порог, при котором начинается пополнение
+        :param disk_set_uses: Число ключей (порядков дисков) на один набор дисков
+        """
+        self.capacity = capacity
+        self.low_water = low_water
+        self.disk_set_uses = disk_set_uses
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+
+        self._condition = threading.Condition()
+        self._pools = {num_disks: deque() for num_disks in sizes}
+        # Текущий набор дисков и число выданных с ним ключей
+        self._disk_sets = {}
+        self._thread = None
+        self._stopping = False
+
+    def start(self):
+        """Запуск фонового пополнения"""
+        with self._condition:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def take(self, num_disks: int) -> tuple | None:
+        """Пара (диски, порядок дисков) из запаса или None, если запас пуст"""
+        self.start()
+        with self._condition:
+            pool = self._pools.get(num_disks)
+            if not pool:
+                self.misses += 1
+                if pool is not None:
+                    self._condition.notify()
+                return None
+            self.hits += 1
+            key = pool.popleft()
+            if len(pool) <= self.low_water:
+                self._condition.notify()
+            return key
+
+    def close(self):
+        """Остановка фонового потока"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "sizes": {num_disks: len(pool) for num_disks, pool in self._pools.items()},
+                "capacity": self.capacity,
+                "low_water": self.low_water,
+                "hits": self.hits,
+                "misses": self.misses,
+                "generated": self.generated,
+            }
+
+    def _needs_refill(self) -> int | None:
+        """Число дисков самого истощенного запаса ниже порога (под блокировкой)"""
+        num_disks = min(self._pools, key=lambda size: len(self._pools[size]), default=None)
+        if num_disks is None or len(self._pools[num_disks]) > self.low_water:
+            return None
+        return num_disks
+
+    def _generate(self, num_disks: int) -> tuple:
+        """Новый порядок дисков; набор дисков меняется раз в disk_set_uses ключей"""
+        current = self._disk_sets.get(num_disks)
+        if current is None or current[1] >= self.disk_set_uses:
+            disks, disk_order = generate_key(num_disks)
+            self._disk_sets[num_disks] = [disks, 1]
+            return disks, disk_order
+        current[1] += 1
+        return current[0], random.sample(range(num_disks), num_disks)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._stopping or self._needs_refill() is not None)
+                if self._stopping:
+                    return
+                num_disks = self._needs_refill()
+
+            # Пополнение до capacity; генерация идет без блокировки
+            while True:
+                key = self._generate(num_disks)
+                with self._condition:
+                    if self._stopping:
+                        return
+                    pool = self._pools[num_disks]
+                    pool.append(key)
+                    self.generated += 1
+                    if len(pool) >= self.capacity:
+                        break
+
+
+jefferson_key_pool = JeffersonKeyPool()
+atexit.register(jefferson_key_pool.close)
+
+
+# Dependency для получения запаса ключей
+def get_key_pool() -> JeffersonKeyPool:
+    return jefferson_key_pool
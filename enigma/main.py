@@ -1,9 +1,30 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from enigma.routers import enigma_router, config_router, jefferson_router
+from enigma.ciphers.enigma.main import shutdown_executor
+from enigma.db import init_db
+from enigma.routers import enigma_router, config_router, jefferson_router, metrics_router
+from enigma.keypool import jefferson_key_pool
+from enigma.results import enigma_results, open_result_store
+from enigma.writer import jefferson_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    jefferson_key_pool.start()
+    jefferson_writer.start()
+    enigma_results.store = open_result_store()
+    yield
+    jefferson_key_pool.close()
+    jefferson_writer.close()
+    shutdown_executor()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(enigma_router)
 app.include_router(config_router)
 app.include_router(jefferson_router)
+app.include_router(metrics_router)
 
 
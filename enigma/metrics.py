@@ -0,0 +1,285 @@
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+
+# Границы корзин гистограмм, секунды
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        """
+        Счетчик в формате Prometheus
+        :param name: Имя метрики
+        :param documentation: Описание (строка HELP)
+        :param labelnames: Имена меток
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels[name] for name in self.labelnames), 0)
+
+    def render(self) -> list:
+        with self._lock:
+            values = list(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        """
+        Гистограмма длительностей в формате Prometheus
+        :param name: Имя метрики
+        :param documentation: Описание (строка HELP)
+        :param labelnames: Имена меток
+        :param buckets: Верхние границы корзин по возрастанию
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Метки -> [счетчики корзин (последняя - +Inf), сумма]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        self._observe(tuple(labels[name] for name in self.labelnames), value)
+
+    def _observe(self, key: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels) -> int:
+        series = self._values.get(tuple(labels[name] for name in self.labelnames))
+        return sum(series[0]) if series else 0
+
+    def time(self, **labels) -> "_Timer":
+        """Замер блока with"""
+        return _Timer(self, tuple(labels[name] for name in self.labelnames))
+
+    def render(self) -> list:
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _Timer:
+    # Класс вместо contextlib.contextmanager: замер дешевле в несколько раз
+    __slots__ = ("histogram", "key", "start")
+
+    def __init__(self, histogram: Histogram, key: tuple):
+        self.histogram = histogram
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.histogram._observe(self.key, time.perf_counter() - self.start)
+
+
+class Registry:
+    def __init__(self):
+        """Набор метрик и функций, снимающих значения при каждом запросе /metrics"""
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def collector(self, func):
+        """
+        Регистрация функции, возвращающей строки метрик
+        Для счетчиков, которые уже ведутся в других объектах (кэши, запас ключей).
+        """
+        self.collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request duration by route", ("method", "route", "status"),
+))
+REQUEST_STAGE_DURATION = registry.register(Histogram(
+    "http_request_stage_duration_seconds",
+    "Request stages: validation (parsing and dependencies), endpoint, serialization",
+    ("route", "stage"),
+))
+STAGE_DURATION = registry.register(Histogram(
+    "cipher_stage_duration_seconds", "Cipher stages: setup, encryption, key storage", ("stage",),
+))
+DB_QUERY_DURATION = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement duration by operation", ("operation",),
+))
+CHARACTERS = registry.register(Counter(
+    "cipher_characters_total", "Characters processed by cipher", ("cipher",),
+))
+
+
+def stage(name: str):
+    """Замер этапа обработки: with stage("setup_enigma"): ..."""
+    return _Timer(STAGE_DURATION, (name,))
+
+
+def cache_lines(name: str, caches: dict) -> list:
+    """Строки счетчиков попаданий для кэшей с методом stats() (hits, misses, size)"""
+    lines = [
+        f"# HELP {name}_requests_total Cache lookups by result",
+        f"# TYPE {name}_requests_total counter",
+    ]
+    sizes = [f"# HELP {name}_size Cached entries", f"# TYPE {name}_size gauge"]
+    for cache, stats in caches.items():
+        for result, key in (("hit", "hits"), ("miss", "misses")):
+            lines.append(f'{name}_requests_total{{cache="{cache}",result="{result}"}} {stats[key]}')
+        sizes.append(f'{name}_size{{cache="{cache}"}} {stats["size"]}')
+    return lines + sizes
+
+
+# Время запроса от начала обработки маршрутом: начало, вход в обработчик, выход из него
+_request_marks = contextvars.ContextVar("request_marks", default=None)
+
+
+def _mark(index: int):
+    marks = _request_marks.get()
+    if marks is not None:
+        marks[index] = time.perf_counter()
+
+
+def _timed_endpoint(endpoint):
+    """Обертка обработчика, отмечающая его начало и конец"""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            _mark(1)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _mark(2)
+    else:
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            _mark(1)
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _mark(2)
+    return timed
+
+
+class TimedRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        """
+        Маршрут с замером длительности запроса и его этапов
+        Проверка тела и зависимостей - до входа в обработчик,
+        сериализация ответа - после выхода из него.
+        """
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.path_format
+
+        async def timed_handler(request):
+            start = time.perf_counter()
+            marks = [start, None, None]
+            token = _request_marks.set(marks)
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            finally:
+                _request_marks.reset(token)
+                end = time.perf_counter()
+                REQUEST_DURATION.observe(end - start, method=request.method, route=route, status=status)
+                if marks[1] is not None:
+                    REQUEST_STAGE_DURATION.observe(marks[1] - start, route=route, stage="validation")
+                    REQUEST_STAGE_DURATION.observe(marks[2] - marks[1], route=route, stage="endpoint")
+                    REQUEST_STAGE_DURATION.observe(end - marks[2], route=route, stage="serialization")
+                elif status == 422:
+                    REQUEST_STAGE_DURATION.observe(end - start, route=route, stage="validation")
+
+        return timed_handler
+
+
+def _statement_operation(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+
+
+def instrument_engine(engine):
+    """Замер длительности SQL-запросов синхронного движка (или sync_engine асинхронного)"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        DB_QUERY_DURATION.observe(time.perf_counter() - start, operation=_statement_operation(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from sqlalchemy import create_engine, delete, event, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import sessionmaker
+
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.db import DBEnigmaResult, set_sqlite_pragmas
+
+# Объем результатов в памяти и срок их жизни, секунды
+RESULT_CACHE_BYTES = 64 << 20
+RESULT_CACHE_TTL = 3600.0
+
+# Результаты короче этого числа символов в SQLite не пишутся и не ищутся:
+# зашифровать их заново дешевле, чем прочитать из БД
+DISK_MIN_LENGTH = 1 << 16
+DISK_MAX_BYTES = 512 << 20
+# Очистка таблицы от устаревших и лишних записей раз в столько записей
+DISK_PRUNE_EVERY = 64
+
+# URL отдельной БД SQLite для хранилища результатов; без переменной кэш только в памяти
+RESULT_CACHE_DB_ENV = "ENIGMA_RESULT_CACHE_DB"
+
+CONFIG_FIELDS = tuple(EnigmaConfig.model_fields)
+
+
+def result_key(config: EnigmaConfig, text: str, offset: int = 0) -> bytes:
+    """
+    Канонический хэш запроса шифрования
+    Результат Энигмы определяется только полями конфигурации, смещением и текстом.
+    :param config: Конфигурация (или запрос с ее полями)
+    :param text: Текст
+    :param offset: Число уже зашифрованных букв сообщения
+    """
+    header = json.dumps([[getattr(config, field) for field in CONFIG_FIELDS], offset], separators=(",", ":"))
+    digest = hashlib.blake2b(header.encode("utf-8"), digest_size=32)
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8", "surrogatepass"))
+    return digest.digest()
+
+
+class ResultStore:
+    def __init__(self, session_factory, max_bytes: int = DISK_MAX_BYTES, ttl: float = RESULT_CACHE_TTL,
+                 prune_every: int = DISK_PRUNE_EVERY):
+        """
+        Результаты шифрования в таблице enigma_results
+        Записи старше ttl и самые старые записи сверх max_bytes удаляются
+        раз в prune_every записей.
+        :param session_factory: Фабрика синхронных сессий
+        :param max_bytes: Наибольший суммарный размер результатов
+        :param ttl: Срок жизни записи, секунды
+        :param prune_every: Число записей между очистками
+        """
+        self.session_factory = session_factory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.prune_every = prune_every
+        self._writes = 0
+        self._lock = Lock()
+
+    def get(self, key: bytes) -> str | None:
+        with self.session_factory() as db:
+            row = db.execute(
+                select(DBEnigmaResult.result, DBEnigmaResult.created_at)
+                .where(DBEnigmaResult.digest == key)
+            ).first()
+        if row is None or row.created_at < time.time() - self.ttl:
+            return None
+        return row.result
+
+    def put(self, key: bytes, value: str, size: int):
+        values = {"result": value, "size": size, "created_at": time.time()}
+        with self.session_factory() as db:
+            db.execute(
+                insert(DBEnigmaResult)
+                .values(digest=key, **values)
+                .on_conflict_do_update(index_elements=["digest"], set_=values)
+            )
+            db.commit()
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.prune_every == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Удаление устаревших записей и самых старых записей сверх max_bytes"""
+        with self.session_factory() as db:
+            db.execute(delete(DBEnigmaResult).where(DBEnigmaResult.created_at < time.time() - self.ttl))
+            excess = (db.scalar(select(func.sum(DBEnigmaResult.size))) or 0) - self.max_bytes
+            if excess > 0:
+                stale = []
+                for digest, size in db.execute(
+                    select(DBEnigmaResult.digest, DBEnigmaResult.size).order_by(DBEnigmaResult.created_at)
+                ):
+                    if excess <= 0:
+                        break
+                    stale.append(digest)
+                    excess -= size
+                db.execute(delete(DBEnigmaResult).where(DBEnigmaResult.digest.in_(stale)))
+            db.commit()
+
+    def clear(self):
+        with self.session_factory() as db:
+            db.execute(delete(DBEnigmaResult))
+            db.commit()
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int = RESULT_CACHE_BYTES, ttl: float = RESULT_CACHE_TTL,
+                 store: ResultStore | None = None, disk_min_length: int = DISK_MIN_LENGTH):
+        """
+        Кэш результатов шифрования по хэшу запроса (result_key)
+        В памяти записи вытесняются по давности использования, когда их
+        суммарный размер превышает max_bytes, и по истечении ttl. Запись
+        больше восьмой части max_bytes в память не попадает. Длинные
+        результаты дополнительно хранятся в SQLite (store), если он задан.
+        :param max_bytes: Наибольший суммарный размер результатов в памяти
+        :param ttl: Срок жизни записи в памяти, секунды
+        :param store: Хранилище в SQLite; None - только память
+        :param disk_min_length: Наименьшая длина результата для хранилища
+        """
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_bytes // 8
+        self.ttl = ttl
+        self.store = store
+        self.disk_min_length = disk_min_length
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        # Ключ -> (результат, размер, момент истечения по time.monotonic)
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: bytes, length: int = 0) -> str | None:
+        """
+        Результат по ключу или None
+        :param key: Хэш запроса
+        :param length: Длина текста: хранилище проверяется только для длинных текстов
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, size, expires = entry
+                if expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    self.bytes_saved += size
+                    return value
+                del self._data[key]
+                self.bytes -= size
+
+        if self.store is not None and length >= self.disk_min_length:
+            value = self.store.get(key)
+            if value is not None:
+                size = sys.getsizeof(value)
+                self._remember(key, value, size)
+                with self._lock:
+                    self.disk_hits += 1
+                    self.bytes_saved += size
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: bytes, value: str):
+        """Сохранение результата в памяти и, для длинных результатов, в хранилище"""
+        size = sys.getsizeof(value)
+        self._remember(key, value, size)
+        if self.store is not None and len(value) >= self.disk_min_length:
+            self.store.put(key, value, size)
+
+    def _remember(self, key: bytes, value: str, size: int):
+        if size > self.max_item_bytes:
+            return
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._data[key] = (value, size, time.monotonic() + self.ttl)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted, _) = self._data.popitem(last=False)
+                self.bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._data),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                # В hits входят попадания в хранилище (disk_hits - их часть)
+                "hits": self.hits + self.disk_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+def open_result_store(url: str | None = None) -> ResultStore | None:
+    """
+    Хранилище результатов в отдельной БД SQLite (не в ciphers.db)
+    :param url: URL БД, например sqlite:///./results.db; None - из переменной ENIGMA_RESULT_CACHE_DB
+    :return: Хранилище или None, если URL не задан
+    """
+    url = url or os.environ.get(RESULT_CACHE_DB_ENV)
+    if not url:
+        return None
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    DBEnigmaResult.__table__.create(engine, checkfirst=True)
+    return ResultStore(sessionmaker(bind=engine))
+
+
+# Хранилище в SQLite подключается при запуске приложения (enigma.main), если оно задано
+enigma_results = ResultCache()
+
+
+# Dependency для получения кэша результатов
+def get_result_cache() -> ResultCache:
+    return enigma_results
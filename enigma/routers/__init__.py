@@ -1,3 +1,4 @@
 from .enigma import router as enigma_router
 from .jefferson import router as jefferson_router
 from .config import router as config_router
+from .metrics import router as metrics_router
@@ -1,54 +1,144 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from enigma.db import DBEnigmaConfig, get_db
+from enigma.cache import machine_cache
+from enigma.db import DBEnigmaConfig, get_db, rotor_order
+from enigma.metrics import TimedRoute
 from enigma.ciphers.enigma.configs import EnigmaConfig
 
 
-router = APIRouter(prefix="/configs")
+router = APIRouter(prefix="/configs", route_class=TimedRoute)
+
+# Максимальный размер страницы списка конфигураций
+PAGE_LIMIT = 1000
 
 
 class EnigmaConfigCreate(EnigmaConfig):
     name: str
 
 
+class BulkImportInput(BaseModel):
+    configs: list[EnigmaConfigCreate] = Field(max_length=100_000)
+    # Пропускать конфигурации с уже занятыми именами вместо отмены всего импорта
+    skip_existing: bool = False
+
+
+class BulkImportResult(BaseModel):
+    created: int
+
+
+class ConfigPage(BaseModel):
+    items: list[dict]
+    # id последней конфигурации страницы для запроса следующей; None - страница последняя
+    next_after_id: int | None
+
+
+def config_row(config: EnigmaConfigCreate) -> dict:
+    """Строка enigma_configs для конфигурации"""
+    return {**config.model_dump(), "rotor_order": rotor_order(config.rotors)}
+
+
+def config_dict(config: DBEnigmaConfig) -> dict:
+    return {
+        "name": config.name,
+        "rotors": config.rotors,
+        "reflector": config.reflector,
+        "ring_settings": config.ring_settings,
+        "initial_positions": config.initial_positions,
+        "plugboard_pairs": config.plugboard_pairs
+    }
+
+
 @router.post("")
-def create_config(
+async def create_config(
     config: EnigmaConfigCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    # Проверяем уникальность имени
-    existing = db.query(DBEnigmaConfig).filter(
-        DBEnigmaConfig.name == config.name
-    ).first()
-    
-    if existing:
+    # Уникальность имени проверяет индекс: лишнего SELECT перед вставкой нет
+    try:
+        await db.execute(insert(DBEnigmaConfig).values(**config_row(config)))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(
             status_code=400,
             detail="Config with this name already exists"
         )
-    
-    # Создаем новую конфигурацию
-    db_config = DBEnigmaConfig(**config.dict())
-    db.add(db_config)
-    db.commit()
-    db.refresh(db_config)
+    machine_cache.invalidate(config.name)
+
+
+@router.post("/bulk")
+async def import_configs(
+    request: BulkImportInput,
+    db: AsyncSession = Depends(get_db),
+) -> BulkImportResult:
+    """Импорт конфигураций одной транзакцией"""
+    names = [config.name for config in request.configs]
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=400, detail="Duplicate names in request")
+    if not names:
+        return BulkImportResult(created=0)
+
+    rows = [config_row(config) for config in request.configs]
+    if request.skip_existing:
+        statement = sqlite_insert(DBEnigmaConfig).on_conflict_do_nothing(index_elements=["name"])
+    else:
+        statement = insert(DBEnigmaConfig)
+    try:
+        # Через соединение: executemany ядра без ORM и с числом вставленных строк
+        connection = await db.connection()
+        result = await connection.execute(statement, rows)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        # Занятые имена ищутся только при ошибке, чтобы назвать их в ответе
+        existing = await db.scalars(select(DBEnigmaConfig.name).where(DBEnigmaConfig.name.in_(names)))
+        raise HTTPException(
+            status_code=400,
+            detail=f"Config with this name already exists: {', '.join(sorted(existing))}"
+        )
+
+    for name in names:
+        machine_cache.invalidate(name)
+    return BulkImportResult(created=result.rowcount)
+
+
+@router.get("")
+async def list_configs(
+    rotors: str | None = Query(default=None, examples=["III,II,I"]),
+    reflector: str | None = Query(default=None, examples=["B"]),
+    after_id: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=PAGE_LIMIT),
+    db: AsyncSession = Depends(get_db),
+) -> ConfigPage:
+    """
+    Список конфигураций по возрастанию id с фильтром по порядку роторов и рефлектору
+    Следующая страница - after_id=next_after_id; поиск идет по составным индексам
+    (rotor_order, reflector, id) и (reflector, id) без OFFSET.
+    """
+    query = select(DBEnigmaConfig).where(DBEnigmaConfig.id > after_id)
+    if rotors is not None:
+        query = query.where(DBEnigmaConfig.rotor_order == rotors)
+    if reflector is not None:
+        query = query.where(DBEnigmaConfig.reflector == reflector)
+    # Лишняя строка показывает, есть ли следующая страница
+    configs = list(await db.scalars(query.order_by(DBEnigmaConfig.id).limit(limit + 1)))
+
+    next_after_id = configs[limit - 1].id if len(configs) > limit else None
+    return ConfigPage(items=[config_dict(config) for config in configs[:limit]], next_after_id=next_after_id)
 
 
 @router.get("/{config_name}")
-def get_config(config_name: str, db: Session = Depends(get_db)):
-    config = db.query(DBEnigmaConfig).filter(
-        DBEnigmaConfig.name == config_name
-    ).first()
+async def get_config(config_name: str, db: AsyncSession = Depends(get_db)):
+    config = await db.scalar(
+        select(DBEnigmaConfig).where(DBEnigmaConfig.name == config_name)
+    )
     
     if not config:
         raise HTTPException(status_code=404, detail="Config not found")
     
-    return {
-        "name": config.name,
-        "rotors": config.rotors,
-        "reflector": config.reflector,
-        "ring_settings": config.ring_settings,
-        "initial_positions": config.initial_positions,
-        "plugboard_pairs": config.plugboard_pairs
-    }
+    return config_dict(config)
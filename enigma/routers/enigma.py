@@ -1,11 +1,19 @@
-from fastapi import Depends, APIRouter
-from pydantic import BaseModel
-from enigma.ciphers.enigma import EnigmaInput, setup_enigma
+import codecs
+
+from fastapi import Depends, APIRouter, Header, HTTPException, Query
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from enigma.ciphers.enigma import EnigmaInput, encrypt_parallel, setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.ciphers.enigma.pool import MachinePool
 from sqlalchemy.orm import Session
 
-from enigma.db import DBEnigmaConfig, get_db
+from enigma.cache import config_pools, machine_cache
+from enigma.db import DBEnigmaConfig, get_session_factory, get_sync_db
+from enigma.metrics import CHARACTERS, TimedRoute, stage
+from enigma.results import ResultCache, get_result_cache, result_key
+from enigma.routers.streaming import TransformStreamResponse
 
-router = APIRouter(prefix="/ciphers/enigma")
+router = APIRouter(prefix="/ciphers/enigma", route_class=TimedRoute)
 
 
 class EncryptResult(BaseModel):
@@ -15,28 +23,196 @@ class EncryptResult(BaseModel):
 class EncryptFromDbInput(BaseModel):
     text: str
     config_name: str
+    offset: int = Field(default=0, ge=0)
+
+
+class BatchItem(BaseModel):
+    text: str
+    config: EnigmaConfig | None = None
+    config_name: str | None = None
+    offset: int = Field(default=0, ge=0)
+
+    @model_validator(mode="after")
+    def check_config(self):
+        if (self.config is None) == (self.config_name is None):
+            raise ValueError("Pass exactly one of config or config_name")
+        return self
+
+
+class BatchInput(BaseModel):
+    items: list[BatchItem]
+
+
+class BatchResult(BaseModel):
+    results: list[EncryptResult]
+
+
+# Поля, определяющие машину (без текста и параметров запроса)
+CONFIG_FIELDS = set(EnigmaConfig.model_fields)
+
+
+def config_pool(config: EnigmaConfig) -> MachinePool:
+    """Пул машин для конфигурации из запроса: машина собирается один раз на конфигурацию"""
+    key = config.model_dump_json(include=CONFIG_FIELDS)
+    pool = config_pools.get(key)
+    if pool is None:
+        with stage("setup_enigma"):
+            pool = MachinePool(setup_enigma(config))
+        config_pools.put(key, pool)
+    return pool
 
 
 @router.post("/encrypt")
 def encrypt(
     request: EnigmaInput,
+    results: ResultCache = Depends(get_result_cache),
 ) -> EncryptResult:
-    enigma = setup_enigma(request)
-    encrypted_text = enigma.encrypt(request.text)
+    # Повторный запрос с теми же настройками и текстом отдается из кэша без шифрования
+    with stage("result_cache"):
+        key = result_key(request, request.text, request.offset)
+        encrypted_text = results.get(key, len(request.text))
+    if encrypted_text is not None:
+        return EncryptResult(encrypted_text=encrypted_text)
+
+    CHARACTERS.inc(len(request.text), cipher="enigma")
+    if request.parallel:
+        with stage("encrypt_parallel"):
+            encrypted_text = encrypt_parallel(request, request.text, offset=request.offset)
+    else:
+        with config_pool(request).machine() as enigma:
+            enigma.advance(request.offset)
+            with stage("encrypt"):
+                encrypted_text = enigma.encrypt(request.text)
+    results.put(key, encrypted_text)
     return EncryptResult(encrypted_text=encrypted_text)
 
 
 @router.post("/encrypt/from_db")
 def encrypt(
     request: EncryptFromDbInput,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_sync_db),
 ) -> EncryptResult:
-    db_config = db.query(DBEnigmaConfig).filter(
-        DBEnigmaConfig.name == request.config_name
-    ).first()
-    enigma = setup_enigma(db_config)
-    encrypted_text = enigma.encrypt(request.text)
+    # Пулы машин кэшируются по имени, запрос берет машину из пула и возвращает ее
+    pool = machine_cache.get(request.config_name)
+    if pool is None:
+        db_config = db.query(DBEnigmaConfig).filter(
+            DBEnigmaConfig.name == request.config_name
+        ).first()
+        if not db_config:
+            raise HTTPException(status_code=404, detail="Config not found")
+        with stage("setup_enigma"):
+            pool = MachinePool(setup_enigma(db_config))
+        machine_cache.put(request.config_name, pool)
+    CHARACTERS.inc(len(request.text), cipher="enigma")
+    with pool.machine() as enigma:
+        enigma.advance(request.offset)
+        with stage("encrypt"):
+            encrypted_text = enigma.encrypt(request.text)
     return EncryptResult(encrypted_text=encrypted_text)
 
 
+@router.post("/encrypt/batch")
+def encrypt_batch(
+    request: BatchInput,
+    db: Session = Depends(get_sync_db),
+) -> BatchResult:
+    # Все именованные конфигурации загружаются одним запросом
+    names = {item.config_name for item in request.items if item.config_name is not None}
+    named = {}
+    if names:
+        for db_config in db.query(DBEnigmaConfig).filter(DBEnigmaConfig.name.in_(names)):
+            named[db_config.name] = EnigmaConfig.model_validate(db_config, from_attributes=True)
+        missing = names - named.keys()
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Config not found: {', '.join(sorted(missing))}"
+            )
+
+    # Сообщения с одинаковой конфигурацией шифруются одной машиной
+    groups = {}
+    for i, item in enumerate(request.items):
+        config = item.config if item.config is not None else named[item.config_name]
+        groups.setdefault(config.model_dump_json(), (config, []))[1].append(i)
+
+    results = [None] * len(request.items)
+    for config, indexes in groups.values():
+        pool = config_pool(config)
+        with pool.machine() as enigma, stage("encrypt"):
+            for i in indexes:
+                item = request.items[i]
+                enigma.restore(pool.start)
+                enigma.advance(item.offset)
+                results[i] = EncryptResult(encrypted_text=enigma.encrypt(item.text))
+    CHARACTERS.inc(sum(len(item.text) for item in request.items), cipher="enigma")
+    return BatchResult(results=results)
+
+
+@router.get("/cache")
+def cache_stats() -> dict:
+    """Счетчики кэша машин для /encrypt/from_db"""
+    return machine_cache.stats()
+
+
+@router.get("/cache/results")
+def result_cache_stats(results: ResultCache = Depends(get_result_cache)) -> dict:
+    """Счетчики кэша результатов /encrypt: доля попаданий и сэкономленные байты"""
+    return results.stats()
+
+
+def get_stream_config(
+    config_name: str | None = None,
+    x_enigma_config: str | None = Header(default=None),
+    session_factory=Depends(get_session_factory),
+) -> EnigmaConfig:
+    """Конфигурация потокового шифрования: по имени из БД или JSON в заголовке"""
+    if config_name is not None:
+        # Сессия открывается только для конфигурации из БД
+        with session_factory() as db:
+            db_config = db.query(DBEnigmaConfig).filter(
+                DBEnigmaConfig.name == config_name
+            ).first()
+            if not db_config:
+                raise HTTPException(status_code=404, detail="Config not found")
+            return EnigmaConfig.model_validate(db_config, from_attributes=True)
+
+    if x_enigma_config is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Pass config_name or X-Enigma-Config header"
+        )
+    try:
+        return EnigmaConfig.model_validate_json(x_enigma_config)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+
+class EncryptStreamResponse(TransformStreamResponse):
+    def __init__(self, enigma):
+        """
+        Потоковое шифрование тела запроса (текст UTF-8)
+        :param enigma: Машина Энигма, общая для всех частей тела
+        """
+        super().__init__()
+        self.enigma = enigma
+        # Символ UTF-8 может оказаться разрезан между частями тела
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def transform(self, body: bytes, final: bool) -> bytes:
+        text = self.decoder.decode(body, final=final)
+        CHARACTERS.inc(len(text), cipher="enigma")
+        # Машина одна на весь поток: позиции роторов переходят между частями
+        with stage("encrypt"):
+            return self.enigma.encrypt(text).encode()
+
 
+@router.post("/encrypt/stream")
+def encrypt_stream(
+    config: EnigmaConfig = Depends(get_stream_config),
+    offset: int = Query(default=0, ge=0),
+) -> EncryptStreamResponse:
+    """Шифрование тела запроса (текст UTF-8) по частям с потоковым ответом"""
+    with stage("setup_enigma"):
+        enigma = setup_enigma(config)
+        enigma.advance(offset)
+    return EncryptStreamResponse(enigma)
@@ -1,13 +1,25 @@
-from fastapi import APIRouter
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from enigma.db import DBJeffersonConfig, get_db
+from enigma.disksets import DiskSetStore, get_disk_sets
+from enigma.keypool import JeffersonKeyPool, get_key_pool
+from enigma.metrics import CHARACTERS, TimedRoute, stage
+from enigma.routers.streaming import TransformStreamResponse
+from enigma.writer import JeffersonKeyWriter, get_key_writer
 from enigma.ciphers.jefferson import setup_jefferson, JeffersonInput, JeffersonDecryptInput
+from enigma.ciphers.jefferson.batch import decrypt_batch
+from enigma.ciphers.jefferson.configs import JeffersonConfig
+from enigma.ciphers.jefferson.stream import JeffersonStream
+from enigma.ciphers.jefferson.storage import decode_order, encode_disks, encode_order
 
 
-router = APIRouter(prefix="/ciphers/jefferson")
+router = APIRouter(prefix="/ciphers/jefferson", route_class=TimedRoute)
 
 
 class EncryptResult(BaseModel):
@@ -19,40 +31,203 @@ class DecryptResult(BaseModel):
     decrypted_text: str
 
 
+class DecryptBatchInput(BaseModel):
+    items: list[JeffersonDecryptInput]
+
+
+class DecryptBatchResult(BaseModel):
+    results: list[DecryptResult]
+
+
+async def store_disk_set(disk_sets: DiskSetStore, disks: list) -> int:
+    """id набора дисков; в БД обращаемся только для нового набора"""
+    blob = encode_disks(disks)
+    disk_set_id = disk_sets.find(blob)
+    if disk_set_id is None:
+        disk_set_id = await run_in_threadpool(disk_sets.store, blob)
+    return disk_set_id
+
+
+async def load_disk_set(disk_sets: DiskSetStore, disk_set_id: int) -> list:
+    """Диски набора из кэша, при промахе - из БД в пуле потоков"""
+    disks = disk_sets.get(disk_set_id)
+    if disks is None:
+        disks = await run_in_threadpool(disk_sets.load, disk_set_id)
+    if disks is None:
+        raise HTTPException(status_code=404, detail="Disk set not found")
+    return disks
+
+
+async def create_key(
+    config: JeffersonConfig,
+    writer: JeffersonKeyWriter,
+    pool: JeffersonKeyPool,
+    disk_sets: DiskSetStore,
+) -> tuple:
+    """Новый шифр и id его ключа в БД"""
+    # Ключ берется из запаса, при пустом запасе генерируется в пуле потоков
+    with stage("setup_jefferson"):
+        key = pool.take(config.num_disks)
+        if key is not None:
+            jefferson = setup_jefferson(config, *key)
+        else:
+            jefferson = await run_in_threadpool(setup_jefferson, config)
+
+    # Набор дисков пишется один раз, ключ - фоновым потоком пакетами, id известен сразу
+    encrypt_id = writer.submit(
+        disk_set_id=await store_disk_set(disk_sets, jefferson.disks),
+        secret_key=encode_order(jefferson.get_key()),
+        num_disks=config.num_disks,
+        key_row=config.key_row
+    )
+    return jefferson, encrypt_id
+
+
+async def load_key(
+    decrypt_id: int,
+    db: AsyncSession,
+    writer: JeffersonKeyWriter,
+    disk_sets: DiskSetStore,
+) -> tuple:
+    """Шифр с ключом decrypt_id и строка ключа из БД"""
+    # Ключ мог быть еще не записан: ждем его пакет
+    await asyncio.wrap_future(writer.durable(decrypt_id))
+    config = await db.scalar(
+        select(DBJeffersonConfig).where(DBJeffersonConfig.id == decrypt_id)
+    )
+
+    if not config:
+        raise HTTPException(status_code=404, detail="Config not found")
+
+    disks = await load_disk_set(disk_sets, config.disk_set_id)
+    jefferson = setup_jefferson(config, disks=disks)
+    jefferson.set_disk_order(decode_order(config.secret_key, config.num_disks))
+    return jefferson, config
+
+
+class JeffersonStreamResponse(TransformStreamResponse):
+    def __init__(self, stream: JeffersonStream, headers: dict | None = None):
+        """
+        Потоковое шифрование или расшифрование тела запроса (текст UTF-8)
+        :param stream: Поток шифра, общий для всех частей тела
+        :param headers: Дополнительные заголовки ответа
+        """
+        super().__init__(headers)
+        self.stream = stream
+
+    def transform(self, body: bytes, final: bool) -> bytes:
+        CHARACTERS.inc(len(body), cipher="jefferson")
+        with stage("jefferson_decrypt" if self.stream.decrypt else "jefferson_encrypt"):
+            return self.stream.process(body, final)
+
+
 @router.post("/encrypt")
-def encrypt_jefferson(
+async def encrypt_jefferson(
     request: JeffersonInput,
-    db: Session = Depends(get_db),
+    writer: JeffersonKeyWriter = Depends(get_key_writer),
+    pool: JeffersonKeyPool = Depends(get_key_pool),
+    disk_sets: DiskSetStore = Depends(get_disk_sets),
 ) -> EncryptResult:
-    jefferson = setup_jefferson(request)
-    encrypted_text = jefferson.encrypt(request.text, request.key_row)
-
-    db_config = DBJeffersonConfig(
-        disks=jefferson.disks,
-        secret_key=jefferson.get_key(),
-        num_disks=request.num_disks,
-        key_row=request.key_row
+    jefferson, encrypt_id = await create_key(request, writer, pool, disk_sets)
+    CHARACTERS.inc(len(request.text), cipher="jefferson")
+    with stage("jefferson_encrypt"):
+        encrypted_text = await run_in_threadpool(jefferson.encrypt, request.text, request.key_row)
+    return EncryptResult(encrypted_text=encrypted_text, encrypt_id=encrypt_id)
+
+
+@router.post("/encrypt/stream")
+async def encrypt_jefferson_stream(
+    num_disks: int = Query(examples=[36]),
+    key_row: int = Query(examples=[5]),
+    writer: JeffersonKeyWriter = Depends(get_key_writer),
+    pool: JeffersonKeyPool = Depends(get_key_pool),
+    disk_sets: DiskSetStore = Depends(get_disk_sets),
+) -> JeffersonStreamResponse:
+    """Шифрование тела запроса по частям; id ключа в заголовке X-Encrypt-Id"""
+    config = JeffersonConfig(num_disks=num_disks, key_row=key_row)
+    jefferson, encrypt_id = await create_key(config, writer, pool, disk_sets)
+    return JeffersonStreamResponse(
+        JeffersonStream(jefferson),
+        headers={"X-Encrypt-Id": str(encrypt_id)},
     )
-    db.add(db_config)
-    db.commit()
-    db.refresh(db_config)
 
-    return EncryptResult(encrypted_text=encrypted_text, encrypt_id=db_config.id)
+
+@router.get("/pool")
+def pool_stats(pool: JeffersonKeyPool = Depends(get_key_pool)) -> dict:
+    """Размеры и счетчики запаса ключей"""
+    return pool.stats()
+
+
+@router.get("/disk_sets")
+def disk_set_stats(disk_sets: DiskSetStore = Depends(get_disk_sets)) -> dict:
+    """Счетчики кэша наборов дисков"""
+    return disk_sets.stats()
 
 
 @router.post("/decrypt")
-def encrypt_jefferson(
+async def decrypt_jefferson(
     request: JeffersonDecryptInput,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    writer: JeffersonKeyWriter = Depends(get_key_writer),
+    disk_sets: DiskSetStore = Depends(get_disk_sets),
 ) -> DecryptResult:
-    config = db.query(DBJeffersonConfig).filter(
-        DBJeffersonConfig.id == request.decrypt_id
-    ).first()
-
-    if not config:
-        raise HTTPException(status_code=404, detail="Config not found")
-    
-    jefferson = setup_jefferson(config, disks=config.disks)
-    jefferson.set_disk_order(config.secret_key)
-    decrypted_text = jefferson.decrypt(request.text, config.key_row)
+    jefferson, config = await load_key(request.decrypt_id, db, writer, disk_sets)
+    CHARACTERS.inc(len(request.text), cipher="jefferson")
+    with stage("jefferson_decrypt"):
+        decrypted_text = await run_in_threadpool(jefferson.decrypt, request.text, config.key_row)
     return DecryptResult(decrypted_text=decrypted_text)
+
+
+@router.post("/decrypt/stream")
+async def decrypt_jefferson_stream(
+    decrypt_id: int,
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    writer: JeffersonKeyWriter = Depends(get_key_writer),
+    disk_sets: DiskSetStore = Depends(get_disk_sets),
+) -> JeffersonStreamResponse:
+    """Расшифрование тела запроса по частям начиная с символа offset сообщения"""
+    jefferson, _ = await load_key(decrypt_id, db, writer, disk_sets)
+    return JeffersonStreamResponse(JeffersonStream(jefferson, decrypt=True, offset=offset))
+
+
+@router.post("/decrypt/batch")
+async def decrypt_jefferson_batch(
+    request: DecryptBatchInput,
+    db: AsyncSession = Depends(get_db),
+    writer: JeffersonKeyWriter = Depends(get_key_writer),
+    disk_sets: DiskSetStore = Depends(get_disk_sets),
+) -> DecryptBatchResult:
+    ids = {item.decrypt_id for item in request.items}
+    for decrypt_id in ids:
+        await asyncio.wrap_future(writer.durable(decrypt_id))
+
+    # Все ключи загружаются одним запросом
+    configs = {
+        config.id: config
+        for config in await db.scalars(
+            select(DBJeffersonConfig).where(DBJeffersonConfig.id.in_(ids))
+        )
+    }
+    missing = ids - configs.keys()
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Config not found: {', '.join(map(str, sorted(missing)))}"
+        )
+
+    keys = {
+        config.id: (
+            await load_disk_set(disk_sets, config.disk_set_id),
+            decode_order(config.secret_key, config.num_disks),
+        )
+        for config in configs.values()
+    }
+    CHARACTERS.inc(sum(len(item.text) for item in request.items), cipher="jefferson")
+    with stage("jefferson_decrypt_batch"):
+        decrypted = await run_in_threadpool(
+            decrypt_batch,
+            [item.text for item in request.items],
+            [keys[item.decrypt_id] for item in request.items],
+        )
+    return DecryptBatchResult(results=[DecryptResult(decrypted_text=text) for text in decrypted])
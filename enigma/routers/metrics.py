@@ -0,0 +1,83 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from enigma.cache import config_pools, machine_cache
+from enigma.disksets import disk_set_store
+from enigma.keypool import jefferson_key_pool
+from enigma.metrics import cache_lines, registry
+from enigma.results import enigma_results
+from enigma.writer import jefferson_writer
+
+router = APIRouter()
+
+
+@registry.collector
+def collect_caches() -> list:
+    """Попадания в кэши машин и результатов Энигмы и наборов дисков"""
+    disk_sets = disk_set_store.stats()
+    return cache_lines("cache", {
+        "enigma_machines": machine_cache.stats(),
+        "enigma_config_pools": config_pools.stats(),
+        "enigma_results": enigma_results.stats(),
+        "disk_set_ids": disk_sets["ids"],
+        "disk_sets": disk_sets["disks"],
+    })
+
+
+@registry.collector
+def collect_results() -> list:
+    """Объем кэша результатов Энигмы и байты, отданные из него без шифрования"""
+    stats = enigma_results.stats()
+    return [
+        "# HELP enigma_result_cache_bytes Bytes of cached results in memory",
+        "# TYPE enigma_result_cache_bytes gauge",
+        f"enigma_result_cache_bytes {stats['bytes']}",
+        "# HELP enigma_result_cache_disk_hits_total Result cache hits served from SQLite",
+        "# TYPE enigma_result_cache_disk_hits_total counter",
+        f"enigma_result_cache_disk_hits_total {stats['disk_hits']}",
+        "# HELP enigma_result_cache_saved_bytes_total Bytes of results served without encryption",
+        "# TYPE enigma_result_cache_saved_bytes_total counter",
+        f"enigma_result_cache_saved_bytes_total {stats['bytes_saved']}",
+    ]
+
+
+@registry.collector
+def collect_key_pool() -> list:
+    """Запас ключей Джефферсона: выдачи из запаса и генерация в запросе"""
+    stats = jefferson_key_pool.stats()
+    lines = [
+        "# HELP jefferson_key_pool_requests_total Key pool requests by result",
+        "# TYPE jefferson_key_pool_requests_total counter",
+        f'jefferson_key_pool_requests_total{{result="hit"}} {stats["hits"]}',
+        f'jefferson_key_pool_requests_total{{result="miss"}} {stats["misses"]}',
+        "# HELP jefferson_key_pool_size Keys ready in pool",
+        "# TYPE jefferson_key_pool_size gauge",
+    ]
+    lines.extend(
+        f'jefferson_key_pool_size{{num_disks="{num_disks}"}} {size}'
+        for num_disks, size in stats["sizes"].items()
+    )
+    return lines
+
+
+@registry.collector
+def collect_writer() -> list:
+    """Отложенная запись ключей Джефферсона"""
+    stats = jefferson_writer.stats()
+    return [
+        "# HELP jefferson_key_writer_pending Keys waiting to be written",
+        "# TYPE jefferson_key_writer_pending gauge",
+        f"jefferson_key_writer_pending {stats['pending']}",
+        "# HELP jefferson_key_writer_rows_total Keys written",
+        "# TYPE jefferson_key_writer_rows_total counter",
+        f"jefferson_key_writer_rows_total {stats['flushed_rows']}",
+        "# HELP jefferson_key_writer_batches_total Write transactions",
+        "# TYPE jefferson_key_writer_batches_total counter",
+        f"jefferson_key_writer_batches_total {stats['flushed_batches']}",
+    ]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Метрики в текстовом формате Prometheus"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,93 @@
+import json
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+
+# Трейлер с описанием ошибки, возникшей после начала ответа
+ERROR_TRAILER = "x-stream-error"
+
+
+class TransformStreamResponse(Response):
+    media_type = "text/plain; charset=utf-8"
+
+    def __init__(self, headers: dict | None = None):
+        """
+        Потоковый ответ, преобразующий тело запроса по мере его поступления
+        Тело читается здесь же из receive: единственный читатель сообщений
+        http.request, поэтому StreamingResponse с request.stream() не подходит.
+        Статус отправляется вместе с первым непустым результатом: неверный
+        UTF-8 в начале тела дает ответ 400. Ошибка после начала ответа
+        передается трейлером X-Stream-Error, если сервер поддерживает трейлеры,
+        иначе соединение обрывается без завершения тела.
+        :param headers: Дополнительные заголовки ответа
+        """
+        super().__init__()
+        self.raw_headers = [(b"content-type", self.media_type.encode())]
+        for name, value in (headers or {}).items():
+            self.raw_headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+
+    def transform(self, body: bytes, final: bool) -> bytes:
+        """Преобразование части тела (выполняется в пуле потоков)"""
+        raise NotImplementedError
+
+    async def __call__(self, scope, receive, send):
+        trailers = "http.response.trailers" in scope.get("extensions", {})
+        started = False
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            more_body = message.get("more_body", False)
+            try:
+                result = await run_in_threadpool(self.transform, message.get("body", b""), not more_body)
+            except UnicodeDecodeError as e:
+                detail = f"Invalid UTF-8 in request body: {e.reason} at byte {e.start} of chunk"
+                if not started:
+                    await self._send_error(send, detail)
+                    return
+                if not trailers:
+                    raise
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                await send({
+                    "type": "http.response.trailers",
+                    "headers": [(ERROR_TRAILER.encode(), detail.encode("latin-1", "replace"))],
+                    "more_trailers": False,
+                })
+                return
+            if result:
+                if not started:
+                    await self._start(send, trailers)
+                    started = True
+                await send({
+                    "type": "http.response.body",
+                    "body": result,
+                    "more_body": True,
+                })
+        if not started:
+            await self._start(send, trailers)
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if trailers:
+            await send({"type": "http.response.trailers", "headers": [], "more_trailers": False})
+
+    async def _start(self, send, trailers: bool):
+        headers = self.raw_headers
+        if trailers:
+            headers = headers + [(b"trailer", ERROR_TRAILER.encode())]
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": headers,
+            "trailers": trailers,
+        })
+
+    @staticmethod
+    async def _send_error(send, detail: str):
+        """Ответ 400 до начала потока"""
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 400,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body, "more_body": False})
@@ -0,0 +1,220 @@
+import atexit
+import threading
+from concurrent.futures import Future
+
+from sqlalchemy import func, insert, select, update
+
+from enigma.db import DBIdReservation, DBJeffersonConfig, SessionLocal
+from enigma.metrics import stage
+
+# Число идентификаторов, резервируемых писателем за раз
+ID_BLOCK = 256
+
+
+def reserve_ids(db, count: int) -> int:
+    """
+    Атомарное резервирование count идентификаторов jefferson_configs
+    Диапазон берется одним UPDATE ... RETURNING, поэтому писатели разных
+    процессов получают непересекающиеся диапазоны. Счетчик не опускается
+    ниже max(id) + 1, даже если строки добавлялись в обход резервирования.
+    :param db: Синхронная сессия
+    :param count: Число идентификаторов
+    :return: Первый идентификатор диапазона [first, first + count)
+    """
+    name = DBJeffersonConfig.__tablename__
+    db.execute(
+        insert(DBIdReservation).prefix_with("OR IGNORE").values(name=name, next_id=1)
+    )
+    first_free = select(func.coalesce(func.max(DBJeffersonConfig.id), 0) + 1).scalar_subquery()
+    end = db.scalar(
+        update(DBIdReservation)
+        .where(DBIdReservation.name == name)
+        .values(next_id=func.max(DBIdReservation.next_id, first_free) + count)
+        .returning(DBIdReservation.next_id)
+    )
+    db.commit()
+    return end - count
+
+
+class JeffersonKeyWriter:
+    def __init__(self, session_factory, flush_interval: float = 0.005, max_batch: int = 256,
+                 id_block: int = ID_BLOCK):
+        """
+        Отложенная пакетная запись ключей шифра Джефферсона
+        Идентификаторы выдаются сразу, строки пишутся фоновым потоком одной
+        транзакцией раз в flush_interval секунд или по накоплении max_batch строк.
+        Идентификаторы берутся из диапазонов, зарезервированных в БД (reserve_ids),
+        так что писатели нескольких процессов не выдают одинаковых id. Следующий
+        диапазон резервирует фоновый поток, когда текущий израсходован наполовину.
+        :param session_factory: Фабрика синхронных сессий
+        :param flush_interval: Максимальная задержка записи, секунды
+        :param max_batch: Размер пакета, при котором запись начинается сразу
+        :param id_block: Число идентификаторов в резервируемом диапазоне
+        """
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.id_block = id_block
+        self.flushed_rows = 0
+        self.flushed_batches = 0
+
+        self._condition = threading.Condition()
+        self._pending = []
+        self._batch = Future()
+        # Идентификатор -> запись пакета, в котором он находится
+        self._in_flight = {}
+        # Текущий диапазон [_next_id, _end_id) и начало следующего, если он уже зарезервирован
+        self._next_id = None
+        self._end_id = None
+        self._reserved = None
+        self._refill = False
+        self._thread = None
+        self._stopping = False
+
+    def start(self):
+        """Резервирование первого диапазона и запуск потока (при старте приложения, до запросов)"""
+        first = self._reserve()
+        with self._condition:
+            if self._next_id is None:
+                self._next_id, self._end_id = first, first + self.id_block
+            self._start_thread()
+
+    def submit(self, **row) -> int:
+        """Постановка строки DBJeffersonConfig в очередь, возвращает ее id"""
+        with self._condition:
+            self._start_thread()
+            if self._next_id is None or self._next_id >= self._end_id:
+                if self._reserved is not None:
+                    first, self._reserved = self._reserved, None
+                else:
+                    # Без start() или при опередившем поток всплеске: резервирование здесь
+                    first = self._reserve()
+                self._next_id, self._end_id = first, first + self.id_block
+
+            row_id = self._next_id
+            self._next_id += 1
+            self._pending.append({"id": row_id, **row})
+            self._in_flight[row_id] = self._batch
+            if self._end_id - self._next_id <= self.id_block // 2 and self._reserved is None:
+                self._refill = True
+            # Поток будится первой строкой пакета (начало отсчета flush_interval),
+            # заполненным пакетом и нуждой в новом диапазоне
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch or self._refill:
+                self._condition.notify()
+            return row_id
+
+    def durable(self, row_id: int) -> Future:
+        """Future, завершающийся после записи строки row_id в БД"""
+        with self._condition:
+            batch = self._in_flight.get(row_id)
+        if batch is None:
+            batch = Future()
+            batch.set_result(None)
+        return batch
+
+    def flush(self):
+        """Немедленная запись всех ожидающих строк"""
+        with self._condition:
+            rows, batch = self._take()
+        self._write(rows, batch)
+
+    def close(self):
+        """Остановка фонового потока с записью оставшихся строк"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def reset(self, session_factory=None):
+        """Смена БД: остановка потока и сброс диапазонов идентификаторов"""
+        self.close()
+        if session_factory is not None:
+            self.session_factory = session_factory
+        self._next_id = self._end_id = self._reserved = None
+        self._refill = False
+
+    def stats(self) -> dict:
+        with self._condition:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "flushed_rows": self.flushed_rows,
+            "flushed_batches": self.flushed_batches,
+        }
+
+    def _take(self) -> tuple:
+        """Забрать накопленный пакет (под блокировкой)"""
+        rows, batch = self._pending, self._batch
+        self._pending, self._batch = [], Future()
+        return rows, batch
+
+    def _start_thread(self):
+        """Запуск фонового потока (под блокировкой)"""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _reserve(self) -> int:
+        with self.session_factory() as db:
+            return reserve_ids(db, self.id_block)
+
+    def _prefetch(self):
+        """Резервирование следующего диапазона идентификаторов"""
+        try:
+            first = self._reserve()
+        except Exception:
+            # Диапазон будет зарезервирован в submit, когда текущий закончится
+            first = None
+        with self._condition:
+            self._reserved = first
+            self._refill = False
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopping or self._refill)
+                if self._stopping:
+                    return
+                refill = self._refill
+                if not refill:
+                    # Даем пакету набраться, но не дольше flush_interval
+                    self._condition.wait_for(
+                        lambda: len(self._pending) >= self.max_batch or self._stopping,
+                        timeout=self.flush_interval,
+                    )
+                    rows, batch = self._take()
+            if refill:
+                self._prefetch()
+            else:
+                self._write(rows, batch)
+
+    def _write(self, rows: list, batch: Future):
+        if not rows:
+            return
+        try:
+            with stage("key_write"), self.session_factory() as db:
+                db.execute(insert(DBJeffersonConfig), rows)
+                db.commit()
+        except Exception as e:
+            batch.set_exception(e)
+        else:
+            batch.set_result(None)
+            self.flushed_rows += len(rows)
+            self.flushed_batches += 1
+        finally:
+            with self._condition:
+                for row in rows:
+                    self._in_flight.pop(row["id"], None)
+
+
+jefferson_writer = JeffersonKeyWriter(SessionLocal)
+atexit.register(jefferson_writer.close)
+
+
+# Dependency для получения писателя ключей
+def get_key_writer() -> JeffersonKeyWriter:
+    return jefferson_writer
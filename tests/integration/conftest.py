@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from enigma.db import Base, get_db, get_session_factory, get_sync_db, set_sqlite_pragmas
+from enigma.disksets import DiskSetStore, get_disk_sets
+from enigma.main import app
+from enigma.results import ResultCache, ResultStore, get_result_cache
+from enigma.writer import JeffersonKeyWriter, get_key_writer
+
+
+@pytest.fixture(autouse=True)
+def memory_result_cache():
+    """Свой кэш результатов в памяти для каждого теста: без попаданий из других тестов и записи в БД"""
+    results = ResultCache()
+    app.dependency_overrides[get_result_cache] = lambda: results
+    yield
+    app.dependency_overrides.pop(get_result_cache, None)
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Временная БД вместо ciphers.db для синхронных и асинхронных обработчиков"""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    Base.metadata.create_all(bind=engine)
+    TestSession = sessionmaker(bind=engine)
+    TestAsyncSession = async_sessionmaker(
+        create_async_engine(f"sqlite+aiosqlite:///{path}"),
+        expire_on_commit=False,
+    )
+
+    def get_test_sync_db():
+        db = TestSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_test_db():
+        async with TestAsyncSession() as db:
+            yield db
+
+    writer = JeffersonKeyWriter(TestSession)
+    app.dependency_overrides[get_sync_db] = get_test_sync_db
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_session_factory] = lambda: TestSession
+    disk_sets = DiskSetStore(TestSession)
+    results = ResultCache(store=ResultStore(TestSession))
+    app.dependency_overrides[get_key_writer] = lambda: writer
+    app.dependency_overrides[get_disk_sets] = lambda: disk_sets
+    app.dependency_overrides[get_result_cache] = lambda: results
+    yield engine
+    app.dependency_overrides.clear()
+    writer.close()
+    engine.dispose()
@@ -0,0 +1,75 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from enigma.main import app
+
+client = TestClient(app)
+
+
+def make_config(name: str, rotors=("III", "II", "I"), reflector: str = "B") -> dict:
+    return {
+        "name": name,
+        "rotors": list(rotors),
+        "reflector": reflector,
+        "ring_settings": [0, 0, 0],
+        "initial_positions": "AAA",
+        "plugboard_pairs": [],
+    }
+
+
+def test_create_config_duplicate_name(temp_db):
+    assert client.post("/configs", json=make_config("one")).status_code == 200
+    response = client.post("/configs", json=make_config("one"))
+    assert response.status_code == 400
+    assert client.get("/configs/one").json()["rotors"] == ["III", "II", "I"]
+
+
+def test_bulk_import(temp_db):
+    configs = [make_config(f"c{i}", reflector="BC"[i % 2]) for i in range(2000)]
+    response = client.post("/configs/bulk", json={"configs": configs})
+    assert response.json() == {"created": 2000}
+
+    # Импорт с занятым именем отменяется целиком
+    conflict = client.post("/configs/bulk", json={"configs": [make_config("new"), make_config("c5")]})
+    assert conflict.status_code == 400
+    assert "c5" in conflict.json()["detail"]
+    assert client.get("/configs/new").status_code == 404
+
+    skipped = client.post(
+        "/configs/bulk",
+        json={"configs": [make_config("new"), make_config("c5")], "skip_existing": True},
+    )
+    assert skipped.json() == {"created": 1}
+
+    duplicate = client.post("/configs/bulk", json={"configs": [make_config("x"), make_config("x")]})
+    assert duplicate.status_code == 400
+
+
+def test_list_configs_pagination_and_filters(temp_db):
+    configs = [make_config(f"c{i}", rotors=("I", "II", "III") if i % 3 == 0 else ("III", "II", "I"),
+                           reflector="BC"[i % 2]) for i in range(25)]
+    client.post("/configs/bulk", json={"configs": configs})
+
+    names, after_id = [], 0
+    while after_id is not None:
+        page = client.get("/configs", params={"after_id": after_id, "limit": 10}).json()
+        names += [item["name"] for item in page["items"]]
+        after_id = page["next_after_id"]
+    assert names == [f"c{i}" for i in range(25)]
+
+    page = client.get("/configs", params={"rotors": "I,II,III", "reflector": "C"}).json()
+    assert [item["name"] for item in page["items"]] == [f"c{i}" for i in (3, 9, 15, 21)]
+    assert page["next_after_id"] is None
+
+    page = client.get("/configs", params={"reflector": "B", "limit": 2}).json()
+    assert [item["name"] for item in page["items"]] == ["c0", "c2"]
+
+
+def test_list_configs_uses_indexes(temp_db):
+    with temp_db.connect() as conn:
+        plan = " ".join(str(row[-1]) for row in conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM enigma_configs "
+            "WHERE rotor_order = 'I,II,III' AND reflector = 'B' AND id > 0 ORDER BY id LIMIT 10"
+        )))
+    assert "ix_enigma_configs_rotor_order_reflector_id" in plan
+    assert "TEMP B-TREE" not in plan
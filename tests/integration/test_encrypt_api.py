@@ -1,4 +1,10 @@
+import asyncio
+import json
+
+import pytest
 from fastapi.testclient import TestClient
+
+from enigma.cache import machine_cache
 from enigma.main import app
 
 client = TestClient(app)
@@ -20,4 +26,234 @@ def test_enigma_encrypt():
 
     # Проверки
     assert response.status_code == 200
-    assert "encrypted_text" in response.json()
\ No newline at end of file
+    assert "encrypted_text" in response.json()
+
+def test_enigma_encrypt_with_offset():
+    test_data = {
+        "rotors": ["III", "II", "I"],
+        "reflector": "B",
+        "ring_settings": [0, 0, 0],
+        "initial_positions": "AAA",
+        "plugboard_pairs": [],
+        "text": "HELLO WORLD",
+    }
+    full = client.post("/ciphers/enigma/encrypt", json=test_data).json()
+
+    # Продолжение шифрования с шестой буквы
+    response = client.post(
+        "/ciphers/enigma/encrypt",
+        json={**test_data, "text": "WORLD", "offset": 5},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["encrypted_text"] == full["encrypted_text"][6:]
+
+
+def test_enigma_encrypt_parallel_matches_sequential():
+    test_data = {
+        "rotors": ["III", "II", "I"],
+        "reflector": "B",
+        "ring_settings": [0, 0, 0],
+        "initial_positions": "AAA",
+        "plugboard_pairs": [],
+        "text": "HELLO WORLD",
+    }
+    sequential = client.post("/ciphers/enigma/encrypt", json=test_data).json()
+    parallel = client.post("/ciphers/enigma/encrypt", json={**test_data, "parallel": True}).json()
+
+    assert parallel == sequential
+
+
+def test_enigma_encrypt_stream():
+    config = {
+        "rotors": ["III", "II", "I"],
+        "reflector": "B",
+        "ring_settings": [0, 0, 0],
+        "initial_positions": "AAA",
+        "plugboard_pairs": [["A", "B"]],
+    }
+    text = "Привет, WORLD! " * 10000
+    expected = client.post("/ciphers/enigma/encrypt", json={**config, "text": text}).json()
+
+    def body():
+        data = text.encode()
+        # Части режут многобайтовые символы UTF-8
+        for i in range(0, len(data), 4097):
+            yield data[i:i + 4097]
+
+    response = client.post(
+        "/ciphers/enigma/encrypt/stream",
+        content=body(),
+        headers={"X-Enigma-Config": json.dumps(config)},
+    )
+
+    assert response.status_code == 200
+    assert response.text == expected["encrypted_text"]
+
+
+STREAM_CONFIG = {
+    "rotors": ["III", "II", "I"],
+    "reflector": "B",
+    "ring_settings": [0, 0, 0],
+    "initial_positions": "AAA",
+    "plugboard_pairs": [],
+}
+
+
+def test_enigma_encrypt_stream_invalid_utf8():
+    # Ошибка в начале тела: ответ еще не начат, клиент получает 400
+    response = client.post(
+        "/ciphers/enigma/encrypt/stream",
+        content=b"HELLO \xff WORLD",
+        headers={"X-Enigma-Config": json.dumps(STREAM_CONFIG)},
+    )
+    assert response.status_code == 400
+    assert "Invalid UTF-8" in response.json()["detail"]
+
+
+def run_stream(chunks: list, extensions: dict) -> list:
+    """Прямой вызов потокового ответа с телом из нескольких частей"""
+    from enigma.ciphers.enigma import setup_enigma
+    from enigma.ciphers.enigma.configs import EnigmaConfig
+    from enigma.routers.enigma import EncryptStreamResponse
+
+    response = EncryptStreamResponse(setup_enigma(EnigmaConfig(**STREAM_CONFIG)))
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(response({"type": "http", "extensions": extensions}, receive, send))
+    return sent
+
+
+def test_enigma_encrypt_stream_error_trailer():
+    sent = run_stream([b"HELLO ", b"\xff WORLD"], {"http.response.trailers": {}})
+    assert sent[0]["status"] == 200 and sent[0]["trailers"]
+    assert sent[-1]["type"] == "http.response.trailers"
+    assert dict(sent[-1]["headers"])[b"x-stream-error"].startswith(b"Invalid UTF-8")
+
+    # Без поддержки трейлеров поток обрывается исключением, а не завершается как успешный
+    with pytest.raises(UnicodeDecodeError):
+        run_stream([b"HELLO ", b"\xff WORLD"], {})
+
+    sent = run_stream([b"HELLO ", b"WORLD"], {"http.response.trailers": {}})
+    assert sent[-1] == {"type": "http.response.trailers", "headers": [], "more_trailers": False}
+
+
+def test_enigma_encrypt_stream_requires_config():
+    response = client.post("/ciphers/enigma/encrypt/stream", content=b"HELLO")
+    assert response.status_code == 400
+
+
+def test_enigma_encrypt_from_db_missing_config(temp_db):
+    response = client.post(
+        "/ciphers/enigma/encrypt/from_db",
+        json={"text": "HELLO", "config_name": "no-such-config"},
+    )
+    assert response.status_code == 404
+
+
+def test_enigma_encrypt_batch():
+    config = {
+        "rotors": ["III", "II", "I"],
+        "reflector": "B",
+        "ring_settings": [0, 0, 0],
+        "initial_positions": "AAA",
+        "plugboard_pairs": [],
+    }
+    other = {**config, "initial_positions": "QEV"}
+    items = [
+        {"text": "HELLO", "config": config},
+        {"text": "WORLD", "config": other},
+        {"text": "HELLO WORLD", "config": config, "offset": 3},
+    ]
+
+    response = client.post("/ciphers/enigma/encrypt/batch", json={"items": items})
+
+    assert response.status_code == 200
+    expected = [
+        client.post("/ciphers/enigma/encrypt", json={**item["config"], **item}).json()
+        for item in items
+    ]
+    assert response.json()["results"] == expected
+
+
+def test_enigma_encrypt_batch_missing_config(temp_db):
+    response = client.post(
+        "/ciphers/enigma/encrypt/batch",
+        json={"items": [{"text": "HELLO", "config_name": "no-such-config"}]},
+    )
+    assert response.status_code == 404
+
+
+def test_enigma_encrypt_from_db_uses_cache(temp_db):
+    machine_cache.clear()
+    try:
+        config = {
+            "name": "cached",
+            "rotors": ["III", "II", "I"],
+            "reflector": "B",
+            "ring_settings": [0, 0, 0],
+            "initial_positions": "AAA",
+            "plugboard_pairs": [],
+        }
+        assert client.post("/configs", json=config).status_code == 200
+
+        request = {"text": "HELLO", "config_name": "cached"}
+        first = client.post("/ciphers/enigma/encrypt/from_db", json=request).json()
+        second = client.post("/ciphers/enigma/encrypt/from_db", json=request).json()
+        inline = client.post("/ciphers/enigma/encrypt", json={**config, "text": "HELLO"}).json()
+
+        assert first == second == inline
+        stats = client.get("/ciphers/enigma/cache").json()
+        assert stats["hits"] >= 1 and stats["size"] == 1
+    finally:
+        machine_cache.clear()
+
+
+def test_metrics_endpoint():
+    client.post("/ciphers/enigma/encrypt", json={
+        "rotors": ["III", "II", "I"],
+        "reflector": "B",
+        "ring_settings": [0, 0, 0],
+        "initial_positions": "AAA",
+        "plugboard_pairs": [],
+        "text": "HELLO",
+    })
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/ciphers/enigma/encrypt",status="200"}' in body
+    for stage in ("validation", "endpoint", "serialization"):
+        assert f'route="/ciphers/enigma/encrypt",stage="{stage}"' in body
+    assert 'cipher_stage_duration_seconds_count{stage="encrypt"}' in body
+    assert 'cipher_characters_total{cipher="enigma"}' in body
+    assert 'cache_requests_total{cache="enigma_machines",result="hit"}' in body
+
+
+def test_enigma_encrypt_result_cache(temp_db):
+    request = {
+        "rotors": ["III", "II", "I"],
+        "reflector": "B",
+        "ring_settings": [1, 2, 3],
+        "initial_positions": "QEV",
+        "plugboard_pairs": [["A", "B"]],
+        "text": "REPEATED MESSAGE",
+    }
+    first = client.post("/ciphers/enigma/encrypt", json=request).json()
+    second = client.post("/ciphers/enigma/encrypt", json=request).json()
+    shifted = client.post("/ciphers/enigma/encrypt", json={**request, "offset": 1}).json()
+
+    assert first == second != shifted
+    stats = client.get("/ciphers/enigma/cache/results").json()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["bytes_saved"] > 0
@@ -0,0 +1,95 @@
+from fastapi.testclient import TestClient
+
+from enigma.main import app
+
+client = TestClient(app)
+
+
+def test_jefferson_encrypt_decrypt(temp_db):
+    encrypted = client.post(
+        "/ciphers/jefferson/encrypt",
+        json={"num_disks": 12, "key_row": 5, "text": "Hello, World!"},
+    )
+    assert encrypted.status_code == 200
+    body = encrypted.json()
+
+    decrypted = client.post(
+        "/ciphers/jefferson/decrypt",
+        json={"text": body["encrypted_text"], "decrypt_id": body["encrypt_id"]},
+    )
+    assert decrypted.status_code == 200
+    assert decrypted.json()["decrypted_text"] == "HELLO, WORLD!"
+
+
+def test_jefferson_decrypt_unknown_id(temp_db):
+    response = client.post("/ciphers/jefferson/decrypt", json={"text": "ABC", "decrypt_id": 999})
+    assert response.status_code == 404
+
+
+def test_jefferson_decrypt_batch(temp_db):
+    texts = ["Hello, World!", "Attack at dawn", "Привет, Jefferson"]
+    items = []
+    for i, text in enumerate(texts):
+        body = client.post(
+            "/ciphers/jefferson/encrypt",
+            json={"num_disks": 10 + i, "key_row": 0, "text": text},
+        ).json()
+        items.append({"text": body["encrypted_text"], "decrypt_id": body["encrypt_id"]})
+
+    response = client.post("/ciphers/jefferson/decrypt/batch", json={"items": items})
+    assert response.status_code == 200
+    assert [r["decrypted_text"] for r in response.json()["results"]] == [t.upper() for t in texts]
+
+    missing = client.post(
+        "/ciphers/jefferson/decrypt/batch",
+        json={"items": items + [{"text": "ABC", "decrypt_id": 999}]},
+    )
+    assert missing.status_code == 404
+    assert "999" in missing.json()["detail"]
+
+
+def test_jefferson_pool_stats(temp_db):
+    client.post("/ciphers/jefferson/encrypt", json={"num_disks": 36, "key_row": 0, "text": "ABC"})
+    stats = client.get("/ciphers/jefferson/pool").json()
+    assert "36" in stats["sizes"]
+    assert stats["hits"] + stats["misses"] >= 1
+
+
+def test_jefferson_stream(temp_db):
+    text = "Привет, Jefferson! " * 5000
+    data = text.encode()
+
+    def body(data):
+        # Части режут многобайтовые символы UTF-8
+        for i in range(0, len(data), 4097):
+            yield data[i:i + 4097]
+
+    encrypted = client.post(
+        "/ciphers/jefferson/encrypt/stream",
+        params={"num_disks": 36, "key_row": 0},
+        content=body(data),
+    )
+    assert encrypted.status_code == 200
+    encrypt_id = int(encrypted.headers["x-encrypt-id"])
+
+    decrypted = client.post(
+        "/ciphers/jefferson/decrypt/stream",
+        params={"decrypt_id": encrypt_id},
+        content=body(encrypted.content),
+    )
+    assert decrypted.text == text.upper()
+
+    # Продолжение с середины сообщения
+    tail = client.post(
+        "/ciphers/jefferson/decrypt/stream",
+        params={"decrypt_id": encrypt_id, "offset": 1000},
+        content=encrypted.text[1000:].encode(),
+    )
+    assert tail.text == text.upper()[1000:]
+
+    invalid = client.post(
+        "/ciphers/jefferson/decrypt/stream",
+        params={"decrypt_id": encrypt_id},
+        content="Привет".encode()[:-1],
+    )
+    assert invalid.status_code == 400
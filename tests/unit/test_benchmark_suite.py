@@ -0,0 +1,33 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks import suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_report_and_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "results.json"
+            args = ["--filter", "enigma.step", "jefferson.throughput.1KB", "--repeat", "2", "--min-time", "0"]
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(suite.main(args + ["--output", str(output)]), 0)
+            report = json.loads(output.read_text())
+            self.assertEqual(set(report["results"]), {"enigma.step", "jefferson.throughput.1KB"})
+            self.assertEqual(report["results"]["jefferson.throughput.1KB"]["size"], 1024)
+
+            # Базовый прогон в 1000 раз быстрее: все замеры - регрессии
+            for result in report["results"].values():
+                result["median"] /= 1000
+            baseline = Path(directory) / "baseline.json"
+            baseline.write_text(json.dumps(report))
+            with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                self.assertEqual(suite.main(args + ["--baseline", str(baseline)]), 1)
+            self.assertIn("РЕГРЕССИЯ", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+
+from enigma.ciphers.ascii import BYTE_CLASS, DROP, ERROR, NON_ASCII, OTHER
+from enigma.ciphers.enigma import setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.ciphers.enigma.vectorized import BULK_THRESHOLD
+from enigma.ciphers.jefferson.main import JeffersonCipher
+
+
+class TestByteClass(unittest.TestCase):
+    def test_classes(self):
+        self.assertEqual(len(BYTE_CLASS), 256)
+        self.assertEqual(BYTE_CLASS[ord('A')], 0)
+        self.assertEqual(BYTE_CLASS[ord('z')], 25)
+        self.assertEqual(BYTE_CLASS[ord('@')], OTHER)
+        self.assertEqual(BYTE_CLASS[ord(' ')], OTHER)
+        # 0xC1 & 0xDF == 'A', но это байт вне ASCII
+        self.assertEqual(BYTE_CLASS[0xC1], NON_ASCII)
+        self.assertEqual(BYTE_CLASS[0xE1], NON_ASCII)
+
+
+class TestEnigmaBytes(unittest.TestCase):
+    def setUp(self):
+        self.config = EnigmaConfig(
+            rotors=["III", "II", "I"],
+            reflector="B",
+            ring_settings=[1, 2, 3],
+            initial_positions="ABC",
+            plugboard_pairs=[["A", "B"], ["C", "D"]],
+        )
+
+    def test_matches_str_path(self):
+        text = "Hello, World! 123"
+        expected = setup_enigma(self.config).encrypt(text).encode("ascii")
+        for data in (text.encode(), bytearray(text.encode()), memoryview(text.encode())):
+            self.assertEqual(bytes(setup_enigma(self.config).encrypt_bytes(data)), expected)
+
+    def test_bulk_matches_str_path(self):
+        text = "The quick brown fox jumps over the lazy dog. " * (BULK_THRESHOLD // 45 + 1)
+        expected = setup_enigma(self.config).encrypt(text).encode("ascii")
+        self.assertEqual(bytes(setup_enigma(self.config).encrypt_bytes(text.encode())), expected)
+
+    def test_output_buffer(self):
+        data = b"ATTACK AT DAWN"
+        out = bytearray(32)
+        result = setup_enigma(self.config).encrypt_bytes(data, out)
+        self.assertEqual(len(result), len(data))
+        self.assertEqual(bytes(out[:len(data)]), bytes(result))
+        self.assertEqual(bytes(setup_enigma(self.config).decrypt_bytes(result)), data)
+
+    def test_in_place(self):
+        data = bytearray(b"ATTACK AT DAWN")
+        expected = bytes(setup_enigma(self.config).encrypt_bytes(bytes(data)))
+        setup_enigma(self.config).encrypt_bytes(data, data)
+        self.assertEqual(bytes(data), expected)
+
+    def test_small_buffer(self):
+        with self.assertRaises(ValueError):
+            setup_enigma(self.config).encrypt_bytes(b"HELLO", bytearray(3))
+        with self.assertRaises(ValueError):
+            setup_enigma(self.config).encrypt_bytes(b"HELLO", b"12345")
+
+    def test_non_latin_keep(self):
+        # Кириллица не шифруется и не поворачивает роторы
+        data = "Привет WORLD".encode("utf-8")
+        result = bytes(setup_enigma(self.config).encrypt_bytes(data))
+        expected = setup_enigma(self.config).encrypt(" WORLD").encode("ascii")
+        self.assertEqual(result, "Привет".encode("utf-8") + expected)
+
+    def test_non_latin_drop(self):
+        data = "Привет WORLD".encode("utf-8")
+        result = bytes(setup_enigma(self.config).encrypt_bytes(data, non_latin=DROP))
+        self.assertEqual(result, setup_enigma(self.config).encrypt(" WORLD").encode("ascii"))
+
+    def test_non_latin_error(self):
+        with self.assertRaises(ValueError):
+            setup_enigma(self.config).encrypt_bytes("WORLD ä".encode("utf-8"), non_latin=ERROR)
+        with self.assertRaises(ValueError):
+            setup_enigma(self.config).encrypt_bytes(b"WORLD", non_latin="ignore")
+
+
+class TestJeffersonBytes(unittest.TestCase):
+    def setUp(self):
+        self.cipher = JeffersonCipher(num_disks=5, disk_order=[2, 0, 4, 1, 3])
+
+    def test_matches_str_path(self):
+        text = "Hello, World"
+        result = self.cipher.encrypt_bytes(memoryview(text.encode()))
+        self.assertEqual(bytes(result), self.cipher.encrypt(text, 0).encode("ascii"))
+        self.assertEqual(bytes(self.cipher.decrypt_bytes(result)), text.upper().encode("ascii"))
+
+    def test_position_and_buffer(self):
+        data = b"HELLOWORLD"
+        out = bytearray(len(data))
+        self.cipher.encrypt_bytes(data[:4], memoryview(out)[:4])
+        self.cipher.encrypt_bytes(data[4:], memoryview(out)[4:], position=4)
+        self.assertEqual(bytes(out), bytes(self.cipher.encrypt_bytes(data)))
+
+    def test_non_latin(self):
+        data = "Да AB".encode("utf-8")
+        kept = bytes(self.cipher.encrypt_bytes(data))
+        self.assertEqual(kept[:4], "Да".encode("utf-8"))
+        dropped = bytes(self.cipher.encrypt_bytes(data, non_latin=DROP))
+        self.assertEqual(dropped, bytes(self.cipher.encrypt_bytes(b" AB")))
+        with self.assertRaises(ValueError):
+            self.cipher.encrypt_bytes(data, non_latin=ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
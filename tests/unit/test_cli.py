@@ -0,0 +1,102 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from enigma import cli
+from enigma.ciphers.enigma import setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.ciphers.enigma.main import EnigmaMachine
+from enigma.ciphers.jefferson.main import JeffersonCipher
+
+
+class TestFileCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.config = EnigmaConfig(
+            rotors=["II", "I", "III"],
+            reflector="B",
+            ring_settings=[5, 0, 17],
+            initial_positions="MCK",
+            plugboard_pairs=[["A", "M"], ["T", "K"]],
+        )
+        random.seed(0)
+        self.cipher = JeffersonCipher(num_disks=11)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, text: str) -> str:
+        path = self.path / "input.txt"
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def output(self) -> str:
+        return (self.path / "output.txt").read_text(encoding="utf-8")
+
+    def test_enigma_file(self):
+        rng = random.Random(3)
+        for alphabet in ("ABCxyz ,.\n", "ABCxyz ЖЯ!"):
+            text = ''.join(rng.choices(alphabet, k=20000))
+            expected_machine = setup_enigma(self.config)
+            expected_machine.advance(5)
+
+            cli.encrypt_enigma_file(self.config, self.write(text), str(self.path / "output.txt"), offset=5)
+            self.assertEqual(self.output(), expected_machine.encrypt(text))
+
+    def test_enigma_file_parallel(self):
+        text = ''.join(random.Random(4).choices("ABCxyz ,.\n", k=20000))
+        with mock.patch.object(cli, "PARALLEL_MIN_SEGMENT", 3000):
+            cli.encrypt_enigma_file(self.config, self.write(text), str(self.path / "output.txt"), workers=4)
+        self.assertEqual(self.output(), setup_enigma(self.config).encrypt(text))
+
+    def test_enigma_file_without_tables(self):
+        # Машина без табличного пути шифрует файл эталонным путем
+        text = ''.join(random.Random(6).choices("ABCxyz ,.\n", k=20000))
+        expected = setup_enigma(self.config).encrypt(text)
+        with mock.patch.object(EnigmaMachine, "_has_fast_path", return_value=False), \
+                mock.patch("enigma.ciphers.enigma.main.get_tables", side_effect=AssertionError):
+            cli.encrypt_enigma_file(self.config, self.write(text), str(self.path / "output.txt"))
+        self.assertEqual(self.output(), expected)
+
+    def test_jefferson_file_round_trip(self):
+        rng = random.Random(5)
+        for alphabet in ("ABCxyz ,.\n", "ABCxyz ЖЯß!"):
+            text = ''.join(rng.choices(alphabet, k=20000))
+            source = self.write(text)
+            encrypted = str(self.path / "encrypted.txt")
+            cli.translate_jefferson_file(self.cipher, source, encrypted, decrypt=False)
+            self.assertEqual(Path(encrypted).read_text(encoding="utf-8"), self.cipher.encrypt(text, key_row=0))
+
+            cli.translate_jefferson_file(self.cipher, encrypted, str(self.path / "output.txt"), decrypt=True)
+            self.assertEqual(self.output(), text.upper())
+
+    def test_jefferson_file_parallel(self):
+        text = ''.join(random.Random(6).choices("ABCxyz ,.\n", k=20000))
+        with mock.patch.object(cli, "PARALLEL_MIN_SEGMENT", 3000):
+            cli.translate_jefferson_file(
+                self.cipher, self.write(text), str(self.path / "output.txt"), decrypt=False, offset=3, workers=4
+            )
+        expected = self.cipher._translate(text, decrypt=False, position=3)
+        self.assertEqual(self.output(), expected)
+
+    def test_empty_file(self):
+        cli.encrypt_enigma_file(self.config, self.write(""), str(self.path / "output.txt"))
+        self.assertEqual(self.output(), "")
+
+    def test_inline_config_parser(self):
+        args = cli.create_parser().parse_args(
+            ["jefferson", "decrypt", "in.txt", "out.txt", "--encrypt-id", "3", "--parallel"]
+        )
+        self.assertEqual((args.command, args.encrypt_id, args.parallel), ("decrypt", 3, True))
+
+    def test_migrate(self):
+        with mock.patch("enigma.db.init_db") as init_db:
+            cli.main(["migrate"])
+        init_db.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
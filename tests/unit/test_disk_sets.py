@@ -0,0 +1,57 @@
+import unittest
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from enigma.ciphers.jefferson.main import generate_key
+from enigma.ciphers.jefferson.storage import encode_disks
+from enigma.db import Base, DBJeffersonDiskSet
+from enigma.disksets import DiskSetStore
+from enigma.keypool import JeffersonKeyPool
+
+
+class TestDiskSetStore(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(bind=engine)
+        self.store = DiskSetStore(self.Session)
+
+    def count(self):
+        with self.Session() as db:
+            return db.scalar(select(func.count()).select_from(DBJeffersonDiskSet))
+
+    def test_same_disks_stored_once(self):
+        blob = encode_disks(generate_key(10)[0])
+        first = self.store.store(blob)
+        self.assertEqual(self.store.find(blob), first)
+
+        # Другой процесс с пустым кэшем получает тот же набор
+        other = DiskSetStore(self.Session)
+        self.assertEqual(other.store(blob), first)
+        self.assertEqual(self.count(), 1)
+
+    def test_load_from_db(self):
+        disks = generate_key(5)[0]
+        disk_set_id = self.store.store(encode_disks(disks))
+        self.store.clear()
+        self.assertIsNone(self.store.get(disk_set_id))
+        self.assertEqual(self.store.load(disk_set_id), [''.join(disk) for disk in disks])
+        self.assertIsNotNone(self.store.get(disk_set_id))
+        self.assertIsNone(self.store.load(disk_set_id + 1))
+
+    def test_pool_reuses_disk_sets(self):
+        pool = JeffersonKeyPool(sizes=(), disk_set_uses=3)
+        keys = [pool._generate(8) for _ in range(6)]
+        self.assertEqual(len({encode_disks(disks) for disks, _ in keys}), 2)
+        for _, disk_order in keys:
+            self.assertEqual(sorted(disk_order), list(range(8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from enigma.ciphers.enigma import setup_enigma
+from enigma.ciphers.enigma.analysis import search_ciphertext, search_crib
+from enigma.ciphers.enigma.analysis.core import (
+    core_table, decrypt_rows, letter_indexes, notches, substitution_rows,
+)
+from enigma.ciphers.enigma.analysis.hillclimb import climb_plugboard
+from enigma.ciphers.enigma.analysis.menu import Menu, crib_positions, scan_menu
+from enigma.ciphers.enigma.analysis.search import scan_ciphertext, scan_crib
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.ciphers.enigma.stepping import positions_after
+from enigma.ciphers.enigma.tables import state_index
+
+PLAINTEXT = "".join(char for char in (
+    "It was the best of times it was the worst of times it was the age of wisdom it was the age of "
+    "foolishness it was the epoch of belief it was the epoch of incredulity it was the season of light "
+    "it was the season of darkness it was the spring of hope it was the winter of despair we had everything "
+    "before us we had nothing before us we were all going direct to heaven we were all going direct the other "
+    "way in short the period was so far like the present period that some of its noisiest authorities insisted "
+    "on its being received for good or for evil in the superlative degree of comparison only"
+).upper() if char.isalpha())
+
+CONFIG = EnigmaConfig(
+    rotors=["II", "I", "III"],
+    reflector="B",
+    ring_settings=[3, 7, 0],
+    initial_positions="QDX",
+    plugboard_pairs=[["A", "R"], ["G", "K"], ["O", "X"], ["E", "J"], ["M", "Q"], ["T", "Y"]],
+)
+ROTORS = tuple(CONFIG.rotors)
+START = state_index([ord(char) - ord('A') for char in CONFIG.initial_positions])
+
+
+class TestEnigmaAnalysis(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ciphertext = setup_enigma(CONFIG).encrypt(PLAINTEXT)
+        cls.cipher = letter_indexes(cls.ciphertext)
+        cls.core = core_table(ROTORS, CONFIG.reflector)
+
+    def test_decrypt_rows_matches_machine(self):
+        plugboard = np.arange(26)
+        for a, b in CONFIG.plugboard_pairs:
+            plugboard[ord(a) - ord('A')], plugboard[ord(b) - ord('A')] = ord(b) - ord('A'), ord(a) - ord('A')
+        rows = decrypt_rows(
+            self.core, notches(ROTORS), np.array([START, 0]), tuple(CONFIG.ring_settings), self.cipher, plugboard
+        )
+        self.assertEqual("".join(chr(c + ord('A')) for c in rows[0]), PLAINTEXT)
+
+    def test_climb_plugboard(self):
+        rows = substitution_rows(self.core, notches(ROTORS), START, CONFIG.ring_settings, len(self.cipher))
+        plugboard, _ = climb_plugboard(rows, self.cipher)
+        pairs = {tuple(sorted((ord(a), ord(b)))) for a, b in CONFIG.plugboard_pairs}
+        found = {(a + ord('A'), int(b) + ord('A')) for a, b in enumerate(plugboard) if a < b}
+        self.assertEqual(found, pairs)
+
+    def test_menu_stops_at_true_offsets(self):
+        position, crib = 40, letter_indexes(PLAINTEXT[40:65])
+        self.assertIn(position, crib_positions(self.cipher, crib))
+        menu = Menu(crib, self.cipher[position:position + len(crib)])
+        self.assertGreater(menu.loops, 0)
+
+        right, middle, left = positions_after([16, 3, 23], notches(ROTORS), position + 1)
+        offsets = state_index([(right - 3) % 26, (middle - 7) % 26, left])
+        states, _ = scan_menu(self.core, menu)
+        self.assertIn(offsets, states.tolist())
+
+    def test_scan_crib(self):
+        crib = letter_indexes(PLAINTEXT[:20])
+        candidates, _, complete = scan_crib(ROTORS, CONFIG.reflector, self.cipher, crib, 0)
+        self.assertTrue(complete)
+        self.assertEqual(setup_enigma(candidates[0].config()).encrypt(self.ciphertext), PLAINTEXT)
+
+    def test_scan_ciphertext(self):
+        candidates, evaluated, _ = scan_ciphertext(ROTORS, CONFIG.reflector, self.cipher, climb=1)
+        self.assertGreaterEqual(evaluated, 26 ** 3)
+        self.assertEqual(setup_enigma(candidates[0].config()).encrypt(self.ciphertext), PLAINTEXT)
+
+    def test_time_budget(self):
+        reports = []
+        report = search_ciphertext(self.ciphertext, workers=1, time_budget=0, progress=reports.append)
+        self.assertFalse(report.complete)
+        self.assertEqual(report.done, 12)
+        self.assertEqual(len(reports), 12)
+
+    def test_crib_must_fit(self):
+        with self.assertRaises(ValueError):
+            # Энигма не шифрует букву в саму себя
+            search_crib(self.ciphertext, self.ciphertext[:10], position=0, workers=1)
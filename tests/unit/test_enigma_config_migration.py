@@ -0,0 +1,30 @@
+import json
+import unittest
+
+from sqlalchemy import create_engine, text
+
+from enigma.db import migrate_enigma_config_indexes
+
+
+class TestEnigmaConfigMigration(unittest.TestCase):
+    def test_rotor_order_and_indexes(self):
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            # Таблица в формате до появления rotor_order
+            conn.execute(text(
+                "CREATE TABLE enigma_configs (id INTEGER PRIMARY KEY, name VARCHAR UNIQUE, rotors JSON, "
+                "reflector VARCHAR, ring_settings JSON, initial_positions VARCHAR, plugboard_pairs JSON)"
+            ))
+            conn.execute(
+                text("INSERT INTO enigma_configs (id, name, rotors, reflector) VALUES (1, 'a', :rotors, 'B')"),
+                {"rotors": json.dumps(["I", "II", "III"])},
+            )
+
+        migrate_enigma_config_indexes(engine)
+        migrate_enigma_config_indexes(engine)
+
+        with engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT rotor_order FROM enigma_configs")).scalar(), "I,II,III")
+            indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(enigma_configs)"))}
+        self.assertIn("ix_enigma_configs_rotor_order_reflector_id", indexes)
+        self.assertIn("ix_enigma_configs_reflector_id", indexes)
@@ -0,0 +1,57 @@
+import random
+import threading
+import time
+import unittest
+from unittest import mock
+
+from enigma.ciphers.enigma import encrypt_parallel, main, setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+
+
+class TestEnigmaParallel(unittest.TestCase):
+    def setUp(self):
+        self.config = EnigmaConfig(
+            rotors=["I", "II", "III"],
+            reflector="C",
+            ring_settings=[2, 4, 6],
+            initial_positions="XYZ",
+            plugboard_pairs=[["A", "M"], ["T", "K"]],
+        )
+
+    def test_matches_sequential(self):
+        rng = random.Random(2)
+        for alphabet in ("ABCDEFGHIJKLMNOPQRSTUVWXYZ ,.", "ABCabc ЖЯ!"):
+            text = ''.join(rng.choices(alphabet, k=30000))
+            expected_machine = setup_enigma(self.config)
+            expected_machine.advance(7)
+            expected = expected_machine.encrypt(text)
+
+            with mock.patch.object(main, "PARALLEL_MIN_SEGMENT", 1000):
+                result = encrypt_parallel(self.config, text, offset=7, workers=4)
+            self.assertEqual(result, expected)
+
+    def test_short_text_stays_in_process(self):
+        with mock.patch.object(main, "_get_executor") as get_executor:
+            result = encrypt_parallel(self.config, "HELLO", workers=4)
+        get_executor.assert_not_called()
+        self.assertEqual(result, setup_enigma(self.config).encrypt("HELLO"))
+
+    def test_executor_created_once(self):
+        def slow_pool(**kwargs):
+            # Медленное создание пула расширяет окно гонки
+            time.sleep(0.01)
+            return mock.Mock()
+
+        main.shutdown_executor()
+        results = []
+        with mock.patch.object(main, "ProcessPoolExecutor", side_effect=slow_pool) as pool:
+            threads = [threading.Thread(target=lambda: results.append(main._get_executor())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            executor = main._get_executor()
+            main.shutdown_executor()
+        self.assertEqual(pool.call_count, 1)
+        self.assertTrue(all(result is executor for result in results))
+        executor.shutdown.assert_called_once()
@@ -0,0 +1,61 @@
+import unittest
+
+from enigma.ciphers.enigma import setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.ciphers.enigma.main import Rotor
+from enigma.ciphers.enigma.pool import MachinePool
+
+
+class TestMachinePool(unittest.TestCase):
+    def setUp(self):
+        self.config = EnigmaConfig(
+            rotors=["III", "II", "I"],
+            reflector="B",
+            ring_settings=[1, 2, 3],
+            initial_positions="ABC",
+            plugboard_pairs=[["A", "B"], ["C", "D"]],
+        )
+        self.text = "HELLO WORLD"
+        self.expected = setup_enigma(self.config).encrypt(self.text)
+
+    def test_snapshot_restore(self):
+        enigma = setup_enigma(self.config)
+        start = enigma.snapshot()
+        first = enigma.encrypt(self.text)
+        self.assertNotEqual(enigma.snapshot(), start)
+        enigma.restore(start)
+        self.assertEqual(enigma.snapshot(), start)
+        self.assertEqual(enigma.encrypt(self.text), first)
+
+    def test_machine_reused_from_start_state(self):
+        pool = MachinePool(setup_enigma(self.config))
+        with pool.machine() as enigma:
+            self.assertEqual(enigma.encrypt(self.text), self.expected)
+        with pool.machine() as reused:
+            self.assertIs(reused, enigma)
+            self.assertEqual(reused.encrypt(self.text), self.expected)
+        self.assertEqual(pool.stats(), {"idle": 1, "created": 1, "reused": 1})
+
+    def test_pool_keeps_template_state(self):
+        template = setup_enigma(self.config)
+        pool = MachinePool(template)
+        with pool.machine() as enigma:
+            enigma.encrypt(self.text)
+        self.assertIsNot(enigma, template)
+        self.assertEqual(template.snapshot(), pool.start)
+
+    def test_max_idle(self):
+        pool = MachinePool(setup_enigma(self.config), max_idle=1)
+        machines = [pool.acquire() for _ in range(3)]
+        for machine in machines:
+            pool.release(machine)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_rotor_has_slots(self):
+        rotor = setup_enigma(self.config).rotors[0]
+        self.assertIsInstance(rotor, Rotor)
+        self.assertFalse(hasattr(rotor, "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from enigma.ciphers.enigma import setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.ciphers.enigma.stepping import positions_after
+
+
+class TestEnigmaStepping(unittest.TestCase):
+    def simulate(self, positions, notches, steps):
+        enigma = setup_enigma(self.config)
+        for rotor, notch in zip(enigma.rotors, notches):
+            rotor.notch = notch
+        enigma.positions = positions
+        for _ in range(steps):
+            enigma._rotate_rotors()
+        return enigma.positions
+
+    def setUp(self):
+        self.config = EnigmaConfig(
+            rotors=["III", "II", "I"],
+            reflector="B",
+            ring_settings=[0, 0, 0],
+            initial_positions="AAA",
+            plugboard_pairs=[],
+        )
+
+    def test_matches_step_by_step(self):
+        for positions in ([0, 0, 0], [20, 3, 7], [21, 4, 25], [5, 4, 0], [21, 3, 0]):
+            for steps in (0, 1, 2, 25, 26, 27, 650, 651, 16900, 16901, 40000):
+                self.assertEqual(
+                    positions_after(positions, [21, 4, 16], steps),
+                    self.simulate(positions, [21, 4, 16], steps),
+                    (positions, steps),
+                )
+
+    def test_double_step(self):
+        # Средний ротор на выемке: первый шаг двигает средний и левый роторы
+        self.assertEqual(positions_after([0, 4, 0], [21, 4], 1), [1, 5, 1])
+        # Правый ротор встает на выемку, затем средний делает двойной шаг
+        self.assertEqual(positions_after([20, 3, 0], [21, 4], 1), [21, 4, 0])
+        self.assertEqual(positions_after([20, 3, 0], [21, 4], 2), [22, 5, 1])
+
+    def test_advance_then_encrypt(self):
+        text = "ENIGMA MACHINE OFFSET TEST " * 40
+        expected = setup_enigma(self.config).encrypt(text)
+        letters = sum(char.isalpha() for char in text[:500])
+
+        enigma = setup_enigma(self.config)
+        enigma.advance(letters)
+        self.assertEqual(enigma.encrypt(text[500:]), expected[500:])
@@ -0,0 +1,45 @@
+import random
+import unittest
+
+from enigma.ciphers.enigma import setup_enigma
+from enigma.ciphers.enigma.configs import EnigmaConfig
+
+
+def reference_encrypt(enigma, text):
+    return ''.join(enigma._process_char(char) for char in text)
+
+
+class TestEnigmaTables(unittest.TestCase):
+    def setUp(self):
+        self.config = EnigmaConfig(
+            rotors=["I", "III", "II"],
+            reflector="C",
+            ring_settings=[3, 11, 24],
+            initial_positions="QDV",
+            plugboard_pairs=[["A", "Z"], ["q", "W"], ["E", "R"]],
+        )
+
+    def test_matches_reference(self):
+        rng = random.Random(0)
+        text = ''.join(rng.choices("ABCXYZabcxyz .,!\n7ЖЯ", k=5000))
+        expected_machine = setup_enigma(self.config)
+        expected = reference_encrypt(expected_machine, text)
+
+        enigma = setup_enigma(self.config)
+        self.assertEqual(enigma.encrypt(text), expected)
+        # Позиции роторов после шифрования совпадают с эталоном
+        self.assertEqual(
+            [rotor.position for rotor in enigma.rotors],
+            [rotor.position for rotor in expected_machine.rotors],
+        )
+
+    def test_state_continues_between_calls(self):
+        text = "THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG" * 50
+        enigma = setup_enigma(self.config)
+        parts = enigma.encrypt(text[:777]) + enigma.encrypt(text[777:])
+        self.assertEqual(parts, reference_encrypt(setup_enigma(self.config), text))
+
+    def test_tables_are_shared(self):
+        first = setup_enigma(self.config)
+        second = setup_enigma(self.config)
+        self.assertIs(first.tables, second.tables)
@@ -0,0 +1,52 @@
+import random
+import unittest
+from unittest import mock
+
+from enigma.ciphers.enigma import setup_enigma, vectorized
+from enigma.ciphers.enigma.configs import EnigmaConfig
+
+
+class TestEnigmaVectorized(unittest.TestCase):
+    def setUp(self):
+        self.config = EnigmaConfig(
+            rotors=["II", "I", "III"],
+            reflector="B",
+            ring_settings=[5, 0, 17],
+            initial_positions="DEQ",
+            plugboard_pairs=[["P", "O"], ["M", "L"], ["I", "U"]],
+        )
+        rng = random.Random(1)
+        self.text = ''.join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZabcz ,.\n!", k=40000))
+
+    def test_matches_reference(self):
+        expected_machine = setup_enigma(self.config)
+        expected = ''.join(expected_machine._process_char(char) for char in self.text)
+
+        enigma = setup_enigma(self.config)
+        # Маленькие блоки проверяют перенос состояния между блоками
+        with mock.patch.object(vectorized, "BLOCK_SIZE", 4096):
+            self.assertEqual(vectorized.encrypt_bulk(enigma, self.text), expected)
+        self.assertEqual(
+            [rotor.position for rotor in enigma.rotors],
+            [rotor.position for rotor in expected_machine.rotors],
+        )
+
+    def test_stepping_sequence(self):
+        enigma = setup_enigma(self.config)
+        notches = [rotor.notch for rotor in enigma.rotors]
+        initial = enigma.positions
+
+        expected = []
+        for _ in range(20000):
+            enigma._rotate_rotors()
+            expected.append(enigma.positions)
+
+        positions = vectorized.stepping_sequence(initial, notches, 100, 19900)
+        self.assertEqual([list(map(int, p)) for p in zip(*positions)], expected[100:])
+
+    def test_encrypt_uses_bulk_for_large_text(self):
+        enigma = setup_enigma(self.config)
+        text = "A" * vectorized.BULK_THRESHOLD
+        with mock.patch("enigma.ciphers.enigma.main.encrypt_bulk") as encrypt_bulk:
+            enigma.encrypt(text)
+        encrypt_bulk.assert_called_once_with(enigma, text)
@@ -0,0 +1,59 @@
+import random
+import unittest
+from unittest import mock
+
+from enigma.ciphers.jefferson import batch
+from enigma.ciphers.jefferson.batch import decrypt_batch, encrypt_batch
+from enigma.ciphers.jefferson.main import JeffersonCipher
+
+
+class TestJeffersonBatch(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        rng = random.Random(1)
+        self.ciphers = [JeffersonCipher(num_disks=rng.randint(1, 40)) for _ in range(20)]
+        self.texts = [
+            ''.join(rng.choices("ABCxyz .,!", k=rng.randint(0, 300))) for _ in self.ciphers
+        ]
+        self.texts[3] = "Привет, мир! Hello"
+        self.keys = [(cipher.disks, cipher.get_key()) for cipher in self.ciphers]
+
+    def test_matches_single_cipher(self):
+        expected = [cipher._translate(text.upper(), False) for cipher, text in zip(self.ciphers, self.texts)]
+        encrypted = encrypt_batch(self.texts, self.keys)
+        self.assertEqual(encrypted, expected)
+        self.assertEqual(decrypt_batch(encrypted, self.keys), [text.upper() for text in self.texts])
+
+    def test_small_groups(self):
+        expected = encrypt_batch(self.texts, self.keys)
+        limit, batch.BATCH_CELLS = batch.BATCH_CELLS, 500
+        try:
+            self.assertEqual(encrypt_batch(self.texts, self.keys), expected)
+        finally:
+            batch.BATCH_CELLS = limit
+
+    def test_shared_keys_build_tables_once(self):
+        cipher = self.ciphers[0]
+        shared = (cipher.disks, cipher.get_key())
+        same_content = ([list(disk) for disk in cipher.disks], cipher.get_key())
+        texts = ["HELLO", "WORLD", "ABC"]
+        with mock.patch.object(batch, "disk_tables", wraps=batch.disk_tables) as tables:
+            encrypted = encrypt_batch(texts, [shared, shared, same_content])
+        self.assertEqual(tables.call_count, 1)
+        self.assertEqual(encrypted, [cipher._translate(text, False) for text in texts])
+
+    def test_groups_limit_tables(self):
+        # Много коротких сообщений с разными ключами: таблицы ограничены вместе с матрицей
+        lengths = [10] * 2000
+        widths = [36] * 2000
+        groups = batch._groups(lengths, widths, list(range(2000)))
+        for group in groups:
+            self.assertLessEqual(len(group) * (10 + 36 * 256), batch.BATCH_CELLS)
+        self.assertEqual(sum(map(len, groups)), 2000)
+
+        # С общим ключом таблица одна, и группа не дробится
+        self.assertEqual(len(batch._groups(lengths, widths, [0] * 2000)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,6 @@
+import contextlib
+import io
+import logging
 import unittest
 from enigma.ciphers.jefferson.main import JeffersonCipher
 
@@ -51,4 +54,19 @@ class TestJeffersonCipher(unittest.TestCase):
         self.assertEqual(
             self.cipher.encrypt("hello", key_row=0),
             self.cipher.encrypt("HELLO", key_row=0)
-        )
\ No newline at end of file
+        )
+
+    def test_no_stdout_output(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            self.cipher.decrypt(self.cipher.encrypt("HELLO", key_row=0), key_row=0)
+        self.assertEqual(stdout.getvalue(), "")
+
+    def test_debug_logging(self):
+        with self.assertLogs("enigma.ciphers.jefferson.main", level=logging.DEBUG) as logs:
+            self.cipher.encrypt("HELLO", key_row=0)
+        record = logs.records[0]
+        self.assertEqual(record.operation, "encrypt")
+        self.assertEqual(record.text_length, 5)
+        self.assertIn("Disk  0: Z Y X", record.getMessage())
+
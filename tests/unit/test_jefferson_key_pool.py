@@ -0,0 +1,49 @@
+import time
+import unittest
+
+from enigma.ciphers.jefferson.main import JeffersonCipher
+from enigma.keypool import JeffersonKeyPool
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not reached")
+        time.sleep(0.005)
+
+
+class TestJeffersonKeyPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = JeffersonKeyPool(sizes=(5, 12), capacity=8, low_water=2)
+        self.pool.start()
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_refills_in_background(self):
+        wait_for(lambda: self.pool.stats()["sizes"] == {5: 8, 12: 8})
+        for _ in range(7):
+            self.assertIsNotNone(self.pool.take(12))
+        wait_for(lambda: self.pool.stats()["sizes"][12] == 8)
+
+        stats = self.pool.stats()
+        self.assertEqual(stats["hits"], 7)
+        self.assertEqual(stats["generated"], 23)
+
+    def test_unknown_size_misses(self):
+        self.assertIsNone(self.pool.take(7))
+        self.assertEqual(self.pool.stats()["misses"], 1)
+
+    def test_key_works(self):
+        wait_for(lambda: self.pool.stats()["sizes"][5] > 0)
+        disks, disk_order = self.pool.take(5)
+        self.assertEqual(len(disks), 5)
+        self.assertEqual(sorted(disk_order), list(range(5)))
+
+        cipher = JeffersonCipher(5, disks, disk_order)
+        self.assertEqual(cipher.decrypt(cipher.encrypt("HELLO", key_row=0), key_row=0), "HELLO")
+
+
+if __name__ == "__main__":
+    unittest.main()
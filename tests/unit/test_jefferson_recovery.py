@@ -0,0 +1,56 @@
+import unittest
+
+from enigma.ciphers.jefferson.main import JeffersonCipher
+from enigma.ciphers.jefferson.recovery import disk_candidates, recover_disk_order, solve_assignment
+
+TEXT = "Attack at dawn, hold the bridge until the relief column arrives from the north!"
+
+
+class TestJeffersonRecovery(unittest.TestCase):
+    def test_recovers_order(self):
+        cipher = JeffersonCipher(num_disks=36)
+        recovery = recover_disk_order(cipher.disks, TEXT, cipher.encrypt(TEXT, 0))
+        self.assertTrue(recovery.unique)
+        self.assertEqual(recovery.order, cipher.get_key())
+
+    def test_offset_and_long_text(self):
+        cipher = JeffersonCipher(num_disks=20)
+        text = TEXT * 50
+        ciphertext = cipher._translate(text, decrypt=False, position=7)
+        recovery = recover_disk_order(cipher.disks, text, ciphertext, position=7)
+        self.assertEqual(recovery.order, cipher.get_key())
+
+    def test_short_text_is_ambiguous(self):
+        cipher = JeffersonCipher(num_disks=36)
+        recovery = recover_disk_order(cipher.disks, "HELLO", cipher.encrypt("HELLO", 0))
+        self.assertFalse(recovery.unique)
+        self.assertTrue(recovery.ambiguous)
+        # Неоднозначный ключ не выдается за найденный
+        self.assertIsNone(recovery.order)
+        self.assertEqual(len(recovery.solutions), 2)
+        # Позиции с буквами определены, остальные свободны
+        for slot in range(5):
+            self.assertIn(cipher.get_key()[slot], recovery.candidates[slot])
+        self.assertEqual(len(recovery.candidates[10]), 36)
+
+    def test_text_as_long_as_key(self):
+        # Около одной буквы на позицию: порядок либо однозначен, либо не выдается
+        for seed in range(20):
+            cipher = JeffersonCipher(num_disks=36)
+            text = TEXT[seed:seed + 38]
+            recovery = recover_disk_order(cipher.disks, text, cipher.encrypt(text, 0))
+            if recovery.unique:
+                self.assertEqual(recovery.order, cipher.get_key())
+            else:
+                self.assertIsNone(recovery.order)
+                self.assertTrue(recovery.ambiguous)
+
+    def test_inconsistent_pair(self):
+        cipher = JeffersonCipher(num_disks=10)
+        self.assertIsNone(disk_candidates(cipher.disks, "A-B", "A+B"))
+        self.assertIsNone(recover_disk_order(cipher.disks, "A-B", "A+B").order)
+
+    def test_solve_assignment_backtracks(self):
+        # Позиции 0 и 1 делят диски 0 и 1, позиция 2 - диски 1 и 2
+        self.assertEqual(solve_assignment([0b011, 0b011, 0b110], limit=3), [[0, 1, 2], [1, 0, 2]])
+        self.assertEqual(solve_assignment([0b001, 0b001, 0b110]), [])
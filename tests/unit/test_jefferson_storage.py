@@ -0,0 +1,74 @@
+import json
+import unittest
+
+from sqlalchemy import create_engine, text
+
+from enigma.ciphers.jefferson.main import JeffersonCipher
+from enigma.ciphers.jefferson.storage import decode_disks, decode_order, encode_disks, encode_order
+from enigma.db import Base, migrate_jefferson_disk_sets, migrate_jefferson_storage
+
+
+class TestJeffersonStorage(unittest.TestCase):
+    def test_round_trip(self):
+        cipher = JeffersonCipher(num_disks=10)
+        blob = encode_disks(cipher.disks)
+        self.assertEqual(len(blob), 10 * 26)
+        self.assertEqual([list(disk) for disk in decode_disks(blob)], cipher.disks)
+
+        order = cipher.get_key()
+        self.assertEqual(decode_order(encode_order(order), 10), order)
+
+    def test_wide_order(self):
+        order = list(range(300))[::-1]
+        self.assertEqual(len(encode_order(order)), 600)
+        self.assertEqual(decode_order(encode_order(order), 300), order)
+
+    def test_decoded_disks_decrypt(self):
+        cipher = JeffersonCipher(num_disks=5)
+        encrypted = cipher.encrypt("HELLO WORLD", key_row=0)
+
+        restored = JeffersonCipher(num_disks=5, disks=decode_disks(encode_disks(cipher.disks)))
+        restored.set_disk_order(decode_order(encode_order(cipher.get_key()), 5))
+        self.assertEqual(restored.decrypt(encrypted, key_row=0), "HELLO WORLD")
+
+    def test_migration_from_json(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        disks = [list("ZYXWVUTSRQPONMLKJIHGFEDCBA"), list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")]
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO jefferson_configs (id, disks, secret_key, num_disks, key_row) "
+                     "VALUES (1, :disks, :key, 2, 0)"),
+                {"disks": json.dumps(disks), "key": json.dumps([1, 0])},
+            )
+
+        migrate_jefferson_storage(engine)
+
+        with engine.connect() as conn:
+            row = conn.execute(text("SELECT disks, secret_key FROM jefferson_configs")).one()
+        self.assertEqual(row.disks, b"ZYXWVUTSRQPONMLKJIHGFEDCBAABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        self.assertEqual(row.secret_key, b"\x01\x00")
+
+    def test_migration_to_disk_sets(self):
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            # Таблица в формате до появления наборов дисков
+            conn.execute(text(
+                "CREATE TABLE jefferson_configs (id INTEGER PRIMARY KEY, disks BLOB, "
+                "secret_key BLOB, num_disks INTEGER, key_row INTEGER)"
+            ))
+            for row_id in (1, 2):
+                conn.execute(
+                    text("INSERT INTO jefferson_configs VALUES (:id, :disks, :key, 1, 0)"),
+                    {"id": row_id, "disks": b"ZYXWVUTSRQPONMLKJIHGFEDCBA", "key": b"\x00"},
+                )
+        Base.metadata.create_all(bind=engine)
+
+        migrate_jefferson_disk_sets(engine)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT disk_set_id, disks FROM jefferson_configs")).all()
+            disk_sets = conn.execute(text("SELECT id, disks FROM jefferson_disk_sets")).all()
+        self.assertEqual(len(disk_sets), 1)
+        self.assertEqual(disk_sets[0].disks, b"ZYXWVUTSRQPONMLKJIHGFEDCBA")
+        self.assertEqual([tuple(row) for row in rows], [(disk_sets[0].id, None)] * 2)
@@ -0,0 +1,42 @@
+import random
+import unittest
+
+from enigma.ciphers.jefferson.main import JeffersonCipher
+from enigma.ciphers.jefferson.stream import JeffersonStream
+
+
+def run(stream, data, size):
+    chunks = [data[i:i + size] for i in range(0, len(data), size)] or [b""]
+    return b''.join(
+        stream.process(chunk, final=i == len(chunks) - 1) for i, chunk in enumerate(chunks)
+    ).decode()
+
+
+class TestJeffersonStream(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.cipher = JeffersonCipher(num_disks=7)
+
+    def test_ascii_chunks(self):
+        text = "Hello, World! " * 500
+        for size in (1, 5, 7, 64, 10000):
+            self.assertEqual(
+                run(JeffersonStream(self.cipher), text.encode(), size),
+                self.cipher.encrypt(text, key_row=0),
+            )
+
+    def test_split_multibyte_characters(self):
+        text = "Привет, World! Straße " * 200
+        expected = self.cipher.encrypt(text, key_row=0)
+        for size in (1, 3, 13, 4097):
+            self.assertEqual(run(JeffersonStream(self.cipher), text.encode(), size), expected)
+
+    def test_decrypt_from_offset(self):
+        text = "ATTACK AT DAWN " * 100
+        encrypted = self.cipher.encrypt(text, key_row=0)
+        stream = JeffersonStream(self.cipher, decrypt=True, offset=600)
+        self.assertEqual(run(stream, encrypted[600:].encode(), 100), text[600:])
+
+
+if __name__ == "__main__":
+    unittest.main()
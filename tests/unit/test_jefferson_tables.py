@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from enigma.ciphers.jefferson.main import JeffersonCipher
+
+
+def reference_encrypt(cipher, text):
+    result = []
+    for i, char in enumerate(text.upper()):
+        disk = cipher.disks[cipher.disk_order[i % cipher.num_disks]]
+        result.append(cipher.alphabet[disk.index(char)] if char in disk else char)
+    return ''.join(result)
+
+
+def reference_decrypt(cipher, text):
+    result = []
+    for i, char in enumerate(text.upper()):
+        disk = cipher.disks[cipher.disk_order[i % cipher.num_disks]]
+        result.append(disk[cipher.alphabet.index(char)] if char in cipher.alphabet else char)
+    return ''.join(result)
+
+
+class TestJeffersonTables(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.cipher = JeffersonCipher(num_disks=36)
+
+    def test_matches_reference_ascii(self):
+        rng = random.Random(1)
+        text = ''.join(rng.choices("ABCxyz .,!\n7", k=5000))
+        encrypted = self.cipher.encrypt(text, key_row=0)
+        self.assertEqual(encrypted, reference_encrypt(self.cipher, text))
+        self.assertEqual(self.cipher.decrypt(encrypted, key_row=0), reference_decrypt(self.cipher, encrypted))
+
+    def test_matches_reference_non_ascii(self):
+        rng = random.Random(2)
+        text = ''.join(rng.choices("ABCxyz .ЖЯßé", k=3000))
+        encrypted = self.cipher.encrypt(text, key_row=0)
+        self.assertEqual(encrypted, reference_encrypt(self.cipher, text))
+        self.assertEqual(self.cipher.decrypt(encrypted, key_row=0), reference_decrypt(self.cipher, encrypted))
+
+    def test_string_disks_and_order_change(self):
+        disks = [''.join(disk) for disk in self.cipher.disks]
+        cipher = JeffersonCipher(num_disks=36, disks=disks)
+        cipher.set_disk_order(self.cipher.get_key()[::-1])
+        text = "HELLO WORLD" * 10
+        self.assertEqual(cipher.encrypt(text, key_row=0), reference_encrypt(cipher, text))
+        self.assertEqual(cipher.decrypt(cipher.encrypt(text, key_row=0), key_row=0), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
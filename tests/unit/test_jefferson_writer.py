@@ -0,0 +1,86 @@
+import unittest
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from enigma.db import Base, DBJeffersonConfig
+from enigma.writer import JeffersonKeyWriter
+
+
+class TestJeffersonKeyWriter(unittest.TestCase):
+    def setUp(self):
+        # Одна общая БД в памяти для теста и фонового потока
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(bind=engine)
+        self.writer = JeffersonKeyWriter(self.Session, flush_interval=10, max_batch=1000)
+
+    def tearDown(self):
+        self.writer.close()
+
+    def row(self):
+        return {"disks": b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", "secret_key": b"\x00", "num_disks": 1, "key_row": 0}
+
+    def count(self):
+        with self.Session() as db:
+            return db.scalar(select(func.count()).select_from(DBJeffersonConfig))
+
+    def test_ids_are_sequential(self):
+        ids = [self.writer.submit(**self.row()) for _ in range(5)]
+        self.assertEqual(ids, [1, 2, 3, 4, 5])
+
+    def test_rows_written_in_one_batch(self):
+        ids = [self.writer.submit(**self.row()) for _ in range(50)]
+        # Длинный интервал: до flush ничего не записано
+        self.assertEqual(self.count(), 0)
+        self.assertFalse(self.writer.durable(ids[0]).done())
+
+        self.writer.flush()
+        self.writer.durable(ids[-1]).result(timeout=5)
+        self.assertEqual(self.count(), 50)
+        self.assertEqual(self.writer.stats()["flushed_batches"], 1)
+
+    def test_full_batch_is_written_by_thread(self):
+        self.writer.max_batch = 10
+        ids = [self.writer.submit(**self.row()) for _ in range(10)]
+        self.writer.durable(ids[-1]).result(timeout=5)
+        self.assertEqual(self.count(), 10)
+
+    def test_row_after_idle_thread_is_written(self):
+        self.writer.flush_interval = 0.001
+        first = self.writer.submit(**self.row())
+        self.writer.durable(first).result(timeout=5)
+        # Поток уже ждет новых строк: одиночная строка не должна зависнуть
+        second = self.writer.submit(**self.row())
+        self.writer.durable(second).result(timeout=5)
+        self.assertEqual(self.count(), 2)
+
+    def test_writers_get_disjoint_ids(self):
+        # Два процесса с писателями над одной БД
+        other = JeffersonKeyWriter(self.Session, flush_interval=10, max_batch=1000, id_block=4)
+        self.writer.id_block = 4
+        try:
+            ids = []
+            for _ in range(10):
+                ids.append(self.writer.submit(**self.row()))
+                ids.append(other.submit(**self.row()))
+            self.assertEqual(len(set(ids)), len(ids))
+            self.writer.flush()
+            other.flush()
+            self.writer.durable(ids[-2]).result(timeout=5)
+            other.durable(ids[-1]).result(timeout=5)
+            self.assertEqual(self.count(), 20)
+        finally:
+            other.close()
+
+    def test_reservation_skips_existing_rows(self):
+        with self.Session() as db:
+            db.add(DBJeffersonConfig(id=41, **self.row()))
+            db.commit()
+        self.writer.start()
+        self.assertEqual(self.writer.submit(**self.row()), 42)
@@ -0,0 +1,24 @@
+import unittest
+
+from enigma.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction_order(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        # "b" использовался давнее всех и вытеснен
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_counters_and_invalidate(self):
+        cache = LRUCache(maxsize=4)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.invalidate("a")
+        cache.get("a")
+        self.assertEqual(cache.stats(), {"size": 0, "maxsize": 4, "hits": 1, "misses": 1})
@@ -0,0 +1,44 @@
+import unittest
+
+from enigma.metrics import Counter, Histogram, Registry, _statement_operation
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counter_render(self):
+        counter = Counter("chars_total", "Characters", ("cipher",))
+        counter.inc(5, cipher="enigma")
+        counter.inc(3, cipher="enigma")
+        counter.inc(cipher='a"b')
+        self.assertEqual(counter.value(cipher="enigma"), 8)
+        lines = counter.render()
+        self.assertIn("# TYPE chars_total counter", lines)
+        self.assertIn('chars_total{cipher="enigma"} 8', lines)
+        # Кавычки в значениях меток экранируются
+        self.assertIn('chars_total{cipher="a\\"b"} 1', lines)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("duration_seconds", "Duration", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, stage="encrypt")
+        lines = histogram.render()
+        self.assertIn('duration_seconds_bucket{stage="encrypt",le="0.1"} 1', lines)
+        self.assertIn('duration_seconds_bucket{stage="encrypt",le="1.0"} 3', lines)
+        self.assertIn('duration_seconds_bucket{stage="encrypt",le="+Inf"} 4', lines)
+        self.assertIn('duration_seconds_count{stage="encrypt"} 4', lines)
+        self.assertIn('duration_seconds_sum{stage="encrypt"} 6.05', lines)
+
+    def test_histogram_time(self):
+        histogram = Histogram("duration_seconds", "Duration")
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.count(), 1)
+
+    def test_registry_collectors(self):
+        registry = Registry()
+        registry.register(Counter("a_total", "A")).inc()
+        registry.collector(lambda: ["b 2"])
+        self.assertTrue(registry.render().endswith("a_total 1\nb 2\n"))
+
+    def test_statement_operation(self):
+        self.assertEqual(_statement_operation("  select * from t"), "SELECT")
+        self.assertEqual(_statement_operation(""), "OTHER")
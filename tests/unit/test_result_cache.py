@@ -0,0 +1,125 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from enigma.ciphers.enigma.configs import EnigmaConfig
+from enigma.db import Base
+from enigma.results import RESULT_CACHE_DB_ENV, ResultCache, ResultStore, open_result_store, result_key
+
+
+def make_store(**kwargs) -> ResultStore:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return ResultStore(sessionmaker(bind=engine), **kwargs)
+
+
+class TestResultKey(unittest.TestCase):
+    def setUp(self):
+        self.config = EnigmaConfig(
+            rotors=["III", "II", "I"],
+            reflector="B",
+            ring_settings=[0, 0, 0],
+            initial_positions="AAA",
+            plugboard_pairs=[["A", "B"]],
+        )
+
+    def test_key_depends_on_request(self):
+        key = result_key(self.config, "HELLO")
+        same = EnigmaConfig(**self.config.model_dump())
+        self.assertEqual(result_key(same, "HELLO"), key)
+        self.assertNotEqual(result_key(self.config, "HELLO", 1), key)
+        self.assertNotEqual(result_key(self.config, "HELLO!"), key)
+        other = self.config.model_copy(update={"reflector": "C"})
+        self.assertNotEqual(result_key(other, "HELLO"), key)
+
+
+class TestResultCache(unittest.TestCase):
+    def test_hit_and_bytes_saved(self):
+        cache = ResultCache(max_bytes=1 << 20)
+        self.assertIsNone(cache.get(b"k"))
+        cache.put(b"k", "ILBDA")
+        self.assertEqual(cache.get(b"k"), "ILBDA")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["bytes_saved"], sys.getsizeof("ILBDA"))
+
+    def test_evicts_by_bytes(self):
+        value = "A" * 1000
+        size = sys.getsizeof(value)
+        cache = ResultCache(max_bytes=size * 8)
+        for i in range(8):
+            cache.put(bytes([i]), value)
+        cache.get(bytes([0]))
+        cache.put(b"new", value)
+        # Первая запись использовалась недавно, вытеснена вторая
+        self.assertIsNotNone(cache.get(bytes([0])))
+        self.assertIsNone(cache.get(bytes([1])))
+        self.assertLessEqual(cache.stats()["bytes"], cache.max_bytes)
+
+    def test_skips_large_items(self):
+        cache = ResultCache(max_bytes=8000)
+        cache.put(b"k", "A" * 2000)
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_ttl(self):
+        cache = ResultCache(ttl=0.01)
+        cache.put(b"k", "ILBDA")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(b"k"))
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_disk_tier(self):
+        store = make_store()
+        cache = ResultCache(store=store, disk_min_length=4)
+        cache.put(b"short", "ABC")
+        cache.put(b"long", "ABCDEF")
+        self.assertIsNone(store.get(b"short"))
+        self.assertEqual(store.get(b"long"), "ABCDEF")
+
+        # Новый процесс: память пуста, результат читается из SQLite
+        restarted = ResultCache(store=store, disk_min_length=4)
+        self.assertIsNone(restarted.get(b"long", length=3))
+        self.assertEqual(restarted.get(b"long", length=6), "ABCDEF")
+        self.assertEqual(restarted.get(b"long", length=6), "ABCDEF")
+        stats = restarted.stats()
+        self.assertEqual((stats["hits"], stats["disk_hits"], stats["misses"]), (2, 1, 1))
+
+    def test_store_prune(self):
+        store = make_store(max_bytes=100, prune_every=1000)
+        for i in range(5):
+            store.put(bytes([i]), "X", 40)
+        store.prune()
+        self.assertIsNone(store.get(bytes([2])))
+        self.assertEqual(store.get(bytes([3])), "X")
+        self.assertEqual(store.get(bytes([4])), "X")
+
+        store.ttl = 0
+        store.prune()
+        self.assertIsNone(store.get(bytes([4])))
+
+
+class TestOpenResultStore(unittest.TestCase):
+    def test_memory_only_by_default(self):
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertIsNone(open_result_store())
+
+    def test_store_from_env(self):
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{os.path.join(directory, 'results.db')}"
+            with mock.patch.dict(os.environ, {RESULT_CACHE_DB_ENV: url}):
+                store = open_result_store()
+            store.put(b"k", "ABC", 3)
+            self.assertEqual(store.get(b"k"), "ABC")
+            store.session_factory.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()